@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark TableStyle commands for preserved cell styles: one per cell versus one per style region.
+
+Usage:
+    python benchmarks/bench_cell_styles.py --rows 2000 10000
+
+A heavily formatted sheet (every cell filled, banded rows, bold and coloured
+fonts, aligned columns, subtotal rows) is read once with its styles. The
+"per cell" layout gives each styled cell its own BACKGROUND / TEXTCOLOR /
+FONTNAME / ALIGN commands, as a direct port of the Excel formats would; the
+"interned" layout emits the per-attribute run-length encoded regions of
+styles.py. Both are
+built into an in-memory PDF with the same tables.
+"""
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so the benchmark runs from a source checkout
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.platypus import SimpleDocTemplate
+
+from benchmarks.workbooks import generate_formatted_workbook
+from exceltopdf import tables
+from exceltopdf.cli import DEFAULT_CHUNK_ROWS, _iter_pandas_sheet_blocks, _sheet_table
+from exceltopdf.styles import table_style_commands
+
+
+def per_cell_commands(grid, table, row_offset=1):
+    """Return the style commands of a naive port: every styled cell on its own."""
+    commands = []
+    for row, col in zip(*np.nonzero(grid)):
+        style = table.styles[grid[row, col]]
+        cell = (int(col), int(row) + row_offset)
+        if style.fill_color is not None:
+            commands.append(('BACKGROUND', cell, cell, table.color(style.fill_color)))
+        if style.text_color is not None:
+            commands.append(('TEXTCOLOR', cell, cell, table.color(style.text_color)))
+        if style.font_name is not None:
+            commands.append(('FONTNAME', cell, cell, style.font_name))
+        if style.align is not None:
+            commands.append(('ALIGN', cell, cell, style.align))
+    return commands
+
+
+def time_build(header, rows, col_widths, row_heights, styles, commands, chunk_rows):
+    """Return (seconds, pages, commands) for building the sheet with `commands` per chunk."""
+    counted = []
+
+    def chunk_commands(grid, table, row_offset=1):
+        chunk = commands(grid, table, row_offset)
+        counted.append(len(chunk))
+        return chunk
+
+    tables.table_style_commands, original = chunk_commands, tables.table_style_commands
+    try:
+        start = time.perf_counter()
+        story = [_sheet_table([(header, rows, col_widths, row_heights, styles)], chunk_rows)]
+        doc = SimpleDocTemplate(io.BytesIO(), pagesize=landscape(A4))
+        doc.build(story)
+        return time.perf_counter() - start, doc.page, sum(counted)
+    finally:
+        tables.table_style_commands = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    print(f"{'rows':>7} {'styles':>6} {'read (s)':>9} {'per-cell cmds':>14} {'build (s)':>10} "
+          f"{'interned cmds':>14} {'build (s)':>10} {'plain (s)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for row_count in args.rows:
+            path = generate_formatted_workbook(Path(directory) / f"formatted_{row_count}.xlsx",
+                                               rows=row_count, columns=args.columns)
+            start = time.perf_counter()
+            excel_file = pd.ExcelFile(path)
+            header, rows, col_widths, row_heights, styles = next(
+                _iter_pandas_sheet_blocks(excel_file, "Report", preserve_styles=True))
+            read = time.perf_counter() - start
+
+            naive, pages, naive_count = time_build(header, rows, col_widths, row_heights, styles,
+                                                   per_cell_commands, args.chunk_rows)
+            interned, _, interned_count = time_build(header, rows, col_widths, row_heights, styles,
+                                                     table_style_commands, args.chunk_rows)
+            plain, _, _ = time_build(header, rows, col_widths, row_heights, None,
+                                     table_style_commands, args.chunk_rows)
+            print(f"{row_count:>7} {len(styles.table) - 1:>6} {read:>9.2f} {naive_count:>14} {naive:>10.2f} "
+                  f"{interned_count:>14} {interned:>10.2f} {plain:>10.2f}   ({pages} pages)")
+
+
+if __name__ == "__main__":
+    main()
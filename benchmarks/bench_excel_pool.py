@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark win32com conversions with and without Excel instance reuse.
+
+Usage:
+    python benchmarks/bench_excel_pool.py --conversions 20 --startup 1.5 --export 0.2
+
+Runs on any platform against the fake Excel from tests/fake_excel.py, whose
+startup and export delays stand in for a real Excel launch and PDF export.
+"Before" recycles the instance after every workbook (one Excel start per
+conversion, as the converter used to); "after" reuses pooled instances.
+"""
+import argparse
+import functools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src and the fake Excel to the path so the benchmark runs from a source checkout
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from exceltopdf.cli import convert_with_win32com
+from exceltopdf.pool import ExcelPool
+from fake_excel import FakeExcel
+
+
+def run(pool, conversions, out_dir):
+    start = time.perf_counter()
+    for i in range(conversions):
+        convert_with_win32com(Path(out_dir) / "book.xlsx", Path(out_dir) / f"out_{i}.pdf", pool=pool)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversions", type=int, default=20)
+    parser.add_argument("--startup", type=float, default=1.5, help="Simulated Excel startup seconds")
+    parser.add_argument("--export", type=float, default=0.2, help="Simulated export seconds per workbook")
+    args = parser.parse_args()
+
+    factory = functools.partial(FakeExcel, startup_seconds=args.startup, export_seconds=args.export)
+    with tempfile.TemporaryDirectory() as out_dir:
+        before_pool = ExcelPool(factory, max_uses=1)
+        before = run(before_pool, args.conversions, out_dir)
+        after_pool = ExcelPool(factory)
+        after = run(after_pool, args.conversions, out_dir)
+        after_pool.close()
+
+    print(f"{args.conversions} conversions, {args.startup}s startup, {args.export}s export")
+    print(f"  before (new instance each time): {before:.2f}s  {before_pool.describe()}")
+    print(f"  after  (pooled instances):       {after:.2f}s  {after_pool.describe()}")
+
+
+if __name__ == "__main__":
+    main()
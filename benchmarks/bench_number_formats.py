@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark turning a sheet's cells into text: str() of every cell versus column-wise Excel formats.
+
+Usage:
+    python benchmarks/bench_number_formats.py --rows 10000 100000
+
+The formatted report workbook (accounting numbers and dates) is read into a
+DataFrame once. "str()" is the stringify stage of --raw-values, one Python
+str() per cell; "formatted" reads each column's number format once and
+formats whole columns with formatting.format_column(). Both produce the row
+lists and the column arrays that width analysis measures.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so the benchmark runs from a source checkout
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from benchmarks.workbooks import generate_formatted_workbook
+from exceltopdf.formatting import column_number_formats, columns_to_rows, format_column
+
+
+def stringify_raw(df):
+    """Return (rows, columns) the way the --raw-values reader builds them."""
+    text_df = df.fillna('').astype(str)
+    rows = text_df.values.tolist()
+    return rows, [text_df.iloc[:, col_idx].to_numpy() for col_idx in range(len(df.columns))]
+
+
+def stringify_formatted(df, formats):
+    """Return (rows, columns) formatted column by column with Excel number formats."""
+    columns = [format_column(df.iloc[:, col_idx], number_format) for col_idx, number_format in enumerate(formats)]
+    return columns_to_rows(columns, len(df)), columns
+
+
+def best_of(repeat, function, *args):
+    """Return the fastest of `repeat` timings of function(*args) and its result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'cells':>8} {'str() (s)':>10} {'formatted (s)':>14} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for row_count in args.rows:
+            path = generate_formatted_workbook(Path(directory) / f"formatted_{row_count}.xlsx",
+                                               rows=row_count, columns=args.columns)
+            excel_file = pd.ExcelFile(path)
+            df = pd.read_excel(excel_file, sheet_name="Report")
+            formats = column_number_formats(excel_file.book, "Report", len(df.columns))
+
+            raw, (raw_rows, _) = best_of(args.repeat, stringify_raw, df)
+            formatted, (rows, _) = best_of(args.repeat, stringify_formatted, df, formats)
+            print(f"{row_count:>7} {df.size:>8} {raw:>10.3f} {formatted:>14.3f} {raw / formatted:>7.1f}x")
+            print(f"        str():     {raw_rows[0]}")
+            print(f"        formatted: {rows[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark workbook parse throughput of each reader backend on the same files.
+
+Usage:
+    python benchmarks/bench_readers.py --rows 10000 50000 --columns 8
+
+Each seeded workbook is parsed to raw cell values by every backend of
+readers.READER_BACKENDS that is installed, plus pandas.read_excel as the
+pandas reader uses it. The best of `--repeat` runs is reported as rows and
+cells per second and MB of .xlsx per second, and every backend's rows are
+checked against openpyxl read-only, which the others must reproduce.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so the benchmark runs from a source checkout
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.workbooks import generate_workbook
+from exceltopdf.readers import DEFAULT_BACKEND, READER_BACKENDS, calamine_available, iter_sheet_rows
+
+
+def parse_backend(path, backend):
+    """Return every row of the first sheet as raw values, header first."""
+    return list(iter_sheet_rows(path, "Sheet 1", raw=True, backend=backend))
+
+
+def parse_pandas(path):
+    """Return the first sheet as a DataFrame, the way the pandas reader reads it."""
+    import pandas as pd
+
+    return pd.read_excel(path, sheet_name="Sheet 1")
+
+
+def best_of(repeat, function, *args):
+    """Return the fastest of `repeat` timings of function(*args) and its result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = [backend for backend in READER_BACKENDS if backend != "calamine" or calamine_available()]
+    if "calamine" not in backends:
+        print("python-calamine is not installed; skipping the calamine backend")
+
+    print(f"{'rows':>7} {'MB':>6} {'reader':>18} {'seconds':>8} {'rows/s':>9} {'cells/s':>10} {'MB/s':>6} {'same rows':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for row_count in args.rows:
+            path = generate_workbook(Path(directory) / f"r{row_count}.xlsx", rows=row_count, columns=args.columns)
+            megabytes = path.stat().st_size / 1024 / 1024
+            reference = parse_backend(path, DEFAULT_BACKEND)
+
+            results = [(backend, *best_of(args.repeat, parse_backend, path, backend)) for backend in backends]
+            results.append(("pandas.read_excel", *best_of(args.repeat, parse_pandas, path)))
+            for name, seconds, rows in results:
+                same = "-" if name == "pandas.read_excel" else "yes" if rows == reference else "NO"
+                cells = row_count * args.columns
+                print(f"{row_count:>7} {megabytes:>6.1f} {name:>18} {seconds:>8.2f} {row_count / seconds:>9.0f} "
+                      f"{cells / seconds:>10.0f} {megabytes / seconds:>6.2f} {same:>9}")
+
+
+if __name__ == "__main__":
+    main()
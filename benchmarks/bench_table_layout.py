@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark reportlab build time for whole-sheet tables versus chunked tables.
+
+Usage:
+    python benchmarks/bench_table_layout.py --rows 1000 10000 100000
+
+The "before" layout wraps the whole sheet in one KeepTogether(Table) like the
+pandas path used to; "after" lays the sheet out a page of rows at a time
+(cli._sheet_table) with the header at the top of every page.
+The whole-sheet layout grows quadratically, so it is skipped above
+--max-before-rows unless that limit is raised.
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add src to path so the benchmark runs from a source checkout
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+from reportlab.platypus.flowables import KeepTogether
+
+from exceltopdf.cli import DEFAULT_CHUNK_ROWS, _sheet_table, _table_style_commands
+from exceltopdf.layout import body_row_heights, calculate_column_widths
+
+
+def make_rows(row_count, col_count=6):
+    """Build a stringified sheet (header first) similar to a ledger export."""
+    header = [f"Column {c}" for c in range(col_count)]
+    rows = []
+    for r in range(row_count):
+        row = []
+        for c in range(col_count):
+            if c % 3 == 0:
+                row.append(str(r * 1.5))
+            elif c % 3 == 1:
+                row.append(f"item {r} " + "x" * (r % 17) + ("\nsecond line" if r % 7 == 0 else ""))
+            else:
+                row.append(f"2024-01-{r % 28 + 1:02d} 00:00:00")
+        rows.append(row)
+    return [header] + rows
+
+
+def build_before(data, col_widths):
+    """Lay out the sheet as a single table kept together."""
+    table = Table(data)
+    table._argW = col_widths
+    table.setStyle(TableStyle(_table_style_commands()))
+    return [KeepTogether(table)]
+
+
+def build_after(data, col_widths, chunk_rows):
+    """Lay out the sheet a page of rows at a time with the header on every page."""
+    rows = data[1:]
+    row_heights = body_row_heights(list(zip(*rows)), len(rows))
+    return [_sheet_table([(data[0], rows, col_widths, row_heights, None)], chunk_rows)]
+
+
+def time_build(story):
+    """Return (seconds, pages) for building the story into an in-memory PDF."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
+    start = time.perf_counter()
+    doc.build(story)
+    return time.perf_counter() - start, doc.page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--max-before-rows", type=int, default=20000,
+                        help="Skip the whole-sheet layout above this row count (default: 20000)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'pages':>6} {'before (s)':>11} {'after (s)':>10} {'speedup':>8}")
+    for row_count in args.rows:
+        data = make_rows(row_count)
+        col_widths = calculate_column_widths(data[0], list(zip(*data[1:])))
+        after, pages = time_build(build_after(data, col_widths, args.chunk_rows))
+        if row_count <= args.max_before_rows:
+            before, _ = time_build(build_before(data, col_widths))
+            print(f"{row_count:>8} {pages:>6} {before:>11.2f} {after:>10.2f} {before / after:>7.1f}x")
+        else:
+            print(f"{row_count:>8} {pages:>6} {'skipped':>11} {after:>10.2f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
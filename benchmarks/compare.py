@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Compare two benchmark result files written by benchmarks.run.
+
+Usage:
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("seconds", "peak_rss_mb", "output_bytes")
+
+
+def case_key(case):
+    """Return a hashable identity for a benchmark case."""
+    return tuple(sorted(case.items()))
+
+
+def compare(before, after):
+    """Return rows of (case, metric, before, after, ratio) for cases present in both runs."""
+    earlier = {case_key(r["case"]): r for r in before["results"] if "error" not in r}
+    rows = []
+    for record in after["results"]:
+        previous = earlier.get(case_key(record["case"]))
+        if previous is None or "error" in record:
+            continue
+        for metric in METRICS:
+            old, new = previous.get(metric), record.get(metric)
+            if old is None or new is None:
+                continue
+            rows.append((record["case"], metric, old, new, new / old if old else float("inf")))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as handle:
+        before = json.load(handle)
+    with open(args.after) as handle:
+        after = json.load(handle)
+
+    rows = compare(before, after)
+    if not rows:
+        print("No cases in common", file=sys.stderr)
+        sys.exit(1)
+    for case, metric, old, new, ratio in rows:
+        label = (f"rows={case['rows']} cols={case['columns']} sheets={case['sheets']} "
+                 f"auto={int(case['auto_adjust'])} aggressive={int(case['aggressive_adjust'])}")
+        print(f"{label:<50} {metric:<13} {old:>12.2f} -> {new:>12.2f}  ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
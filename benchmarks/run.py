@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Run convert_with_pandas_reportlab over a matrix of synthetic workbooks.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --preset full --output full.json
+    python -m benchmarks.run --rows 1000 20000 --sheets 1 5 --multiline 0 0.3 --output custom.json
+    python -m benchmarks.compare before.json after.json
+
+Each case converts in a fresh process so its peak RSS is its own; wall time is
+the best of --repeat runs. With --tracemalloc a separate traced run records the
+peak Python heap, which would otherwise slow the timed runs down. Every case is
+run with all four auto_adjust/aggressive_adjust combinations.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from queue import Empty
+
+# Add src and the repository root to the path so the benchmarks run from a source checkout
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.workbooks import generate_workbook, workbook_name
+
+PRESETS = {
+    "quick": {"rows": [500, 5000], "columns": [8], "sheets": [1], "text_length": [20], "multiline": [0.1]},
+    "full": {"rows": [1000, 10000, 50000], "columns": [6, 20], "sheets": [1, 5], "text_length": [10, 60],
+             "multiline": [0.0, 0.3]},
+}
+ADJUST_COMBINATIONS = [(True, False), (True, True), (False, False), (False, True)]
+PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![s\w])")
+POLL_SECONDS = 1.0
+
+
+def _peak_rss_mb():
+    """Return this process's peak resident set size in MB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _convert_case(workbook, output, options, traced, queue):
+    """Convert once in a child process and report timings and memory back through `queue`."""
+    try:
+        from exceltopdf.cli import convert_with_pandas_reportlab
+
+        baseline_rss = _peak_rss_mb()
+        if traced:
+            import tracemalloc
+            tracemalloc.start()
+        start = time.perf_counter()
+        convert_with_pandas_reportlab(workbook, output, **options)
+        seconds = time.perf_counter() - start
+        result = {"seconds": seconds, "peak_rss_mb": _peak_rss_mb(), "baseline_rss_mb": baseline_rss}
+        if traced:
+            result["peak_traced_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+        queue.put(result)
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(workbook, output, options, traced=False):
+    """Convert `workbook` in a fresh process and return its measurements.
+
+    A child that dies without reporting (killed for running out of memory, or
+    crashed) gives an error result instead of hanging the run.
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_convert_case, args=(str(workbook), str(output), options, traced, queue))
+    process.start()
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=POLL_SECONDS)
+        except Empty:
+            if process.is_alive():
+                continue
+            # The child may have exited right after reporting
+            try:
+                result = queue.get(timeout=POLL_SECONDS)
+            except Empty:
+                result = {"error": f"Process exited with code {process.exitcode} without a result"}
+    process.join()
+    return result
+
+
+def expand_matrix(rows, columns, sheets, text_length, multiline, numeric_ratio, date_ratio):
+    """Return every workbook shape in the matrix."""
+    return [
+        {"rows": r, "columns": c, "sheets": s, "text_length": t, "multiline_density": m,
+         "numeric_ratio": numeric_ratio, "date_ratio": date_ratio}
+        for r, c, s, t, m in itertools.product(rows, columns, sheets, text_length, multiline)
+    ]
+
+
+def run_matrix(shapes, work_dir, repeat=1, traced=False, reader="pandas", progress=print):
+    """Benchmark every shape with every adjust combination and return the result records."""
+    results = []
+    for shape in shapes:
+        workbook = Path(work_dir) / workbook_name(shape)
+        if not workbook.exists():
+            generate_workbook(workbook, **shape)
+        for auto_adjust, aggressive_adjust in ADJUST_COMBINATIONS:
+            options = {"all_sheets": True, "auto_adjust": auto_adjust, "aggressive_adjust": aggressive_adjust,
+                       "reader": reader}
+            output = Path(work_dir) / "out.pdf"
+            runs = [run_case(workbook, output, options) for _ in range(repeat)]
+            errors = [run["error"] for run in runs if "error" in run]
+            record = {"case": dict(shape, **options), "workbook_bytes": workbook.stat().st_size}
+            if errors:
+                record["error"] = errors[0]
+            else:
+                best = min(runs, key=lambda run: run["seconds"])
+                data = output.read_bytes()
+                record.update(
+                    seconds=best["seconds"],
+                    all_seconds=[run["seconds"] for run in runs],
+                    peak_rss_mb=max((run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None), default=None),
+                    baseline_rss_mb=best["baseline_rss_mb"],
+                    output_bytes=len(data),
+                    pages=len(PAGE_PATTERN.findall(data)),
+                )
+                if traced:
+                    record["peak_traced_mb"] = run_case(workbook, output, options, traced=True).get("peak_traced_mb")
+            results.append(record)
+            if progress:
+                progress(format_record(record))
+    return results
+
+
+def format_record(record):
+    """Return a one-line summary of a benchmark record."""
+    case = record["case"]
+    label = (f"rows={case['rows']:<6} cols={case['columns']:<3} sheets={case['sheets']:<2} "
+             f"text={case['text_length']:<3} multiline={case['multiline_density']:<4} "
+             f"auto={int(case['auto_adjust'])} aggressive={int(case['aggressive_adjust'])}")
+    if "error" in record:
+        return f"{label}  ERROR {record['error']}"
+    rss = f"{record['peak_rss_mb']:.0f} MB" if record["peak_rss_mb"] is not None else "n/a"
+    return f"{label}  {record['seconds']:7.2f}s  rss {rss:>7}  {record['output_bytes'] / 1024:8.0f} KB  {record['pages']} pages"
+
+
+def _metadata():
+    from exceltopdf import __version__
+
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "exceltopdf": __version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick",
+                        help="Matrix used for any dimension not given explicitly (default: quick)")
+    parser.add_argument("--rows", type=int, nargs="+")
+    parser.add_argument("--columns", type=int, nargs="+")
+    parser.add_argument("--sheets", type=int, nargs="+")
+    parser.add_argument("--text-length", type=int, nargs="+", help="Approximate characters per text cell")
+    parser.add_argument("--multiline", type=float, nargs="+", help="Share of text cells with a second line")
+    parser.add_argument("--numeric-ratio", type=float, default=0.4, help="Share of number columns (default: 0.4)")
+    parser.add_argument("--date-ratio", type=float, default=0.2, help="Share of date columns (default: 0.2)")
+    parser.add_argument("--reader", default="pandas", help="Reader passed to the converter (default: pandas)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case; the fastest is kept")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also record the peak traced Python heap")
+    parser.add_argument("--work-dir", help="Where generated workbooks are kept (default: a temporary directory)")
+    parser.add_argument("--output", "-o", default="benchmark-results.json")
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    shapes = expand_matrix(
+        args.rows or preset["rows"], args.columns or preset["columns"], args.sheets or preset["sheets"],
+        args.text_length or preset["text_length"], args.multiline or preset["multiline"],
+        args.numeric_ratio, args.date_ratio,
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = args.work_dir or temp_dir
+        results = run_matrix(shapes, work_dir, repeat=args.repeat, traced=args.tracemalloc, reader=args.reader)
+
+    Path(args.output).write_text(json.dumps({"meta": _metadata(), "results": results}, indent=2))
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Synthetic workbook generator for the benchmarks.
+
+Workbooks are written with openpyxl in write-only mode and seeded, so the same
+shape always produces the same bytes and benchmark runs stay comparable.
+"""
+import datetime
+import random
+from pathlib import Path
+
+WORDS = ("alpha", "beta", "gamma", "delta", "ledger", "invoice", "total", "north", "south", "pending")
+
+
+def _text(rnd, length, multiline_density):
+    words = []
+    while sum(len(w) + 1 for w in words) < length:
+        words.append(rnd.choice(WORDS))
+    text = " ".join(words)[:max(length, 1)]
+    if rnd.random() < multiline_density:
+        text += "\n" + " ".join(rnd.choice(WORDS) for _ in range(3))
+    return text
+
+
+def column_kinds(columns, numeric_ratio=0.4, date_ratio=0.2):
+    """Return 'number', 'date' or 'text' for each column, each kind spread evenly across the sheet."""
+    numeric = round(columns * numeric_ratio)
+    dates = min(round(columns * date_ratio), columns - numeric)
+    counts = {"number": numeric, "date": dates, "text": columns - numeric - dates}
+    # Place the n-th column of a kind at its share of the sheet width
+    slots = [((i + 0.5) / count, kind) for kind, count in counts.items() for i in range(count)]
+    return [kind for _, kind in sorted(slots)]
+
+
+def generate_workbook(path, rows=1000, columns=8, sheets=1, text_length=20, multiline_density=0.1,
+                      numeric_ratio=0.4, date_ratio=0.2, seed=0):
+    """Write a workbook of `sheets` sheets, each a header plus `rows` data rows.
+
+    Text cells hold about `text_length` characters and a `multiline_density`
+    share of them carry a second line; `numeric_ratio` and `date_ratio` set the
+    share of number and date columns. Returns the path.
+    """
+    from openpyxl import Workbook
+
+    rnd = random.Random(seed)
+    kinds = column_kinds(columns, numeric_ratio, date_ratio)
+    start = datetime.datetime(2024, 1, 1)
+
+    wb = Workbook(write_only=True)
+    for s in range(sheets):
+        ws = wb.create_sheet(f"Sheet {s + 1}")
+        ws.append([f"{kind.title()} {c + 1}" for c, kind in enumerate(kinds)])
+        for r in range(rows):
+            row = []
+            for kind in kinds:
+                if kind == "number":
+                    row.append(round(rnd.uniform(-1e5, 1e6), 2))
+                elif kind == "date":
+                    row.append(start + datetime.timedelta(days=rnd.randrange(3650), minutes=rnd.randrange(1440)))
+                else:
+                    row.append(_text(rnd, text_length, multiline_density))
+            ws.append(row)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return Path(path)
+
+
+def workbook_name(shape):
+    """Return a file name that identifies a workbook shape."""
+    return (
+        f"r{shape['rows']}_c{shape['columns']}_s{shape['sheets']}_t{shape['text_length']}"
+        f"_m{shape['multiline_density']}_n{shape['numeric_ratio']}_d{shape['date_ratio']}.xlsx"
+    )
+
+
+def generate_formatted_workbook(path, rows=5000, columns=8, seed=0):
+    """Write a heavily formatted single-sheet workbook, like a styled financial report.
+
+    Every cell is styled: banded fills every 3 rows, a bold coloured first
+    column, centred dates, right-aligned accounting numbers with negatives in
+    red, and a bold subtotal row on a dark fill every 25 rows. Returns the path.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    rnd = random.Random(seed)
+    kinds = column_kinds(columns)
+    start = datetime.datetime(2024, 1, 1)
+    bands = [PatternFill("solid", fgColor="FFFFFF"), PatternFill("solid", fgColor="DDEBF7")]
+    subtotal_fill = PatternFill("solid", fgColor="1F4E78")
+    right, center = Alignment(horizontal="right"), Alignment(horizontal="center")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Report")
+    ws.append([f"{kind.title()} {c + 1}" for c, kind in enumerate(kinds)])
+    for r in range(rows):
+        subtotal = r % 25 == 24
+        row = []
+        for c, kind in enumerate(kinds):
+            if kind == "number":
+                value = round(rnd.uniform(-1e5, 1e6), 2)
+            elif kind == "date":
+                value = start + datetime.timedelta(days=rnd.randrange(3650))
+            else:
+                value = "Subtotal" if subtotal and c == 0 else _text(rnd, 16, 0)
+            cell = WriteOnlyCell(ws, value=value)
+            if subtotal:
+                cell.fill = subtotal_fill
+                cell.font = Font(bold=True, color="FFFFFF")
+            else:
+                cell.fill = bands[r // 3 % 2]
+                if c == 0:
+                    cell.font = Font(bold=True, color="1F4E78")
+                elif kind == "number" and value < 0:
+                    cell.font = Font(color="C00000")
+            if kind == "number":
+                cell.alignment = right
+                cell.number_format = "#,##0.00_);[Red](#,##0.00)"
+            elif kind == "date":
+                cell.alignment = center
+                cell.number_format = "d-mmm-yyyy"
+            row.append(cell)
+        ws.append(row)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return Path(path)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Asyncio API that renders on a process pool with bounded concurrency.
+
+    async with AsyncConverter(max_concurrency=4) as converter:
+        await converter.convert('in.xlsx', 'out.pdf', all_sheets=True)
+        async for result in converter.convert_many(pairs):
+            ...
+
+At most `max_concurrency` conversions run at once; further callers wait for a
+free slot, which gives async services backpressure. Cancelling the awaiting
+task also stops the job in its worker process: every running job checks a
+shared flag at each instrumentation event (each stage and every table chunk)
+and the caller waits for the worker to let go before the slot is reused.
+"""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from .instrument import subscribed
+
+_cancel_flags = None  # set in each worker by _init_worker
+
+class ConversionCancelled(Exception):
+    """Raised inside a worker when the caller cancelled its conversion."""
+
+def _init_worker(flags):
+    global _cancel_flags
+    _cancel_flags = flags
+
+def _convert_job(slot, input_path, output_path, method, options, cache):
+    """Run one conversion in a worker, stopping at the next checkpoint once `slot` is flagged."""
+    from .cli import convert_cached
+
+    def check_cancelled(event):
+        # Checked as stages start and counters tick; end events would only repeat the error
+        if event['event'] != 'end' and _cancel_flags[slot]:
+            raise ConversionCancelled(f"Conversion of '{input_path}' was cancelled")
+
+    if not Path(input_path).exists():
+        raise FileNotFoundError(f"Input file '{input_path}' does not exist.")
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with subscribed(check_cancelled):
+            return convert_cached(input_path, output_path, method, options, cache=cache)
+    except ConversionCancelled:
+        # Never leave a half-written PDF behind
+        try:
+            os.unlink(output_path)
+        except OSError:
+            pass
+        raise
+
+class AsyncConverter:
+    """Convert workbooks from asyncio code on a pool of `max_concurrency` worker processes.
+
+    `method`, `cache` and the keyword options of convert() are passed on as in
+    convert_cached(). A converter may serve one event loop after another (as
+    successive asyncio.run() calls do), but not several loops at once.
+    """
+
+    def __init__(self, max_concurrency=None, mp_context=None):
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._context = mp_context or multiprocessing.get_context()
+        self._flags = self._context.Array('b', self.max_concurrency, lock=False)
+        self._free_slots = list(range(self.max_concurrency))
+        # Before Python 3.10 a Semaphore binds to the loop current at creation, so each loop gets its own
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_concurrency, mp_context=self._context,
+                    initializer=_init_worker, initargs=(self._flags,),
+                )
+            return self._executor
+
+    def _semaphore(self):
+        """Return the concurrency limit of the running event loop, creating it there on first use."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def convert(self, input_path, output_path, method="pandas", cache=None, **options):
+        """Convert one workbook; returns 'hit'/'miss' with a cache, else None, and raises on failure."""
+        async with self._semaphore():
+            slot = self._free_slots.pop()
+            self._flags[slot] = 0
+            executor = self._get_executor()
+            future = executor.submit(_convert_job, slot, str(input_path), str(output_path),
+                                     method, options, cache)
+            waiter = asyncio.wrap_future(future)
+            try:
+                return await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                self._flags[slot] = 1
+                future.cancel()
+                # The slot is only free again once the worker has stopped
+                await asyncio.wait([waiter])
+                if not waiter.cancelled():
+                    waiter.exception()  # consumed; the caller sees the cancellation
+                raise
+            except BrokenProcessPool:
+                # A worker died; the next job starts a fresh pool
+                with self._executor_lock:
+                    if self._executor is executor:
+                        self._executor = None
+                executor.shutdown(wait=False)
+                raise
+            finally:
+                self._free_slots.append(slot)
+
+    async def _convert_to_result(self, input_path, output_path, method, cache, options):
+        start = time.perf_counter()
+        cache_status = None
+        try:
+            cache_status = await self.convert(input_path, output_path, method, cache, **options)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return {
+            'input': str(input_path),
+            'output': str(output_path),
+            'ok': error is None,
+            'error': error,
+            'seconds': time.perf_counter() - start,
+            'cache': cache_status,
+        }
+
+    async def convert_many(self, planned, method="pandas", cache=None, **options):
+        """Convert (input, output) pairs, yielding batch-style result dicts as they complete.
+
+        Only `max_concurrency` jobs are scheduled at a time, so `planned` may be
+        a long or lazy iterable. Closing the iterator early cancels the jobs
+        still running.
+        """
+        pairs = iter(planned)
+        pending = set()
+        try:
+            while True:
+                for input_path, output_path in pairs:
+                    job = self._convert_to_result(input_path, output_path, method, cache, options)
+                    pending.add(asyncio.ensure_future(job))
+                    if len(pending) >= self.max_concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def close(self):
+        """Shut the worker pool down without blocking the event loop."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+_default_converter = None
+_default_converter_lock = threading.Lock()
+
+def _shutdown_default_converter():
+    if _default_converter is not None and _default_converter._executor is not None:
+        _default_converter._executor.shutdown()
+
+def default_converter():
+    """Return the process-wide AsyncConverter used by convert_async(), creating it on first use."""
+    global _default_converter
+    with _default_converter_lock:
+        if _default_converter is None:
+            _default_converter = AsyncConverter()
+            atexit.register(_shutdown_default_converter)
+        return _default_converter
+
+async def convert_async(input_path, output_path, method="pandas", cache=None, **options):
+    """Convert one workbook on the shared process pool, at most one job per CPU at a time."""
+    return await default_converter().convert(input_path, output_path, method, cache, **options)
+
+async def convert_many_async(planned, method="pandas", cache=None, max_concurrency=None, **options):
+    """Convert (input, output) pairs on a dedicated pool, yielding results as they complete."""
+    async with AsyncConverter(max_concurrency) as converter:
+        async for result in converter.convert_many(planned, method, cache, **options):
+            yield result
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Batch conversion of many workbooks across a process pool."""
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+EXCEL_SUFFIXES = ('.xlsx', '.xls', '.xlsb', '.ods')
+MANIFEST_PREFIX = '@'
+GLOB_CHARACTERS = '*?['
+
+def is_batch_input(spec):
+    """Return True if `spec` names a directory, a glob pattern or a manifest file.
+
+    An existing file is never a batch, so workbooks named like
+    "Q1 [final].xlsx" or "report?.xlsx" are converted on their own.
+    """
+    spec = str(spec)
+    if Path(spec).is_file():
+        return False
+    return (
+        spec.startswith(MANIFEST_PREFIX)
+        or any(char in spec for char in GLOB_CHARACTERS)
+        or Path(spec).is_dir()
+    )
+
+def _is_workbook(path):
+    """Return True for Excel files, skipping the ~$ lock files Excel leaves behind."""
+    return path.suffix.lower() in EXCEL_SUFFIXES and not path.name.startswith('~$')
+
+def expand_inputs(spec):
+    """Expand a directory, glob pattern or @manifest into a sorted list of workbook paths.
+
+    Manifest files list one workbook path per line; blank lines and lines starting
+    with '#' are ignored and relative paths are resolved against the manifest's
+    directory. Manifest entries are kept even if they do not exist so the batch
+    reports them as failures.
+    """
+    spec = str(spec)
+    if spec.startswith(MANIFEST_PREFIX):
+        manifest = Path(spec[len(MANIFEST_PREFIX):])
+        paths = []
+        for line in manifest.read_text(encoding='utf-8').splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = Path(line)
+            if not path.is_absolute():
+                path = manifest.parent / path
+            paths.append(path)
+        return paths
+
+    if Path(spec).is_dir():
+        candidates = Path(spec).iterdir()
+    else:
+        candidates = (Path(p) for p in glob.glob(spec, recursive=True))
+    return sorted(p for p in candidates if p.is_file() and _is_workbook(p))
+
+def plan_outputs(input_paths, output_dir):
+    """Map each input workbook to a PDF path in `output_dir`, avoiding name clashes."""
+    output_dir = Path(output_dir)
+    planned = []
+    used = set()
+    for input_path in input_paths:
+        base = Path(input_path).stem
+        candidate = output_dir / f"{base}.pdf"
+        counter = 1
+        while candidate in used:
+            candidate = output_dir / f"{base}_{counter}.pdf"
+            counter += 1
+        used.add(candidate)
+        planned.append((Path(input_path), candidate))
+    return planned
+
+def convert_one(input_path, output_path, method, options, cache=None):
+    """Convert a single workbook and return a result dict (runs inside worker processes).
+
+    With an OutputCache the stored PDF is reused when the workbook bytes and
+    options are unchanged; the result's 'cache' entry is then 'hit' or 'miss'.
+    """
+    from .cli import convert_cached
+
+    start = time.perf_counter()
+    cache_status = None
+    try:
+        if not Path(input_path).exists():
+            raise FileNotFoundError(f"Input file '{input_path}' does not exist.")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        cache_status = convert_cached(input_path, output_path, method, options, cache=cache)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        'input': str(input_path),
+        'output': str(output_path),
+        'ok': error is None,
+        'error': error,
+        'seconds': time.perf_counter() - start,
+        'cache': cache_status,
+    }
+
+def run_batch(planned, method, options, jobs=None, on_result=None, cache=None):
+    """Convert every (input, output) pair and return the results in input order.
+
+    With `jobs` greater than one the conversions fan out over a process pool;
+    `on_result` is called with each result as soon as it completes.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    results = [None] * len(planned)
+
+    if jobs == 1 or len(planned) <= 1:
+        for index, (input_path, output_path) in enumerate(planned):
+            results[index] = convert_one(input_path, output_path, method, options, cache)
+            if on_result:
+                on_result(results[index])
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(planned))) as executor:
+            futures = {
+                executor.submit(convert_one, input_path, output_path, method, options, cache): index
+                for index, (input_path, output_path) in enumerate(planned)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. killed or out of memory)
+                    input_path, output_path = planned[index]
+                    result = {
+                        'input': str(input_path),
+                        'output': str(output_path),
+                        'ok': False,
+                        'error': f"{type(e).__name__}: {e}",
+                        'seconds': 0.0,
+                        'cache': None,
+                    }
+                results[index] = result
+                if on_result:
+                    on_result(result)
+
+    return results
+
+def format_summary(results):
+    """Return the per-file summary lines printed at the end of a batch run."""
+    lines = ["", "Batch summary:"]
+    for result in results:
+        if result['ok']:
+            cached = " [cached]" if result.get('cache') == 'hit' else ""
+            lines.append(f"  OK      {result['input']} -> {result['output']} ({result['seconds']:.1f}s){cached}")
+        else:
+            lines.append(f"  FAILED  {result['input']}: {result['error']}")
+    failed = sum(1 for result in results if not result['ok'])
+    lines.append(f"Converted {len(results) - failed} of {len(results)} workbooks ({failed} failed)")
+    if any(result.get('cache') for result in results):
+        hits = sum(1 for result in results if result.get('cache') == 'hit')
+        misses = sum(1 for result in results if result.get('cache') == 'miss')
+        lines.append(f"Cache: {hits} hits, {misses} misses")
+    return lines
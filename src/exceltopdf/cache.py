@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of converted PDFs."""
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from . import __version__
+from .selection import FULL_SHEET
+from .streams import is_path, open_workbook
+from .styles import StyleTable
+
+DEFAULT_CACHE_SIZE_MB = 1024
+FRAGMENT_SHARE = 4  # sheet fragments get 1/FRAGMENT_SHARE of the size limit, whole PDFs the rest
+MARKER_BYTES = 4096  # the disk block an empty seen() marker takes, charged against the size limit
+# Bump when the rendered output changes for the same input and options
+CACHE_FORMAT = 1
+
+def default_cache_dir():
+    """Return the per-user cache directory for converted PDFs."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'exceltopdf'
+
+def _remove(path):
+    """Remove a file, clearing the read-only flag Windows refuses to unlink."""
+    if os.name == 'nt':
+        os.chmod(path, 0o644)
+    os.unlink(path)
+
+def detach_output(output_path):
+    """Unlink `output_path` if it is a hard link into the cache so it is never rewritten in place.
+
+    Hits are copied now, but earlier versions linked them into place.
+    """
+    if not is_path(output_path):
+        return
+    try:
+        if os.stat(output_path).st_nlink > 1:
+            _remove(output_path)
+    except OSError:
+        pass
+
+def sheet_fingerprints(excel_path, sheet_names, settings):
+    """Return a digest per sheet of its cell values and the settings it is rendered with.
+
+    Cells are read with openpyxl in read-only mode and hashed with their types,
+    so an edit to one sheet changes only that sheet's fingerprint. When the
+    settings preserve cell styles, the styles the renderers use are hashed too,
+    and with number formats so are the cells' format codes. With a
+    'cell_range' setting only the cells inside it are read.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError(f"Required packages not available: {e}")
+
+    first_row, first_col, last_row, last_col = settings.get('cell_range') or FULL_SHEET
+    bounds = {'min_row': first_row, 'min_col': first_col, 'max_row': last_row, 'max_col': last_col}
+    wb = load_workbook(open_workbook(excel_path), read_only=True, data_only=True)
+    try:
+        fingerprints = {}
+        for sheet_name in sheet_names:
+            digest = hashlib.sha256()
+            header = {'format': CACHE_FORMAT, 'version': __version__, 'sheet': sheet_name, 'settings': settings}
+            digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+            if settings.get('preserve_styles') or settings.get('number_formats'):
+                table = StyleTable() if settings.get('preserve_styles') else None
+                for row in wb[sheet_name].iter_rows(**bounds):
+                    digest.update(repr(tuple(cell.value for cell in row)).encode('utf-8'))
+                    if table is not None:
+                        digest.update(repr([table.cell_id(cell) for cell in row]).encode('utf-8'))
+                    if settings.get('number_formats'):
+                        digest.update(repr([getattr(cell, 'number_format', None) for cell in row]).encode('utf-8'))
+                    digest.update(b"\n")
+                if table is not None:
+                    digest.update(repr(table.styles).encode('utf-8'))
+            else:
+                for row in wb[sheet_name].iter_rows(values_only=True, **bounds):
+                    digest.update(repr(row).encode('utf-8'))
+                    digest.update(b"\n")
+            fingerprints[sheet_name] = digest.hexdigest()
+        return fingerprints
+    finally:
+        wb.close()
+
+class OutputCache:
+    """Directory of PDFs keyed by a hash of the workbook bytes and conversion options.
+
+    Entries are stored read-only and handed out as writable copies, so an
+    output can be rewritten whatever becomes of its entry. Each hit refreshes
+    the entry's modification time, and stores evict the least recently used
+    entries beyond `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, input_path, options):
+        """Return the cache key for converting `input_path` (a path or workbook bytes) with `options`."""
+        digest = hashlib.sha256()
+        if isinstance(input_path, bytes):
+            digest.update(input_path)
+        else:
+            with open(input_path, 'rb') as handle:
+                for block in iter(lambda: handle.read(1024 * 1024), b''):
+                    digest.update(block)
+        settings = {'format': CACHE_FORMAT, 'version': __version__, 'options': options}
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def sheet_cache(self):
+        """Return the cache of rendered per-sheet fragments, stored in a subdirectory.
+
+        Fragments get a share of `max_bytes` and the whole PDFs keep the rest
+        (see evict()), so together they stay within the one limit.
+        """
+        return OutputCache(self.cache_dir / 'sheets', self.max_bytes // FRAGMENT_SHARE)
+
+    def seen(self, name):
+        """Record `name` and return True if it was recorded before (markers are empty files, evicted with the PDFs)."""
+        marker = self.cache_dir / 'seen' / hashlib.sha256(name.encode('utf-8')).hexdigest()
+        if marker.exists():
+            try:
+                os.utime(marker)
+            except OSError:
+                pass
+            return True
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        return False
+
+    def _entry(self, key):
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def fetch(self, key, output_path):
+        """Place the cached PDF for `key` at `output_path` or write it to a stream; return False on a miss."""
+        entry = self._entry(key)
+        if not entry.is_file():
+            self.misses += 1
+            return False
+
+        if not is_path(output_path):
+            with open(entry, 'rb') as source:
+                shutil.copyfileobj(source, output_path)
+        else:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if output_path.exists() or output_path.is_symlink():
+                _remove(output_path)
+            # A copy, not a hard link: a link would leave the output read-only once the entry is evicted
+            shutil.copyfile(entry, output_path)
+
+        now = time.time()
+        try:
+            os.utime(entry, (now, now))
+        except OSError:
+            pass
+        self.hits += 1
+        return True
+
+    def store(self, key, pdf_path):
+        """Copy a freshly converted PDF (a path or bytes) into the cache and evict old entries."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if isinstance(pdf_path, bytes):
+                    temp_file.write(pdf_path)
+                else:
+                    with open(pdf_path, 'rb') as source:
+                        shutil.copyfileobj(source, temp_file)
+            os.chmod(temp_path, 0o444)
+            os.replace(temp_path, entry)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in `max_bytes`, less the fragments' share."""
+        limit = self.max_bytes
+        if (self.cache_dir / 'sheets').is_dir():
+            limit -= self.max_bytes // FRAGMENT_SHARE
+        entries = []
+        total = 0
+        for path in itertools.chain(self.cache_dir.glob('*/*.pdf'), self.cache_dir.glob('seen/*')):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            size = stat.st_size if path.suffix == '.pdf' else MARKER_BYTES
+            entries.append((stat.st_mtime, size, path))
+            total += size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                _remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def describe(self):
+        """Return the hit/miss counters for verbose output."""
+        return f"Cache: {self.hits} hits, {self.misses} misses ({self.cache_dir})"
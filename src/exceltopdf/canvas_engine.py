@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Table renderer that draws sheets straight onto a reportlab canvas.
+
+The platypus engine builds a Table flowable per page and reportlab styles,
+measures and draws every cell through it. Plain text grids need none of that:
+column widths and row heights are already planned (see layout), so this engine
+paginates by the row heights and writes each page's text as one block of PDF
+text operators. Pages keep the platypus look: the same page size and margins,
+a dark blue bold header repeated on every page, alternating light grey rows
+and a grey grid.
+"""
+from .instrument import count
+from .layout import BODY_FONT, HEADER_FONT, LEADING
+
+MARGIN = 72 + 6  # SimpleDocTemplate's 1 inch margin plus the frame padding
+TITLE_FONT = ("Helvetica-Bold", 14)  # the Heading2 style used for sheet titles
+TITLE_SPACE = 18 + 6 + 12  # title leading, its spaceAfter and the spacer below it
+HEADER_TOP_PADDING = 8
+BODY_TOP_PADDING = 8
+BODY_LEFT_PADDING = 6
+GRID_WIDTH = 0.5
+
+# PDF string escapes for the bytes of WinAnsi-encoded text
+_ESCAPES = [
+    '\\' + chr(b) if chr(b) in '()\\' else chr(b) if 32 <= b < 127 else f'\\{b:03o}'
+    for b in range(256)
+]
+
+def pdf_string(text):
+    """Return `text` as the body of a PDF literal string in the standard fonts' WinAnsi encoding."""
+    if text.isascii() and text.isprintable():
+        return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return ''.join(_ESCAPES[b] for b in text.encode('cp1252', errors='replace'))
+
+def _rgb(color):
+    return ' '.join(f"{component:.3f}" for component in color.rgb())
+
+def _hex_rgb(hex_color):
+    return ' '.join(f"{int(hex_color[i:i + 2], 16) / 255:.3f}" for i in (0, 2, 4))
+
+class _SheetPainter:
+    """Draws one page after another, each finished page written as soon as it is complete."""
+
+    def __init__(self, canvas, page_width, page_height):
+        from reportlab.lib import colors
+
+        self.canvas = canvas
+        self.page_width = page_width
+        self.top = page_height - MARGIN
+        self.bottom = MARGIN
+        self.pages = 0
+        self.colors = {
+            'header': _rgb(colors.darkblue),
+            'header_text': _rgb(colors.white),
+            'zebra': _rgb(colors.lightgrey),
+            'grid': _rgb(colors.grey),
+        }
+        # Looking up a font's resource name also registers it with the document
+        self.font_ids = {
+            font_name: canvas._doc.getInternalFontName(font_name)
+            for font_name in (HEADER_FONT[0], BODY_FONT[0], TITLE_FONT[0])
+        }
+        self._hex_colors = {}
+        self._blank_page = True
+        self._start_page()
+
+    def _font_id(self, font_name):
+        font_id = self.font_ids.get(font_name)
+        if font_id is None:
+            font_id = self.font_ids[font_name] = self.canvas._doc.getInternalFontName(font_name)
+        return font_id
+
+    def _color(self, hex_color):
+        color = self._hex_colors.get(hex_color)
+        if color is None:
+            color = self._hex_colors[hex_color] = _hex_rgb(hex_color)
+        return color
+
+    def _start_page(self):
+        self.y = self.top
+        self.fills = []  # PDF operators for row backgrounds
+        self.text = []  # PDF text operators
+        self.row_edges = []  # y of every row boundary of the current table section
+        self.table_x = None
+
+    def _finish_page(self):
+        """Write the page content: backgrounds, then text, then the grid on top."""
+        code = list(self.fills)
+        if self.text:
+            code.append("BT")
+            code.extend(self.text)
+            code.append("ET")
+        if self.row_edges:
+            left, right = self.table_x[0], self.table_x[-1]
+            top, bottom = self.row_edges[0], self.row_edges[-1]
+            code.append(f"{GRID_WIDTH} w {self.colors['grid']} RG")
+            code.extend(f"{left:.2f} {y:.2f} m {right:.2f} {y:.2f} l" for y in self.row_edges)
+            code.extend(f"{x:.2f} {top:.2f} m {x:.2f} {bottom:.2f} l" for x in self.table_x)
+            code.append("S")
+        if code:
+            self.canvas.addLiteral("\n".join(code))
+        self.canvas.showPage()
+        self.pages += 1
+        count("pages")
+        self._blank_page = True
+        self._start_page()
+
+    def new_sheet(self, title=None):
+        if not self._blank_page:
+            self._finish_page()
+        if title is not None:
+            font_name, font_size = TITLE_FONT
+            self.text.append(f"{self.font_ids[font_name]} {font_size} Tf 0 0 0 rg")
+            self.text.append(f"1 0 0 1 {MARGIN:.2f} {self.y - font_size:.2f} Tm ({pdf_string(title)}) Tj")
+            self.y -= TITLE_SPACE
+            self._blank_page = False
+        self.header = None
+        self.body_rows = 0  # rows of the sheet drawn so far; the stripes run on across pages like SheetTable's
+
+    def _draw_header(self):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        labels, col_x, height = self.header
+        font_name, font_size = HEADER_FONT
+        top = self.y
+        self.fills.append(f"{self.colors['header']} rg {col_x[0]:.2f} {top - height:.2f} "
+                          f"{col_x[-1] - col_x[0]:.2f} {height:.2f} re f")
+        self.text.append(f"{self.font_ids[font_name]} {font_size} Tf {self.colors['header_text']} rg")
+        for left, right, label in zip(col_x, col_x[1:], labels):
+            y = top - HEADER_TOP_PADDING - font_size
+            for line in str(label).split("\n"):
+                x = (left + right - stringWidth(line, font_name, font_size)) / 2
+                self.text.append(f"1 0 0 1 {x:.2f} {y:.2f} Tm ({pdf_string(line)}) Tj")
+                y -= LEADING
+        self.text.append(f"{self.font_ids[BODY_FONT[0]]} {BODY_FONT[1]} Tf 0 0 0 rg")
+        self.table_x = col_x
+        self.row_edges = [top, top - height]
+        self.y = top - height
+        self._blank_page = False
+
+    def _draw_styled_row(self, row, style_ids, table, top, height):
+        """Draw one row whose cells carry Excel styles (see styles.BlockStyles)."""
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        col_x = self.header[1]
+        body_font, font_size = BODY_FONT
+        reset = f"{self.font_ids[body_font]} {font_size} Tf 0 0 0 rg"
+        baseline = top - BODY_TOP_PADDING - font_size
+        for left, right, value, style_id in zip(col_x, col_x[1:], row, style_ids):
+            style = table.styles[style_id]
+            if style.fill_color is not None:
+                self.fills.append(f"{self._color(style.fill_color)} rg {left:.2f} {top - height:.2f} "
+                                  f"{right - left:.2f} {height:.2f} re f")
+            if not value:
+                continue
+            font_name = style.font_name or body_font
+            restyled = style.font_name is not None or style.text_color is not None
+            if restyled:
+                color = self._color(style.text_color) if style.text_color is not None else "0 0 0"
+                self.text.append(f"{self._font_id(font_name)} {font_size} Tf {color} rg")
+            y = baseline
+            for line in value.split("\n"):
+                if style.align == 'CENTER':
+                    x = (left + right - stringWidth(line, font_name, font_size)) / 2
+                elif style.align == 'RIGHT':
+                    x = right - BODY_LEFT_PADDING - stringWidth(line, font_name, font_size)
+                else:
+                    x = left + BODY_LEFT_PADDING
+                self.text.append(f"1 0 0 1 {x:.2f} {y:.2f} Tm ({pdf_string(line)}) Tj")
+                y -= LEADING
+            if restyled:
+                self.text.append(reset)
+
+    def draw_block(self, header, rows, col_widths, row_heights, header_height, styles=None):
+        """Draw `rows` below the rows already on the page, starting new pages as they fill up.
+
+        `styles` (a styles.BlockStyles) gives the rows their Excel formatting.
+        """
+        if self.header is None:
+            left = (self.page_width - sum(col_widths)) / 2
+            col_x = [left]
+            for width in col_widths:
+                col_x.append(col_x[-1] + width)
+            self.header = (header, col_x, header_height)
+            self._draw_header()
+
+        col_x = self.header[1]
+        starts = [f"1 0 0 1 {x + BODY_LEFT_PADDING:.2f} " for x in col_x[:-1]]
+        table_width = col_x[-1] - col_x[0]
+        zebra = self.colors['zebra']
+        baseline_drop = BODY_TOP_PADDING + BODY_FONT[1]
+        text = self.text
+        styled = styles.grid.any(axis=1).tolist() if styles is not None else None
+
+        for index, (row, height) in enumerate(zip(rows, row_heights.tolist())):
+            # Every page holds at least one row, even one taller than the page
+            if self.y - height < self.bottom and len(self.row_edges) > 2:
+                self._finish_page()
+                self._draw_header()
+                text = self.text
+            top = self.y
+            if self.body_rows % 2:
+                self.fills.append(f"{zebra} rg {col_x[0]:.2f} {top - height:.2f} {table_width:.2f} {height:.2f} re f")
+            self.body_rows += 1
+            if styled is not None and styled[index]:
+                self._draw_styled_row(row, styles.grid[index].tolist(), styles.table, top, height)
+                self.y = top - height
+                self.row_edges.append(self.y)
+                continue
+            baseline = top - baseline_drop
+            position = f"{baseline:.2f} Tm ("
+            for start, value in zip(starts, row):
+                if not value:
+                    continue
+                if "\n" in value:
+                    y = baseline
+                    for line in value.split("\n"):
+                        text.append(f"{start}{y:.2f} Tm ({pdf_string(line)}) Tj")
+                        y -= LEADING
+                else:
+                    text.append(start + position + pdf_string(value) + ") Tj")
+            self.y = top - height
+            self.row_edges.append(self.y)
+
+    def close(self):
+        from reportlab import rl_config
+
+        if not self._blank_page or self.pages == 0:
+            self._finish_page()
+        # Stream filters are chosen when the document is written. The PDF is
+        # binary anyway, so skip reportlab's pure-Python ASCII85 pass over
+        # every page (about half the drawing time without its C accelerator).
+        use_a85, rl_config.useA85 = rl_config.useA85, 0
+        try:
+            self.canvas.save()
+        finally:
+            rl_config.useA85 = use_a85
+
+def draw_sheets(output, sheets, show_titles=False):
+    """Draw (sheet_name, blocks) pairs onto A4 landscape pages and return the page count.
+
+    `output` is a path or a writable binary stream. Each sheet starts on a new
+    page; `blocks` yields (header, rows, col_widths, row_heights, styles) with
+    row_heights from layout.body_row_heights() and styles a styles.BlockStyles
+    or None, in sheet order.
+    """
+    try:
+        from reportlab.lib.pagesizes import landscape, A4
+        from reportlab.pdfgen.canvas import Canvas
+    except ImportError as e:
+        raise ImportError(f"Required packages not available: {e}")
+    from .layout import header_row_height
+
+    page_width, page_height = landscape(A4)
+    canvas = Canvas(output if hasattr(output, 'write') else str(output), pagesize=(page_width, page_height))
+    painter = _SheetPainter(canvas, page_width, page_height)
+    for sheet_name, blocks in sheets:
+        painter.new_sheet(sheet_name if show_titles else None)
+        for header, rows, col_widths, row_heights, styles in blocks:
+            painter.draw_block(header, rows, col_widths, row_heights, header_row_height(header), styles)
+    painter.close()
+    return painter.pages
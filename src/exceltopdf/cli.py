@@ -1,43 +1,97 @@
 #!/usr/bin/env python3
 """CLI tool to convert Excel files to PDF with all columns fitting on one page per sheet."""
 import argparse
+import functools
+import inspect
+import io
+import itertools
+import json
 import os
+import signal
 import sys
 import platform
 from pathlib import Path
 
+from .cache import DEFAULT_CACHE_SIZE_MB, OutputCache, detach_output, sheet_fingerprints
+from .batch import expand_inputs, format_summary, is_batch_input, plan_outputs, run_batch
+from .comlayout import XL_SHEET_HIDDEN, optimize_worksheet_layout
+from .daemon import main as serve_main, request_server
+from .formatting import GENERAL, column_number_formats, columns_to_rows, format_column
+from .instrument import ProfileRecorder, count, span, subscribed, timed
+from .layout import DEFAULT_SAMPLE_SIZE, DEFAULT_SAMPLE_THRESHOLD, body_row_heights, calculate_column_widths
+from .merge import format_merge_stats, merge_pdfs
+from .pipeline import DEFAULT_PIPELINE_DEPTH, PipelineStats, iter_pipelined
+from .pool import default_excel_pool
+from .selection import excel_address, parse_cell_range, select_sheets
+from .service import main as server_main
+from .watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, WorkbookWatcher, open_events
+from .readers import DEFAULT_BACKEND, DEFAULT_ROW_WINDOW, READER_BACKENDS, calamine_available, iter_row_windows, iter_sheet_rows, streaming_sheet_names
+from .streams import FORMAT_SUFFIXES, describe_source, detect_format, is_path, open_workbook, workbook_input, write_output
+from .styles import BlockStyles, StyleTable, iter_style_rows, read_style_grid
+
+# "pandas" reads each sheet into a DataFrame; the others stream row windows from a
+# readers backend ("streaming" being openpyxl read-only) and "auto" picks the fastest installed
+READERS = ("pandas", "streaming") + READER_BACKENDS + ("auto",)
+ENGINES = ("platypus", "canvas")
+DEFAULT_CHUNK_ROWS = 200
+# Page settings used by both converters; part of the output cache key
+PAGE_SETTINGS = {"page_size": "A4", "orientation": "landscape"}
+# Options that do not change the rendered PDF and are left out of the cache key
+CACHE_IGNORED_OPTIONS = ("verbose", "log", "jobs", "parallel_sheets", "fragment_cache", "pool", "pipeline_depth")
+
 def merge_pdfs_with_pypdf2(pdf_paths, output_path):
-    """Merge multiple PDF files into one using PyPDF2."""
+    """Merge multiple PDF files into one, deleting the parts, and return the merge statistics.
+
+    Parts are appended one at a time by the streaming merger, which shares
+    identical fonts and images between them instead of copying them again.
+    """
     try:
-        from PyPDF2 import PdfReader, PdfWriter
-    except ImportError:
-        raise ImportError("PyPDF2 not available for PDF merging")
-    
-    writer = PdfWriter()
+        stats = merge_pdfs(pdf_paths, output_path)
+    finally:
+        # Clean up temporary files
+        for pdf_path in pdf_paths:
+            try:
+                os.remove(pdf_path)
+            except OSError:
+                pass
+    return stats
+
+@timed("convert")
+def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False, log=None, auto_adjust=True, aggressive_adjust=False, pool=None, sheets=None, cell_range=None):
+    """Convert Excel to PDF using win32com (Windows with Excel installed).
+
+    The Excel instance is checked out of `pool` (the process-wide ExcelPool by
+    default) and returned afterwards, so consecutive conversions skip the Excel
+    startup. A failed conversion recycles its instance. Excel only opens and
+    exports files, so in-memory workbooks and stream outputs go through a
+    temporary directory.
     
-    for pdf_path in pdf_paths:
-        reader = PdfReader(pdf_path)
-        for page in reader.pages:
-            writer.add_page(page)
+    `sheets` picks the sheets to export instead of `all_sheets` (see
+    selection.select_sheets); only those are laid out. A `cell_range`
+    ("A1:H5000") becomes the print area of every exported sheet.
+    """
+    import tempfile
+    import time
     
-    with open(output_path, 'wb') as output_file:
-        writer.write(output_file)
+    if pool is None:
+        pool = default_excel_pool()
+    cell_range = parse_cell_range(cell_range)
     
-    # Clean up temporary files
-    for pdf_path in pdf_paths:
-        try:
-            os.remove(pdf_path)
-        except OSError:
-            pass
-
-def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False, log=None, auto_adjust=True, aggressive_adjust=False):
-    """Convert Excel to PDF using win32com (Windows with Excel installed)."""
-    try:
-        import win32com.client as win32
-        import tempfile
-        import time
-    except ImportError:
-        raise ImportError("pywin32 not available")
+    excel_path = workbook_input(excel_path)
+    if not is_path(excel_path) or not is_path(pdf_path):
+        with tempfile.TemporaryDirectory() as spool_dir:
+            if not is_path(excel_path):
+                suffix = FORMAT_SUFFIXES.get(detect_format(excel_path), '.xlsx')
+                spooled = Path(spool_dir) / f"workbook{suffix}"
+                spooled.write_bytes(excel_path)
+                excel_path = spooled
+            output = pdf_path if is_path(pdf_path) else Path(spool_dir) / "output.pdf"
+            convert_with_win32com(excel_path, output, all_sheets=all_sheets, verbose=verbose, log=log,
+                                  auto_adjust=auto_adjust, aggressive_adjust=aggressive_adjust, pool=pool,
+                                  sheets=sheets, cell_range=cell_range)
+            if output is not pdf_path:
+                write_output(pdf_path, output.read_bytes())
+        return
     
     excel_path = Path(excel_path).resolve()
     pdf_path = Path(pdf_path).resolve()
@@ -55,10 +109,10 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
     start_time = time.time()
     timeout = 300  # 5 minutes timeout
     
+    failed = True
     try:
-        xl = win32.Dispatch("Excel.Application")
-        xl.Visible = False
-        xl.DisplayAlerts = False
+        with span("excel_startup"):
+            xl = pool.acquire(timeout=timeout)
         
         # Check timeout
         if time.time() - start_time > timeout:
@@ -70,7 +124,8 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
         elif verbose:
             print("Opening Excel workbook...")
             
-        wb = xl.Workbooks.Open(str(excel_path))
+        with span("open"):
+            wb = xl.Workbooks.Open(str(excel_path))
         
         # Check timeout
         if time.time() - start_time > timeout:
@@ -82,214 +137,49 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
         elif verbose:
             print(f"Opened workbook with {total_sheets} worksheets")
         
-        # Function to optimize worksheet layout
-        def optimize_worksheet_layout(worksheet):
-            """Optimize worksheet layout to prevent text cutting."""
+        # Lay out only the sheets being exported, once each
+        if sheets:
+            worksheets = list(wb.Worksheets)
+            selected_names = select_sheets([ws.Name for ws in worksheets], sheets)
+            selected = [ws for ws in worksheets if ws.Name in selected_names]
+            if verbose and log:
+                log(f"Selected {len(selected)} of {total_sheets} worksheets: {', '.join(selected_names)}")
+            elif verbose:
+                print(f"Selected {len(selected)} of {total_sheets} worksheets: {', '.join(selected_names)}")
+        else:
+            selected = list(wb.Worksheets) if all_sheets else [wb.Worksheets(1)]
+        for i, ws in enumerate(selected, 1):
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Worksheet optimization timeout at sheet {i}")
             try:
-                # Check timeout
-                if time.time() - start_time > timeout:
-                    raise TimeoutError("Worksheet optimization timeout")
-                
-                worksheet.Activate()
-                
-                # Get used range
-                used_range = worksheet.UsedRange
-                if used_range is None:
-                    return
-                
-                if auto_adjust:
-                    # AutoFit columns based on content
-                    if verbose and log:
-                        log(f"  Auto-fitting columns for worksheet: {worksheet.Name}")
-                    elif verbose:
-                        print(f"  Auto-fitting columns for worksheet: {worksheet.Name}")
-                    
-                    # First, enable text wrapping for all cells to prevent cutting
-                    used_range.WrapText = True
-                    
-                    # Simple AutoFit approach to avoid loops
-                    try:
-                        # Check timeout before processing
-                        if time.time() - start_time > timeout:
-                            raise TimeoutError("AutoFit processing timeout")
-                        
-                        # Get the actual used range dimensions
-                        last_row = used_range.Rows.Count
-                        last_col = used_range.Columns.Count
-                        
-                        if verbose and log:
-                            log(f"    Worksheet dimensions: {last_row} rows x {last_col} columns")
-                        elif verbose:
-                            print(f"    Worksheet dimensions: {last_row} rows x {last_col} columns")
-                        
-                        # Apply AutoFit to all columns at once (more efficient)
-                        used_range.Columns.AutoFit()
-                        
-                        # Check timeout
-                        if time.time() - start_time > timeout:
-                            raise TimeoutError("Column AutoFit timeout")
-                        
-                        # Apply AutoFit to all rows at once (more efficient)
-                        used_range.Rows.AutoFit()
-                        
-                        # Check timeout
-                        if time.time() - start_time > timeout:
-                            raise TimeoutError("Row AutoFit timeout")
-                        
-                        # Apply aggressive adjustment if enabled
-                        if aggressive_adjust:
-                            if verbose and log:
-                                log(f"    Applying aggressive adjustment...")
-                            elif verbose:
-                                print(f"    Applying aggressive adjustment...")
-                            
-                            # Force minimum dimensions for better readability (limited scope)
-                            for col_idx in range(1, min(last_col + 1, 10)):  # Limit to first 10 columns
-                                try:
-                                    # Check timeout every few operations
-                                    if col_idx % 5 == 0 and time.time() - start_time > timeout:
-                                        raise TimeoutError("Aggressive column adjustment timeout")
-                                        
-                                    col = used_range.Columns(col_idx)
-                                    if col.ColumnWidth < 12:
-                                        col.ColumnWidth = 12
-                                    elif col.ColumnWidth > 50:
-                                        col.ColumnWidth = 50
-                                except:
-                                    pass  # Skip problematic columns
-                            
-                            for row_idx in range(1, min(last_row + 1, 50)):  # Limit to first 50 rows
-                                try:
-                                    # Check timeout every few operations
-                                    if row_idx % 10 == 0 and time.time() - start_time > timeout:
-                                        raise TimeoutError("Aggressive row adjustment timeout")
-                                        
-                                    row = used_range.Rows(row_idx)
-                                    if row.RowHeight < 20:
-                                        row.RowHeight = 20
-                                    elif row.RowHeight > 100:
-                                        row.RowHeight = 100
-                                except:
-                                    pass  # Skip problematic rows
-                    
-                    except Exception as e:
-                        if verbose and log:
-                            log(f"    Warning: AutoFit failed: {e}")
-                        elif verbose:
-                            print(f"    Warning: AutoFit failed: {e}")
-                    
-                    # Basic formatting to prevent text cutting
-                    try:
-                        # Check timeout
-                        if time.time() - start_time > timeout:
-                            raise TimeoutError("Formatting timeout")
-                        
-                        # Set alignment for better text wrapping
-                        used_range.HorizontalAlignment = -4131  # xlLeft
-                        used_range.VerticalAlignment = -4160    # xlTop
-                        
-                        # Ensure text wrapping is enabled
-                        used_range.WrapText = True
-                        
-                        # Set reasonable font size
-                        if aggressive_adjust:
-                            used_range.Font.Size = 11
-                        else:
-                            used_range.Font.Size = 10
-                    
-                    except Exception as e:
-                        if verbose and log:
-                            log(f"    Warning: Basic formatting failed: {e}")
-                        elif verbose:
-                            print(f"    Warning: Basic formatting failed: {e}")
-                    
-                    if verbose and log:
-                        log(f"    Applied {'aggressive' if aggressive_adjust else 'basic'} auto-adjustment for worksheet: {worksheet.Name}")
-                    elif verbose:
-                        print(f"    Applied {'aggressive' if aggressive_adjust else 'basic'} auto-adjustment for worksheet: {worksheet.Name}")
-                        
-                else:
-                    if verbose and log:
-                        log(f"  Skipping auto-adjustment for worksheet: {worksheet.Name}")
-                    elif verbose:
-                        print(f"  Skipping auto-adjustment for worksheet: {worksheet.Name}")
-                
-                # Set page setup for optimal PDF export
-                try:
-                    # Check timeout
-                    if time.time() - start_time > timeout:
-                        raise TimeoutError("Page setup timeout")
-                    
-                    page_setup = worksheet.PageSetup
-                    
-                    # Set orientation to landscape for better column fitting
-                    page_setup.Orientation = 2  # xlLandscape
-                    
-                    # Fit all columns to one page width
-                    page_setup.FitToPagesWide = 1
-                    page_setup.FitToPagesTall = False
-                    page_setup.Zoom = False
-                    
-                    # Use reasonable margins
-                    page_setup.LeftMargin = 0.5 * 72   # 0.5 inch in points
-                    page_setup.RightMargin = 0.5 * 72
-                    page_setup.TopMargin = 0.5 * 72
-                    page_setup.BottomMargin = 0.5 * 72
-                    
-                    # Set header and footer margins
-                    page_setup.HeaderMargin = 0.3 * 72
-                    page_setup.FooterMargin = 0.3 * 72
-                    
-                    # Center horizontally
-                    page_setup.CenterHorizontally = True
-                    page_setup.CenterVertically = False
-                    
-                    # Set paper size to A4
-                    page_setup.PaperSize = 7  # xlPaperA4
-                    
-                    if verbose and log:
-                        log(f"  Optimized layout for worksheet: {worksheet.Name}")
-                    elif verbose:
-                        print(f"  Optimized layout for worksheet: {worksheet.Name}")
-                        
-                except Exception as e:
-                    if verbose and log:
-                        log(f"  Warning: Page setup failed: {e}")
-                    elif verbose:
-                        print(f"  Warning: Page setup failed: {e}")
-                    
+                with span("layout", sheet=ws.Name):
+                    optimize_worksheet_layout(xl, ws, auto_adjust=auto_adjust, aggressive_adjust=aggressive_adjust,
+                                              verbose=verbose, log=log, cell_range=cell_range)
             except Exception as e:
                 if verbose and log:
-                    log(f"  Warning: Could not fully optimize worksheet {worksheet.Name}: {e}")
+                    log(f"  Warning: Could not fully optimize worksheet {ws.Name}: {e}")
                 elif verbose:
-                    print(f"  Warning: Could not fully optimize worksheet {worksheet.Name}: {e}")
+                    print(f"  Warning: Could not fully optimize worksheet {ws.Name}: {e}")
         
-        if all_sheets and total_sheets > 1:
+        # Check timeout before export
+        if time.time() - start_time > timeout:
+            raise TimeoutError("Export timeout after optimization")
+        
+        if len(selected) > 1:
             # Process all sheets - try to export to single PDF first
             try:
-                # Check timeout before starting
-                if time.time() - start_time > timeout:
-                    raise TimeoutError("Processing timeout before sheet optimization")
-                
-                # Optimize each worksheet layout
-                for i, ws in enumerate(wb.Worksheets):
-                    # Check timeout for each worksheet
-                    if time.time() - start_time > timeout:
-                        raise TimeoutError(f"Worksheet optimization timeout at sheet {i+1}")
-                    
-                    optimize_worksheet_layout(ws)
-                
-                # Check timeout before export
-                if time.time() - start_time > timeout:
-                    raise TimeoutError("Export timeout after optimization")
-                
-                # Try to export entire workbook to single PDF
                 if verbose and log:
                     log("Exporting all sheets to single PDF...")
                 elif verbose:
                     print("Exporting all sheets to single PDF...")
                 
-                wb.ExportAsFixedFormat(0, str(pdf_path))  # 0 = xlTypePDF
+                # Hidden sheets are left out of the workbook export; the workbook closes without saving
+                if len(selected) < total_sheets:
+                    for ws in worksheets:
+                        if ws.Name not in selected_names:
+                            ws.Visible = XL_SHEET_HIDDEN
+                with span("export"):
+                    wb.ExportAsFixedFormat(0, str(pdf_path))  # 0 = xlTypePDF
                 
                 if verbose and log:
                     log("PDF export completed (all sheets in single file)")
@@ -306,17 +196,16 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
                 temp_dir = tempfile.mkdtemp()
                 temp_pdfs = []
                 
-                for i, ws in enumerate(wb.Worksheets, 1):
+                # The sheets were laid out above, so they are only exported here
+                for i, ws in enumerate(selected, 1):
                     # Check timeout for each sheet
                     if time.time() - start_time > timeout:
                         raise TimeoutError(f"Sheet-by-sheet export timeout at sheet {i}")
                     
-                    # Optimize worksheet layout
-                    optimize_worksheet_layout(ws)
-                    
                     temp_pdf = os.path.join(temp_dir, f"sheet_{i:03d}_{ws.Name.replace('/', '_')}.pdf")
-                    # Export only current sheet
-                    ws.ExportAsFixedFormat(0, temp_pdf, From=1, To=1)
+                    # Export only current sheet (every page of it)
+                    with span("export", sheet=ws.Name):
+                        ws.ExportAsFixedFormat(0, temp_pdf)
                     temp_pdfs.append(temp_pdf)
                     
                     if verbose and log:
@@ -325,7 +214,12 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
                         print(f"Exported sheet {i}: {ws.Name}")
                 
                 # Merge all temp PDFs
-                merge_pdfs_with_pypdf2(temp_pdfs, pdf_path)
+                with span("merge", parts=len(temp_pdfs)):
+                    merge_stats = merge_pdfs_with_pypdf2(temp_pdfs, pdf_path)
+                if verbose and log:
+                    log(format_merge_stats(merge_stats))
+                elif verbose:
+                    print(format_merge_stats(merge_stats))
                 
                 # Clean up temp directory
                 try:
@@ -338,36 +232,22 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
                 elif verbose:
                     print("PDF export completed (merged from individual sheets)")
         else:
-            # Process single sheet or default behavior
-            # Check timeout before starting
-            if time.time() - start_time > timeout:
-                raise TimeoutError("Processing timeout before single sheet optimization")
-            
-            # Optimize each worksheet layout
-            for i, ws in enumerate(wb.Worksheets):
-                # Check timeout for each worksheet
-                if time.time() - start_time > timeout:
-                    raise TimeoutError(f"Single sheet optimization timeout at sheet {i+1}")
-                
-                optimize_worksheet_layout(ws)
-            
-            # Check timeout before export
-            if time.time() - start_time > timeout:
-                raise TimeoutError("Single sheet export timeout after optimization")
-            
-            # Export to PDF (default behavior - all sheets in workbook)
+            # Export the first (or the one selected) sheet only, like the pandas engine
             if verbose and log:
                 log("Exporting to PDF...")
             elif verbose:
                 print("Exporting to PDF...")
-                
-            wb.ExportAsFixedFormat(0, str(pdf_path))  # 0 = xlTypePDF
+            
+            with span("export"):
+                selected[0].ExportAsFixedFormat(0, str(pdf_path))  # 0 = xlTypePDF
             
             if verbose and log:
                 log("PDF export completed")
             elif verbose:
                 print("PDF export completed")
         
+        failed = False
+        count("bytes", os.path.getsize(pdf_path))
     except TimeoutError as e:
         error_msg = f"Timeout error during conversion: {e}"
         if verbose and log:
@@ -385,17 +265,575 @@ def convert_with_win32com(excel_path, pdf_path, all_sheets=False, verbose=False,
     finally:
         try:
             if 'wb' in locals():
-                wb.Close()
-            if 'xl' in locals():
-                xl.Quit()
+                # Discard the layout changes; the instance goes back to the pool
+                wb.Close(False)
         except Exception as cleanup_error:
+            failed = True
             if verbose and log:
                 log(f"Warning: Error during cleanup: {cleanup_error}")
             elif verbose:
                 print(f"Warning: Error during cleanup: {cleanup_error}")
+        if 'xl' in locals():
+            pool.release(xl, failed=failed)
+            if verbose and log:
+                log(pool.describe())
+            elif verbose:
+                print(pool.describe())
+
+def _table_style_commands():
+    """Return the TableStyle commands shared by every sheet table."""
+    from reportlab.lib import colors
+
+    return [
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 8),
+        
+        # Data styling
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Changed to TOP for better text wrapping
+        ('TOPPADDING', (0, 1), (-1, -1), 8),   # Increased padding
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8), # Increased padding
+        ('LEFTPADDING', (0, 1), (-1, -1), 6),   # Increased padding
+        ('RIGHTPADDING', (0, 1), (-1, -1), 6),  # Increased padding
+        
+        # Grid styling
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        
+        # Text wrapping and overflow prevention
+        ('WORDWRAP', (0, 0), (-1, -1), True),
+        ('LEADING', (0, 0), (-1, -1), 12),  # Line spacing for better readability
+    ]
+
+def _sheet_table(blocks, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Return the flowable that lays out a sheet's (header, rows, col_widths, row_heights, styles) blocks page by page.
+
+    See tables.SheetTable: the header starts every page and the explicit row
+    heights let each page's rows be picked without measuring any cell.
+    """
+    from reportlab.platypus import TableStyle
+    from .tables import SheetTable, body_style_commands
+    
+    return SheetTable(blocks, TableStyle(_table_style_commands()),
+                      TableStyle(body_style_commands(_table_style_commands())), chunk_rows)
+
+class _LazyStory(list):
+    """Story list that is refilled from a flowable generator as reportlab consumes it.
+
+    SimpleDocTemplate.build() removes flowables from the front of the story one at
+    a time, so keeping only a few pending flowables bounds memory by the row
+    window instead of by the sheet size.
+    """
+    
+    def __init__(self, flowables, lookahead=4):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+        self._fill()
+    
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+    
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+    
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._fill()
+
+def _iter_streaming_sheet_blocks(excel_path, sheet_name, verbose=False, log=None, auto_adjust=True, row_window=DEFAULT_ROW_WINDOW, width_sample_threshold=DEFAULT_SAMPLE_THRESHOLD, width_sample_size=DEFAULT_SAMPLE_SIZE, preserve_styles=False, number_formats=True, backend=DEFAULT_BACKEND, cell_range=None):
+    """Yield the row blocks of one sheet, reading rows lazily one window at a time."""
+    if verbose and log:
+        log(f"Streaming sheet '{sheet_name}' with {backend} in windows of {row_window} rows")
+    elif verbose:
+        print(f"Streaming sheet '{sheet_name}' with {backend} in windows of {row_window} rows")
+    
+    # Number formats and styles are read with openpyxl, which only opens .xlsx workbooks
+    is_xlsx = backend != "calamine" or detect_format(excel_path) == "xlsx"
+    if preserve_styles and not is_xlsx:
+        raise ValueError("Cell styles can only be preserved for .xlsx workbooks")
+    
+    rows = iter_sheet_rows(excel_path, sheet_name, raw=number_formats, backend=backend, cell_range=cell_range)
+    with span("read", sheet=sheet_name):
+        header = next(rows, None)
+    row_count = 0
+    if header:
+        # Cell styles are read alongside the values, one window at a time
+        style_table = StyleTable() if preserve_styles else None
+        style_rows = iter_style_rows(excel_path, sheet_name, len(header), style_table, cell_range) if preserve_styles else None
+        # Each column's number format is read once, from the first rows of the sheet
+        formats = None
+        if number_formats:
+            with span("formats", sheet=sheet_name):
+                if is_xlsx:
+                    formats = column_number_formats(excel_path, sheet_name, len(header), cell_range=cell_range)
+                else:
+                    formats = [GENERAL] * len(header)
+        
+        # Column widths are fixed from the first window so every chunk lines up
+        col_widths = None
+        windows = iter_row_windows(rows, row_window)
+        while True:
+            # Rows are read lazily, so each window is timed as it is pulled
+            with span("read", sheet=sheet_name):
+                window = next(windows, None)
+            if window is None:
+                break
+            if formats is not None:
+                with span("stringify", sheet=sheet_name):
+                    columns = [format_column(column, number_format)
+                               for column, number_format in zip(zip(*window), formats)]
+                    window = columns_to_rows(columns, len(window))
+            else:
+                columns = list(zip(*window))
+            if col_widths is None:
+                with span("widths", sheet=sheet_name):
+                    col_widths = calculate_column_widths(header, columns, auto_adjust,
+                                                         width_sample_threshold, width_sample_size)
+            with span("heights", sheet=sheet_name):
+                row_heights = body_row_heights(columns, len(window))
+            styles = None
+            if style_rows is not None:
+                with span("styles", sheet=sheet_name):
+                    styles = BlockStyles(style_table, read_style_grid(style_rows, len(window), len(header)))
+            row_count += len(window)
+            count("rows", len(window))
+            count("cells", len(window) * len(header))
+            yield header, window, col_widths, row_heights, styles
+        if col_widths is None:
+            with span("widths", sheet=sheet_name):
+                col_widths = calculate_column_widths(header, [[] for _ in header], auto_adjust)
+            yield header, [], col_widths, body_row_heights([[] for _ in header], 0), None
+        if style_rows is not None:
+            style_rows.close()
+    
+    if verbose and log:
+        log(f"  Streamed {row_count} rows and {len(header or [])} columns from sheet '{sheet_name}'")
+    elif verbose:
+        print(f"  Streamed {row_count} rows and {len(header or [])} columns from sheet '{sheet_name}'")
+
+def _iter_pandas_sheet_blocks(excel_file, sheet_name, verbose=False, log=None, auto_adjust=True, width_sample_threshold=DEFAULT_SAMPLE_THRESHOLD, width_sample_size=DEFAULT_SAMPLE_SIZE, preserve_styles=False, number_formats=True, cell_range=None):
+    """Yield one sheet read into a DataFrame with pandas as a single row block."""
+    import pandas as pd
+    
+    # Read sheet; pandas stops parsing at the last row of a cell range
+    with span("read", sheet=sheet_name) as fields:
+        if cell_range is None:
+            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        else:
+            first_row, first_col, last_row, last_col = cell_range
+            df = pd.read_excel(excel_file, sheet_name=sheet_name, skiprows=first_row - 1,
+                               nrows=None if last_row is None else last_row - first_row)
+            df = df.iloc[:, first_col - 1:last_col]
+        fields.update(rows=len(df), columns=len(df.columns))
+    count("rows", len(df))
+    count("cells", df.size)
+    
+    if verbose and log:
+        log(f"Processing sheet '{sheet_name}' with {len(df)} rows and {len(df.columns)} columns")
+    elif verbose:
+        print(f"Processing sheet '{sheet_name}' with {len(df)} rows and {len(df.columns)} columns")
+    
+    # Convert DataFrame to list of lists for reportlab Table, formatting
+    # whole columns with their Excel number formats (.xls workbooks have none)
+    if number_formats:
+        with span("formats", sheet=sheet_name):
+            if excel_file.engine == "openpyxl":
+                formats = column_number_formats(excel_file.book, sheet_name, len(df.columns), cell_range=cell_range)
+            else:
+                formats = [GENERAL] * len(df.columns)
+        with span("stringify", sheet=sheet_name):
+            columns = [format_column(df.iloc[:, col_idx], number_format) for col_idx, number_format in enumerate(formats)]
+            data = [df.columns.tolist()] + columns_to_rows(columns, len(df))
+    else:
+        with span("stringify", sheet=sheet_name):
+            text_df = df.fillna('').astype(str)
+            data = [df.columns.tolist()] + text_df.values.tolist()
+        columns = [text_df.iloc[:, col_idx].to_numpy() for col_idx in range(len(df.columns))]
+    
+    # Measure column widths from the same stringified cells used for the table
+    # Large sheets are estimated from a sample of rows (see layout.calculate_column_widths)
+    sampled = auto_adjust and width_sample_threshold is not None and len(df) > width_sample_threshold
+    with span("widths", sheet=sheet_name, sampled=sampled):
+        col_widths = calculate_column_widths([str(c) for c in df.columns], columns, auto_adjust,
+                                             width_sample_threshold, width_sample_size)
+    
+    # Row heights follow from line counts, so reportlab never measures the cells
+    with span("heights", sheet=sheet_name):
+        row_heights = body_row_heights(columns, len(df))
+    
+    if verbose and log:
+        if sampled:
+            log(f"  Estimated column widths from {min(width_sample_size, len(df))} of {len(df)} rows")
+        if auto_adjust:
+            log(f"  Applied comprehensive auto-adjustment for sheet: {sheet_name}")
+        else:
+            log(f"  Using equal column widths for sheet: {sheet_name}")
+    elif verbose:
+        if sampled:
+            print(f"  Estimated column widths from {min(width_sample_size, len(df))} of {len(df)} rows")
+        if auto_adjust:
+            print(f"  Applied comprehensive auto-adjustment for sheet: {sheet_name}")
+        else:
+            print(f"  Using equal column widths for sheet: {sheet_name}")
+    
+    # Cell styles come from the workbook pandas already opened with openpyxl
+    styles = None
+    if preserve_styles:
+        if excel_file.engine != "openpyxl":
+            raise ValueError("Cell styles can only be preserved for .xlsx workbooks")
+        style_table = StyleTable()
+        with span("styles", sheet=sheet_name):
+            style_rows = iter_style_rows(excel_file.book, sheet_name, len(df.columns), style_table, cell_range)
+            styles = BlockStyles(style_table, read_style_grid(style_rows, len(df), len(df.columns)))
+            style_rows.close()
+        if verbose and log:
+            log(f"  Preserved {len(style_table) - 1} distinct cell styles")
+        elif verbose:
+            print(f"  Preserved {len(style_table) - 1} distinct cell styles")
+    
+    yield data[0], data[1:], col_widths, row_heights, styles
+
+@functools.lru_cache(maxsize=None)
+def _sample_styles():
+    """Return reportlab's sample stylesheet, built once per process."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    
+    return getSampleStyleSheet()
+
+def _iter_sheet_blocks(excel_source, sheet_name, reader="pandas", verbose=False, log=None, auto_adjust=True, row_window=DEFAULT_ROW_WINDOW, width_sample_threshold=DEFAULT_SAMPLE_THRESHOLD, width_sample_size=DEFAULT_SAMPLE_SIZE, preserve_styles=False, number_formats=True, cell_range=None):
+    """Yield (header, rows, col_widths, row_heights, styles) blocks of one sheet for either engine.
+
+    Every block of a sheet shares the header and column widths; `row_heights`
+    are the body_row_heights() of that block's rows and `styles` their
+    BlockStyles, or None unless `preserve_styles` is set. With `number_formats`
+    cells read as Excel shows them (see formatting), otherwise as str() of
+    their values. A `cell_range` (a selection.CellRange) limits the sheet to
+    that block, its first row being the header.
+    """
+    if reader != "pandas":
+        return _iter_streaming_sheet_blocks(
+            excel_source, sheet_name, verbose=verbose, log=log, auto_adjust=auto_adjust, row_window=row_window,
+            width_sample_threshold=width_sample_threshold, width_sample_size=width_sample_size,
+            preserve_styles=preserve_styles, number_formats=number_formats, backend=_row_backend(reader),
+            cell_range=cell_range,
+        )
+    return _iter_pandas_sheet_blocks(
+        excel_source, sheet_name, verbose=verbose, log=log, auto_adjust=auto_adjust,
+        width_sample_threshold=width_sample_threshold, width_sample_size=width_sample_size,
+        preserve_styles=preserve_styles, number_formats=number_formats, cell_range=cell_range,
+    )
+
+def _iter_story(sheets, show_titles=False, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield the flowables for (sheet_name, blocks) pairs, with sheet titles and page breaks.
+
+    Blocks are read only when reportlab reaches them, so at most one sheet
+    (or, with the streaming reader, one row window) is in memory at a time.
+    """
+    from reportlab.platypus import Spacer, Paragraph, PageBreak
+    
+    styles = _sample_styles()
+    
+    for i, (sheet_name, blocks) in enumerate(sheets):
+        # Add page break between sheets
+        if i:
+            yield PageBreak()
+        
+        # Add sheet title (only if processing multiple sheets)
+        if show_titles:
+            yield Paragraph(f"{sheet_name}", styles['Heading2'])
+            yield Spacer(1, 12)
+        
+        # Laid out a page of rows at a time, with the header at the top of every page
+        yield _sheet_table(blocks, chunk_rows)
+    
+    yield Spacer(1, 24)
+
+def _read_sheet_blocks(excel_path, sheets_to_process, reader, options):
+    """Yield (sheet_name, block) for every block of `sheets_to_process`; a None block opens each sheet.
+
+    Runs in the pipeline's reader process, which opens the workbook itself.
+    """
+    excel_source = _open_excel_source(excel_path, reader)
+    for sheet_name in sheets_to_process:
+        yield sheet_name, None
+        for block in _iter_sheet_blocks(excel_source, sheet_name, reader=reader, **options):
+            yield sheet_name, block
+
+def _iter_sheets(excel_path, excel_source, sheets_to_process, reader="pandas", pipeline_depth=0, pipeline_stats=None, **options):
+    """Yield (sheet_name, blocks) pairs for the engines, in sheet order.
+
+    `excel_source` is the workbook path for the streamed readers and a
+    pd.ExcelFile for the pandas reader. With a `pipeline_depth` the sheets are
+    read ahead in a reader process instead (see pipeline), at most that many
+    blocks ahead of rendering.
+    """
+    if not pipeline_depth:
+        for sheet_name in sheets_to_process:
+            yield sheet_name, _iter_sheet_blocks(excel_source, sheet_name, reader=reader, **options)
+        return
+    
+    # A GUI log callback cannot be sent to another process, so the reader stays quiet
+    reader_options = dict(options, verbose=options.get('verbose') and options.get('log') is None, log=None)
+    items = iter_pipelined(_read_sheet_blocks, (excel_path, sheets_to_process, reader, reader_options),
+                           depth=pipeline_depth, stats=pipeline_stats)
+    for sheet_name, group in itertools.groupby(items, key=lambda item: item[0]):
+        yield sheet_name, (block for _, block in group if block is not None)
+
+def _build_pdf(target, excel_path, excel_source, sheets_to_process, reader, options, show_titles=None):
+    """Render `sheets_to_process` into `target` with the engine named in `options` and return the page count."""
+    options = dict(options)
+    engine = options.pop('engine', 'platypus')
+    chunk_rows = options.pop('chunk_rows', DEFAULT_CHUNK_ROWS)
+    pipeline_depth = options.pop('pipeline_depth', 0)
+    verbose, log = options.get('verbose'), options.get('log')
+    if show_titles is None:
+        show_titles = len(sheets_to_process) > 1
+    
+    # Reading ahead needs a next sheet, and a second CPU to read it on
+    if len(sheets_to_process) < 2 or (os.cpu_count() or 1) < 2:
+        pipeline_depth = 0
+    pipeline_stats = PipelineStats(pipeline_depth) if pipeline_depth else None
+    sheets = _iter_sheets(excel_path, excel_source, sheets_to_process, reader=reader,
+                          pipeline_depth=pipeline_depth, pipeline_stats=pipeline_stats, **options)
+    
+    if engine == "canvas":
+        from .canvas_engine import draw_sheets
+        
+        pages = draw_sheets(target, sheets, show_titles=show_titles)
+    else:
+        from reportlab.lib.pagesizes import landscape, A4
+        from reportlab.platypus import SimpleDocTemplate
+        
+        doc = SimpleDocTemplate(target if hasattr(target, 'write') else str(target), pagesize=landscape(A4))
+        doc.build(_LazyStory(_iter_story(sheets, show_titles=show_titles, chunk_rows=chunk_rows)))
+        pages = doc.page
+    
+    if pipeline_stats is not None:
+        for line in pipeline_stats.summary_lines():
+            if verbose and log:
+                log(line)
+            elif verbose:
+                print(line)
+    return pages
+
+def _row_backend(reader):
+    """Return the readers backend a streamed `reader` parses rows with."""
+    return DEFAULT_BACKEND if reader == "streaming" else reader
+
+def resolve_reader(reader):
+    """Return the reader to use for `reader`: "auto" is calamine when python-calamine is installed, else pandas."""
+    if reader == "auto":
+        return "calamine" if calamine_available() else "pandas"
+    return reader
+
+def _open_excel_source(excel_path, reader):
+    """Return the object _iter_sheet_blocks() reads sheets from for `reader`."""
+    if reader != "pandas":
+        return excel_path
+    import pandas as pd
+    return pd.ExcelFile(open_workbook(excel_path))
+
+def _render_sheet_part(excel_path, part_path, sheet_name, reader, options, excel_source=None):
+    """Render one sheet to its own titled PDF (runs inside worker processes)."""
+    if excel_source is None:
+        with span("open"):
+            excel_source = _open_excel_source(excel_path, reader)
+    with span("build", sheet=sheet_name):
+        _build_pdf(part_path, excel_path, excel_source, [sheet_name], reader, options, show_titles=True)
+    return part_path
+
+def _render_parts(excel_path, parts, reader, options, jobs=1, verbose=False, log=None):
+    """Render (sheet_name, part_path) pairs, in worker processes when `jobs` is above one."""
+    if jobs > 1 and len(parts) > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        # A GUI log callback cannot be sent to another process, so workers stay quiet
+        worker_options = dict(options, verbose=verbose and log is None, log=None)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(_render_sheet_part, excel_path, part_path, sheet_name, reader, worker_options): sheet_name
+                for sheet_name, part_path in parts
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if verbose and log:
+                    log(f"  Rendered sheet '{futures[future]}' ({done}/{len(parts)})")
+                elif verbose:
+                    print(f"  Rendered sheet '{futures[future]}' ({done}/{len(parts)})")
+        return
+    
+    # In-process parts share one open workbook instead of reloading it per sheet
+    with span("open"):
+        excel_source = _open_excel_source(excel_path, reader) if parts else None
+    for done, (sheet_name, part_path) in enumerate(parts, 1):
+        _render_sheet_part(excel_path, part_path, sheet_name, reader, options, excel_source=excel_source)
+        if verbose and log:
+            log(f"  Rendered sheet '{sheet_name}' ({done}/{len(parts)})")
+        elif verbose:
+            print(f"  Rendered sheet '{sheet_name}' ({done}/{len(parts)})")
+
+def _fragment_settings(reader, options):
+    """Return the options a sheet fragment depends on."""
+    settings = {name: value for name, value in options.items() if name not in CACHE_IGNORED_OPTIONS}
+    settings['reader'] = reader
+    return settings
+
+def _converted_before(excel_path, reader, options, fragment_cache):
+    """Record a conversion of the workbook file with these settings; return True if one was recorded before.
+
+    Fingerprinting costs a full pass over every cell, so sheets are only
+    fingerprinted and cached as fragments once the same workbook is converted
+    again (as when it is edited and reconverted); a one-off conversion, or one
+    of workbook bytes, renders as a single document.
+    """
+    if not is_path(excel_path):
+        return False
+    name = json.dumps([str(Path(excel_path).resolve()), _fragment_settings(reader, options)],
+                      sort_keys=True, default=str)
+    return fragment_cache.seen(name)
+
+def _reuse_fragments(excel_path, sheet_parts, reader, options, fragment_cache, verbose=False, log=None):
+    """Fill part files from the fragment cache and return {sheet_name: fingerprint} for the rest.
+
+    Returns None when the workbook cannot be fingerprinted (e.g. legacy .xls),
+    in which case every sheet is rendered and nothing is cached.
+    """
+    settings = _fragment_settings(reader, options)
+    try:
+        with span("fingerprint", sheets=len(sheet_parts)):
+            fingerprints = sheet_fingerprints(excel_path, [sheet_name for sheet_name, _ in sheet_parts], settings)
+    except Exception as e:
+        if verbose and log:
+            log(f"Sheet fragments not cached: {e}")
+        elif verbose:
+            print(f"Sheet fragments not cached: {e}")
+        return None
+    
+    return {
+        sheet_name: fingerprints[sheet_name]
+        for sheet_name, part_path in sheet_parts
+        if not fragment_cache.fetch(fingerprints[sheet_name], part_path)
+    }
+
+def _render_sheets_as_parts(excel_path, pdf_path, sheets_to_process, reader, options, parallel=False, jobs=None, fragment_cache=None, verbose=False, log=None):
+    """Render each sheet to a separate PDF and merge them in sheet order.
+
+    Every part starts on a new page and carries its sheet title, so the merged
+    file has the same page breaks and titles as a single-document build. With
+    `parallel` the parts are rendered in worker processes; with a
+    `fragment_cache` sheets whose cells and options are unchanged reuse their
+    previously rendered part and only the changed sheets are rendered.
+    """
+    import tempfile
+    
+    temp_dir = tempfile.mkdtemp()
+    sheet_parts = [
+        (sheet_name, os.path.join(temp_dir, f"sheet_{i:03d}.pdf"))
+        for i, sheet_name in enumerate(sheets_to_process, 1)
+    ]
+    
+    try:
+        stale = None
+        if fragment_cache is not None:
+            stale = _reuse_fragments(excel_path, sheet_parts, reader, options, fragment_cache, verbose=verbose, log=log)
+        to_render = [(sheet_name, part_path) for sheet_name, part_path in sheet_parts if stale is None or sheet_name in stale]
+        
+        if stale is not None:
+            if verbose and log:
+                log(f"Reused {len(sheet_parts) - len(to_render)} cached sheets, rendering {len(to_render)}")
+            elif verbose:
+                print(f"Reused {len(sheet_parts) - len(to_render)} cached sheets, rendering {len(to_render)}")
+        
+        jobs = min(jobs or os.cpu_count() or 1, len(to_render)) if parallel else 1
+        if jobs > 1:
+            if verbose and log:
+                log(f"Rendering {len(to_render)} sheets in parallel with {jobs} workers")
+            elif verbose:
+                print(f"Rendering {len(to_render)} sheets in parallel with {jobs} workers")
+        _render_parts(excel_path, to_render, reader, options, jobs=jobs, verbose=verbose, log=log)
+        
+        if stale:
+            for sheet_name, part_path in to_render:
+                fragment_cache.store(stale[sheet_name], part_path)
+        
+        with span("merge", parts=len(sheet_parts)):
+            merge_stats = merge_pdfs_with_pypdf2([part_path for _, part_path in sheet_parts], pdf_path)
+        count("pages", merge_stats['pages'])
+        count("bytes", merge_stats['bytes_written'])
+        if verbose and log:
+            log(format_merge_stats(merge_stats))
+        elif verbose:
+            print(format_merge_stats(merge_stats))
+    finally:
+        for _, part_path in sheet_parts:
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+        try:
+            os.rmdir(temp_dir)
+        except OSError:
+            pass
+
+@timed("convert")
+def convert_with_pandas_reportlab(excel_path, pdf_path, all_sheets=False, verbose=False, log=None, auto_adjust=True, aggressive_adjust=False, reader="pandas", row_window=DEFAULT_ROW_WINDOW, chunk_rows=DEFAULT_CHUNK_ROWS, parallel_sheets=False, jobs=None, fragment_cache=None, width_sample_threshold=DEFAULT_SAMPLE_THRESHOLD, width_sample_size=DEFAULT_SAMPLE_SIZE, engine="platypus", pipeline_depth=DEFAULT_PIPELINE_DEPTH, preserve_styles=False, number_formats=True, sheets=None, cell_range=None):
+    """Convert Excel to PDF using pandas and reportlab (fallback method).
 
-def convert_with_pandas_reportlab(excel_path, pdf_path, all_sheets=False, verbose=False, log=None, auto_adjust=True, aggressive_adjust=False):
-    """Convert Excel to PDF using pandas and reportlab (fallback method)."""
+    With a `fragment_cache` (an OutputCache) a multi-sheet workbook file that
+    was converted before with the same options is rendered one PDF fragment
+    per sheet, and sheets whose cells and options are unchanged reuse their
+    cached fragment instead of being read and rendered again.
+    
+    `excel_path` may also be workbook bytes or a binary file-like object, and
+    `pdf_path` any writable binary stream; stream outputs are rendered in
+    memory and written in one piece once the PDF is complete.
+    
+    Column widths of sheets with more than `width_sample_threshold` rows (None
+    to always measure every cell) are estimated from `width_sample_size` rows.
+    
+    `engine` "platypus" lays the sheets out as reportlab tables; "canvas" draws
+    the same grid straight onto the page canvas, which is much faster on large
+    sheets (see canvas_engine).
+    
+    With several sheets in one document, the next sheet is read in a separate
+    process while the current one renders, up to `pipeline_depth` row blocks
+    ahead (0 reads each sheet inline; see pipeline).
+    
+    With `preserve_styles` body cells keep their bold/italic font, font colour,
+    solid fill and horizontal alignment from an .xlsx workbook (see styles).
+    
+    With `number_formats` cells show their numbers and dates with each
+    column's Excel number format (see formatting); without, as str() of the
+    cell values.
+    
+    `sheets` picks the sheets to convert instead of `all_sheets` (names,
+    1-based indexes and ranges such as "Summary,3-5"; see selection) and a
+    `cell_range` such as "A1:H5000" limits every sheet to that block, whose
+    first row is the header. Unselected sheets are never parsed and rows are
+    read only up to the range's last row.
+    """
+    if reader not in READERS:
+        raise ValueError(f"Unknown reader '{reader}'. Expected one of: {', '.join(READERS)}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Expected one of: {', '.join(ENGINES)}")
+    if pipeline_depth < 0:
+        raise ValueError("Pipeline depth must not be negative")
+    cell_range = parse_cell_range(cell_range)
+    
     try:
         import pandas as pd
         from reportlab.lib.pagesizes import letter, landscape, A4
@@ -403,189 +841,290 @@ def convert_with_pandas_reportlab(excel_path, pdf_path, all_sheets=False, verbos
         from reportlab.lib.styles import getSampleStyleSheet
         from reportlab.lib import colors
         from reportlab.lib.units import inch, cm
-        from reportlab.platypus.flowables import KeepTogether
     except ImportError as e:
         raise ImportError(f"Required packages not available: {e}")
     
+    excel_path = workbook_input(excel_path)
+    # Streams get the finished PDF in one write, so a failure never leaves half a file in them
+    target = pdf_path if is_path(pdf_path) else io.BytesIO()
+    
     if verbose and log:
-        log(f"Using pandas+reportlab to convert {excel_path} to {pdf_path}")
+        log(f"Using pandas+reportlab to convert {describe_source(excel_path)} to {describe_source(pdf_path)}")
         log(f"Auto-adjust cell dimensions: {auto_adjust}")
         log(f"Aggressive adjustment: {aggressive_adjust}")
     elif verbose:
-        print(f"Using pandas+reportlab to convert {excel_path} to {pdf_path}")
+        print(f"Using pandas+reportlab to convert {describe_source(excel_path)} to {describe_source(pdf_path)}")
         print(f"Auto-adjust cell dimensions: {auto_adjust}")
         print(f"Aggressive adjustment: {aggressive_adjust}")
     
-    # Read Excel file
-    excel_file = pd.ExcelFile(excel_path)
-    
-    # Create PDF document with A4 landscape for better column fitting
-    doc = SimpleDocTemplate(str(pdf_path), pagesize=landscape(A4))
-    story = []
-    styles = getSampleStyleSheet()
+    # Read Excel file (streamed readers only list sheets here)
+    reader = resolve_reader(reader)
+    if reader != "calamine" and detect_format(excel_path) == "ods":
+        raise ValueError("OpenDocument spreadsheets (.ods) can only be read with the calamine reader")
+    with span("open", reader=reader):
+        if reader != "pandas":
+            sheet_names = streaming_sheet_names(excel_path, _row_backend(reader))
+        else:
+            excel_file = pd.ExcelFile(open_workbook(excel_path))
+            sheet_names = excel_file.sheet_names
     
-    sheet_names = excel_file.sheet_names
     if verbose and log:
         log(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
     elif verbose:
         print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
     
-    # Process sheets based on the all_sheets parameter
-    sheets_to_process = sheet_names if all_sheets else sheet_names[:1] if sheet_names else []
+    # Process the selected sheets, else sheets based on the all_sheets parameter
+    if sheets:
+        sheets_to_process = select_sheets(sheet_names, sheets)
+    else:
+        sheets_to_process = sheet_names if all_sheets else sheet_names[:1] if sheet_names else []
+    if sheets or cell_range is not None:
+        range_note = f", range {excel_address(cell_range)}" if cell_range is not None else ""
+        if verbose and log:
+            log(f"Selected {len(sheets_to_process)} of {len(sheet_names)} sheets{range_note}")
+        elif verbose:
+            print(f"Selected {len(sheets_to_process)} of {len(sheet_names)} sheets{range_note}")
+    
+    options = {
+        'verbose': verbose,
+        'log': log,
+        'auto_adjust': auto_adjust,
+        'row_window': row_window,
+        'chunk_rows': chunk_rows,
+        'width_sample_threshold': width_sample_threshold,
+        'width_sample_size': width_sample_size,
+        'engine': engine,
+        'pipeline_depth': pipeline_depth,
+        'preserve_styles': preserve_styles,
+        'number_formats': number_formats,
+        'cell_range': cell_range,
+    }
     
-    for i, sheet_name in enumerate(sheets_to_process):
-        # Read sheet
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    if fragment_cache is not None and (len(sheets_to_process) < 2
+                                       or not _converted_before(excel_path, reader, options, fragment_cache)):
+        fragment_cache = None
+    if len(sheets_to_process) > 1 and (parallel_sheets or fragment_cache is not None):
+        _render_sheets_as_parts(excel_path, target, sheets_to_process, reader, options,
+                                parallel=parallel_sheets, jobs=jobs, fragment_cache=fragment_cache,
+                                verbose=verbose, log=log)
+    else:
+        excel_source = excel_path if reader != "pandas" else excel_file
         
+        # Build PDF; sheets are read as reportlab reaches them
         if verbose and log:
-            log(f"Processing sheet '{sheet_name}' with {len(df)} rows and {len(df.columns)} columns")
+            log("Building PDF document with optimized column widths")
         elif verbose:
-            print(f"Processing sheet '{sheet_name}' with {len(df)} rows and {len(df.columns)} columns")
+            print("Building PDF document with optimized column widths")
         
-        # Add sheet title (only if processing multiple sheets)
-        if len(sheets_to_process) > 1:
-            title = Paragraph(f"{sheet_name}", styles['Heading2'])
-            story.append(title)
-            story.append(Spacer(1, 12))
-        
-        # Convert DataFrame to list of lists for reportlab Table
-        data = [df.columns.tolist()] + df.fillna('').astype(str).values.tolist()
-        
-        # Create table
-        table = Table(data)
-        
-        if auto_adjust:
-            # Calculate optimal column widths based on content
-            available_width = landscape(A4)[0] - 2 * cm  # A4 landscape width minus margins
-            col_count = len(df.columns)
-            
-            # Calculate column widths based on content length with better algorithm
-            col_widths = []
-            for col_idx in range(col_count):
-                # Get maximum content length in this column
-                max_length = len(str(df.columns[col_idx])) if col_idx < len(df.columns) else 10
-                
-                # Check data in this column with more detailed analysis
-                if col_idx < len(df.columns):
-                    col_data = df.iloc[:, col_idx].astype(str)
-                    if len(col_data) > 0:
-                        # Get the longest content in this column
-                        max_data_length = col_data.str.len().max()
-                        max_length = max(max_length, max_data_length)
-                        
-                        # Check for cells with multiple lines (containing \n)
-                        multiline_cells = col_data[col_data.str.contains('\n', na=False)]
-                        if len(multiline_cells) > 0:
-                            # For multiline cells, calculate width based on longest line
-                            max_line_length = 0
-                            for cell in multiline_cells:
-                                lines = cell.split('\n')
-                                for line in lines:
-                                    max_line_length = max(max_line_length, len(line))
-                            max_length = max(max_length, max_line_length)
-                
-                # Set minimum and maximum widths with better constraints
-                min_width = 2 * cm  # Increased minimum width
-                max_width = 6 * cm  # Increased maximum width for better readability
-                
-                # Calculate width based on content with better padding
-                # Use a more generous formula to prevent text cutting
-                content_width = max(min_width, min(max_width, (max_length + 4) * 0.4 * cm))
-                col_widths.append(content_width)
-            
-            # Adjust total width to fit available space with better distribution
-            total_width = sum(col_widths)
-            if total_width > available_width:
-                # Scale down proportionally but maintain minimum widths
-                scale_factor = available_width / total_width
-                # Ensure no column goes below minimum width
-                scaled_widths = [max(2 * cm, w * scale_factor) for w in col_widths]
-                # Redistribute remaining space
-                remaining_space = available_width - sum(scaled_widths)
-                if remaining_space > 0:
-                    extra_per_col = remaining_space / col_count
-                    col_widths = [w + extra_per_col for w in scaled_widths]
-                else:
-                    col_widths = scaled_widths
-            elif total_width < available_width:
-                # Distribute extra space evenly but maintain proportions
-                extra_space = available_width - total_width
-                extra_per_col = extra_space / col_count
-                col_widths = [w + extra_per_col for w in col_widths]
-            
-            # Set column widths
-            table._argW = col_widths
-            
-            if verbose and log:
-                log(f"  Applied comprehensive auto-adjustment for sheet: {sheet_name}")
-            elif verbose:
-                print(f"  Applied comprehensive auto-adjustment for sheet: {sheet_name}")
-        else:
-            # Use equal column widths when auto-adjust is disabled
-            available_width = landscape(A4)[0] - 2 * cm
-            col_count = len(df.columns)
-            col_width = available_width / col_count if col_count > 0 else 2 * cm
-            table._argW = [col_width] * col_count
-            
-            if verbose and log:
-                log(f"  Using equal column widths for sheet: {sheet_name}")
-            elif verbose:
-                print(f"  Using equal column widths for sheet: {sheet_name}")
-        
-        # Style the table with better formatting
-        table.setStyle(TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            
-            # Data styling
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Changed to TOP for better text wrapping
-            ('TOPPADDING', (0, 1), (-1, -1), 8),   # Increased padding
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8), # Increased padding
-            ('LEFTPADDING', (0, 1), (-1, -1), 6),   # Increased padding
-            ('RIGHTPADDING', (0, 1), (-1, -1), 6),  # Increased padding
-            
-            # Grid styling
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            
-            # Text wrapping and overflow prevention
-            ('WORDWRAP', (0, 0), (-1, -1), True),
-            ('LEADING', (0, 0), (-1, -1), 12),  # Line spacing for better readability
-        ]))
-        
-        # Wrap table in KeepTogether to prevent splitting across pages
-        story.append(KeepTogether(table))
-        
-        # Add page break between sheets (except for the last sheet)
-        if i < len(sheets_to_process) - 1:
-            story.append(PageBreak())
+        # Reading, width analysis and table construction run inside the build as
+        # reportlab pulls flowables, so their spans nest under "build"
+        with span("build", sheets=len(sheets_to_process)):
+            pages = _build_pdf(target, excel_path, excel_source, sheets_to_process, reader, options)
+        count("pages", pages)
+        count("bytes", os.path.getsize(target) if target is pdf_path else target.tell())
+    
+    if target is not pdf_path:
+        write_output(pdf_path, target.getvalue())
+
+def _cache_key_options(method, options):
+    """Return every option that affects the output, converter defaults included."""
+    converter = convert_with_win32com if method == "win32com" else convert_with_pandas_reportlab
+    key_options = {
+        name: parameter.default
+        for name, parameter in inspect.signature(converter).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+    key_options.update(options)
+    for name in CACHE_IGNORED_OPTIONS:
+        key_options.pop(name, None)
+    key_options.update(method=method, page_settings=PAGE_SETTINGS)
+    return key_options
+
+def convert_cached(input_path, output_path, method, options, cache=None):
+    """Convert with the selected method, reusing a cached PDF when possible.
+
+    Returns 'hit' or 'miss' when a cache is given and None otherwise. The
+    input may be workbook bytes or a file-like object and the output a
+    writable binary stream, as for the converters.
+    """
+    input_path = workbook_input(input_path)
+    key = None
+    if cache is not None:
+        with span("cache_lookup") as fields:
+            key = cache.key(input_path, _cache_key_options(method, options))
+            fields['hit'] = cache.fetch(key, output_path)
+        if fields['hit']:
+            return "hit"
+    
+    # Never write into a hard link shared with a cache entry (left by earlier versions)
+    detach_output(output_path)
+    # A stream cannot be read back, so a cached conversion keeps its own copy to store
+    target = io.BytesIO() if cache is not None and not is_path(output_path) else output_path
+    if method == "win32com":
+        convert_with_win32com(input_path, target, **options)
+    else:
+        fragment_cache = cache.sheet_cache() if cache is not None else None
+        convert_with_pandas_reportlab(input_path, target, fragment_cache=fragment_cache, **options)
+    
+    if cache is not None:
+        with span("cache_store"):
+            cache.store(key, output_path if target is output_path else target.getvalue())
+        if target is not output_path:
+            write_output(output_path, target.getvalue())
+        return "miss"
+    return None
+
+def _make_cache(args):
+    """Return the OutputCache selected on the command line, or None with --no-cache."""
+    if args.no_cache:
+        return None
+    return OutputCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+
+def _conversion_options(args, method):
+    """Return the keyword arguments for the converter selected by `method`."""
+    options = {'all_sheets': args.all_sheets, 'verbose': args.verbose, 'sheets': args.sheets, 'cell_range': args.range}
+    if method != "win32com":
+        options.update(reader=args.reader, row_window=args.row_window, chunk_rows=args.chunk_rows,
+                       parallel_sheets=args.parallel_sheets, jobs=args.jobs,
+                       width_sample_threshold=args.width_sample_threshold or None,
+                       width_sample_size=args.width_sample_size, engine=args.engine,
+                       pipeline_depth=args.pipeline_depth, preserve_styles=args.preserve_styles,
+                       number_formats=not args.raw_values)
+    return options
+
+def _convert_in_daemon(args, input_path, output_path, method):
+    """Hand the conversion to a running `exceltopdf serve`; returns False if none is reachable."""
+    cache = None
+    if not args.no_cache:
+        cache_dir = OutputCache(args.cache_dir).cache_dir
+        cache = {'dir': str(Path(cache_dir).resolve()), 'max_bytes': args.cache_size * 1024 * 1024}
+    request = {
+        'command': 'convert',
+        'input': str(input_path.resolve()),
+        'output': str(output_path.resolve()),
+        'method': method,
+        'options': _conversion_options(args, method),
+        'cache': cache,
+    }
+    response = request_server(request, args.socket)
+    if response is None or response.get('retry'):
+        return False
+    
+    for message in response.get('messages', []):
+        print(message)
+    if not response['ok']:
+        error_type = ImportError if response.get('error_type') == 'ImportError' else RuntimeError
+        raise error_type(response['error'])
+    if args.verbose:
+        if response.get('cache_summary'):
+            print(response['cache_summary'])
+        print(f"Converted by the conversion server in {response['seconds']:.2f}s")
+    return True
+
+def _run_batch_mode(args, method):
+    """Convert every workbook matched by args.input into the args.output directory."""
+    try:
+        input_paths = expand_inputs(args.input)
+    except OSError as e:
+        print(f"Error: Could not read batch input '{args.input}': {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if not input_paths:
+        print(f"Error: No Excel files found for '{args.input}'.", file=sys.stderr)
+        sys.exit(1)
+    
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    planned = plan_outputs(input_paths, output_dir)
+    
+    if args.verbose:
+        print(f"Batch converting {len(planned)} workbooks to '{output_dir}' using method: {method}")
+    
+    def report(result):
+        if result['ok']:
+            print(f"Converted: {result['output']}")
         else:
-            story.append(Spacer(1, 24))
+            print(f"Failed: {result['input']}: {result['error']}", file=sys.stderr)
     
-    # Build PDF
-    if verbose and log:
-        log("Building PDF document with optimized column widths")
-    elif verbose:
-        print("Building PDF document with optimized column widths")
+    results = run_batch(planned, method, _conversion_options(args, method), jobs=args.jobs,
+                        on_result=report, cache=_make_cache(args))
     
-    doc.build(story)
+    for line in format_summary(results):
+        print(line)
+    
+    if any(not result['ok'] for result in results):
+        sys.exit(1)
 
-def main():
-    """Main CLI function."""
+def _run_watch_mode(argv):
+    """Entry point for `exceltopdf watch`: reconvert the workbooks of a directory as they are saved."""
     parser = argparse.ArgumentParser(
-        description="Convert Excel files to PDF with all columns fitting on one page per sheet."
+        prog="exceltopdf watch",
+        description="Watch a directory and convert each workbook to a PDF beside it whenever it is saved."
     )
-    parser.add_argument("input", help="Input Excel file path (.xlsx, .xls)")
-    parser.add_argument("output", help="Output PDF file path")
+    parser.add_argument("directory", help="Directory of workbooks to watch (not recursive)")
+    parser.add_argument("--output-dir", default=None, help="Directory for the PDFs (default: the watched directory)")
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help=f"Seconds a workbook must go unchanged before it is converted (default: {DEFAULT_DEBOUNCE})"
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll for changes instead of using inotify (needed on network shares); "
+             "polling is also used where inotify is unavailable"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"Seconds between directory scans when polling (default: {DEFAULT_POLL_INTERVAL})"
+    )
+    _add_conversion_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    _check_conversion_arguments(args)
+    if args.debounce < 0 or args.poll_interval <= 0:
+        print("Error: --debounce cannot be negative and --poll-interval must be positive.", file=sys.stderr)
+        sys.exit(1)
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"Error: '{directory}' is not a directory.", file=sys.stderr)
+        sys.exit(1)
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    method = _resolve_method(args.method)
+    workers = args.jobs or os.cpu_count() or 1
+    
+    def report(result):
+        cached = " [cached]" if result.get('cache') == 'hit' else ""
+        if result.get('skipped'):
+            if args.verbose:
+                print(f"Unchanged: {result['input']}", flush=True)
+        elif result['ok']:
+            print(f"Converted: {result['input']} -> {result['output']} in {result['seconds']:.2f}s, "
+                  f"{result['latency']:.2f}s after save{cached}", flush=True)
+        else:
+            print(f"Failed: {result['input']}: {result['error']}", file=sys.stderr, flush=True)
+    
+    events = open_events(directory, polling=args.poll, poll_interval=args.poll_interval)
+    watcher = WorkbookWatcher(directory, method, _conversion_options(args, method), output_dir=output_dir,
+                              workers=workers, debounce=args.debounce, cache=_make_cache(args),
+                              on_result=report, events=events)
+    print(f"Watching '{directory}' with {events.name} (debounce {args.debounce:g}s, {workers} workers); "
+          f"press Ctrl+C to stop", flush=True)
+    # A service manager stops the watcher with SIGTERM; running conversions finish as on Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+def _add_conversion_arguments(parser):
+    """Add the options shared by single-file, batch and watch conversions to `parser`."""
     parser.add_argument(
         "--method", 
         choices=["auto", "win32com", "pandas"],
@@ -597,50 +1136,288 @@ def main():
         action="store_true",
         help="Convert all sheets in Excel file to single PDF (default: False)"
     )
+    parser.add_argument(
+        "--sheets",
+        metavar="SHEETS",
+        default=None,
+        help="Comma-separated sheet names, 1-based indexes and index ranges to convert, "
+             "e.g. 'Summary,3,5-7' (overrides --all-sheets); other sheets are never parsed"
+    )
+    parser.add_argument(
+        "--range",
+        metavar="A1:H5000",
+        default=None,
+        help="Convert only this cell range of each sheet ('A1:H5000', 'A:H' or '1:500'); "
+             "its first row is the header and rows below it are never read"
+    )
     parser.add_argument(
         "--verbose", "-v", 
         action="store_true",
         help="Enable verbose output"
     )
+    parser.add_argument(
+        "--reader",
+        choices=READERS,
+        default="pandas",
+        help="Workbook reader for the pandas method: 'pandas' reads each sheet into a DataFrame; "
+             "'openpyxl-readonly' ('streaming') streams row windows with bounded memory; 'openpyxl' "
+             "loads the whole workbook; 'calamine' (python-calamine, also .xls/.xlsb/.ods) parses "
+             "each whole sheet, many times faster; 'auto' uses calamine when installed, else pandas "
+             "(default: pandas)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="platypus",
+        help="PDF renderer for the pandas method; 'canvas' draws tables directly onto "
+             "the page and is much faster on large sheets (default: platypus)"
+    )
+    parser.add_argument(
+        "--preserve-styles",
+        action="store_true",
+        help="Keep bold/italic text, font colours, solid fills and horizontal alignment of "
+             "body cells from .xlsx workbooks (pandas method)"
+    )
+    parser.add_argument(
+        "--raw-values",
+        action="store_true",
+        help="Print cells as str() of their values instead of with the Excel number format "
+             "of their column (pandas method)"
+    )
+    parser.add_argument(
+        "--pipeline-depth",
+        type=int,
+        default=DEFAULT_PIPELINE_DEPTH,
+        help="Row blocks read ahead in a separate process while the current sheet renders, "
+             f"with several sheets in one document; 0 reads sheets inline (default: {DEFAULT_PIPELINE_DEPTH})"
+    )
+    parser.add_argument(
+        "--row-window",
+        type=int,
+        default=DEFAULT_ROW_WINDOW,
+        help=f"Rows held in memory at a time by the streamed readers (default: {DEFAULT_ROW_WINDOW})"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=f"Maximum data rows per table in the pandas method; pages holding more rows are drawn as several tables (default: {DEFAULT_CHUNK_ROWS})"
+    )
+    parser.add_argument(
+        "--width-sample-threshold",
+        type=int,
+        default=DEFAULT_SAMPLE_THRESHOLD,
+        help="Estimate column widths from a sample of rows on sheets with more data rows than this; "
+             f"0 measures every cell (default: {DEFAULT_SAMPLE_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--width-sample-size",
+        type=int,
+        default=DEFAULT_SAMPLE_SIZE,
+        help=f"Rows measured when estimating column widths: head, tail and random rows (default: {DEFAULT_SAMPLE_SIZE})"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="Worker processes for batch and watch mode and --parallel-sheets (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--parallel-sheets",
+        action="store_true",
+        help="With --all-sheets, render each sheet in a separate worker process and merge the results"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory of cached PDFs reused for unchanged workbooks (default: per-user cache directory)"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f"Maximum cache size in MB; least recently used PDFs are evicted (default: {DEFAULT_CACHE_SIZE_MB})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always convert, without reading or writing the PDF cache"
+    )
+
+def _check_conversion_arguments(args):
+    """Exit with an error message if the shared conversion options are out of range."""
+    if args.row_window < 1:
+        print("Error: --row-window must be at least 1.", file=sys.stderr)
+        sys.exit(1)
     
-    args = parser.parse_args()
+    if args.chunk_rows < 1:
+        print("Error: --chunk-rows must be at least 1.", file=sys.stderr)
+        sys.exit(1)
     
-    # Validate input file
-    input_path = Path(args.input)
-    if not input_path.exists():
-        print(f"Error: Input file '{input_path}' does not exist.", file=sys.stderr)
+    if args.width_sample_threshold < 0:
+        print("Error: --width-sample-threshold cannot be negative.", file=sys.stderr)
         sys.exit(1)
     
-    if input_path.suffix.lower() not in ['.xlsx', '.xls']:
-        print(f"Error: Input file must be an Excel file (.xlsx or .xls).", file=sys.stderr)
+    if args.width_sample_size < 1:
+        print("Error: --width-sample-size must be at least 1.", file=sys.stderr)
         sys.exit(1)
     
-    # Create output directory if it doesn't exist
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if args.pipeline_depth < 0:
+        print("Error: --pipeline-depth must not be negative.", file=sys.stderr)
+        sys.exit(1)
     
-    # Determine conversion method
-    method = args.method
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.cache_size < 1:
+        print("Error: --cache-size must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.range is not None:
+        try:
+            parse_cell_range(args.range)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+def _resolve_method(method):
+    """Return the conversion method for `method`: "auto" is win32com on Windows and pandas elsewhere."""
     if method == "auto":
         if platform.system() == "Windows":
-            method = "win32com"
-        else:
-            method = "pandas"
+            return "win32com"
+        return "pandas"
+    return method
+
+def main():
+    """Main CLI function."""
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "watch":
+        _run_watch_mode(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "server":
+        server_main(sys.argv[2:])
+        return
+    
+    parser = argparse.ArgumentParser(
+        description="Convert Excel files to PDF with all columns fitting on one page per sheet."
+    )
+    parser.add_argument(
+        "input",
+        help="Input Excel file path (.xlsx, .xls), '-' to read the workbook from stdin, or for batch mode "
+             "a directory, a quoted glob pattern, or @manifest.txt listing one workbook per line"
+    )
+    parser.add_argument("output", help="Output PDF file path, '-' for stdout (output directory in batch mode)")
+    _add_conversion_arguments(parser)
+    parser.add_argument(
+        "--profile",
+        metavar="OUT.json",
+        default=None,
+        help="Write per-stage timings and counters (rows, cells, pages, bytes) as JSON"
+    )
+    parser.add_argument(
+        "--cprofile-dir",
+        metavar="DIR",
+        default=None,
+        help="With --profile, also write a cProfile dump per stage (<stage>.prof) to DIR"
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Convert in this process even when an 'exceltopdf serve' server is running"
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Unix socket of the conversion server (default: $EXCELTOPDF_SOCKET or a per-user path)"
+    )
+    
+    args = parser.parse_args()
+    
+    _check_conversion_arguments(args)
+    
+    # Determine conversion method
+    method = _resolve_method(args.method)
+    
+    if args.cprofile_dir and not args.profile:
+        print("Error: --cprofile-dir requires --profile.", file=sys.stderr)
+        sys.exit(1)
+    
+    if is_batch_input(args.input):
+        if args.profile:
+            print("Warning: --profile only applies to single-file conversions and is ignored in batch mode.",
+                  file=sys.stderr)
+        _run_batch_mode(args, method)
+        return
+    
+    # "-" reads the workbook from stdin and writes the PDF to stdout
+    from_stdin = args.input == "-"
+    to_stdout = args.output == "-"
+    # Status messages must stay out of a PDF written to stdout
+    status = sys.stderr if to_stdout else sys.stdout
+    
+    # Validate input file
+    if from_stdin:
+        input_path = sys.stdin.buffer.read()
+        input_label = "standard input"
+        if not input_path:
+            print("Error: No workbook data on standard input.", file=sys.stderr)
+            sys.exit(1)
+    else:
+        input_path = input_label = Path(args.input)
+        if not input_path.exists():
+            print(f"Error: Input file '{input_path}' does not exist.", file=sys.stderr)
+            sys.exit(1)
+    
+    # The file type comes from the workbook's bytes, not its name
+    if detect_format(input_path) is None:
+        print("Error: Input must be a workbook (.xlsx, .xls, .xlsb or .ods).", file=sys.stderr)
+        sys.exit(1)
+    
+    if to_stdout:
+        output_path = sys.stdout.buffer
+        output_label = "standard output"
+    else:
+        # Create output directory if it doesn't exist
+        output_path = output_label = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
     
     if args.verbose:
-        print(f"Converting '{input_path}' to '{output_path}' using method: {method}")
-        print(f"Processing all sheets: {args.all_sheets}")
+        print(f"Converting '{input_label}' to '{output_label}' using method: {method}", file=status)
+        print(f"Processing all sheets: {args.all_sheets}", file=status)
+    
+    cache = _make_cache(args)
+    recorder = ProfileRecorder(args.cprofile_dir) if args.profile else None
+    options = _conversion_options(args, method)
+    if to_stdout and args.verbose:
+        options['log'] = lambda message: print(message, file=sys.stderr)
+    
+    # Excel automation, profiling and stdin/stdout stay in this process; everything else may go to a warm server
+    use_daemon = (not args.no_daemon and recorder is None and method != "win32com"
+                  and not from_stdin and not to_stdout)
     
     try:
-        if method == "win32com":
-            convert_with_win32com(input_path, output_path, all_sheets=args.all_sheets, verbose=args.verbose)
+        if use_daemon and _convert_in_daemon(args, input_path, output_path, method):
+            cache = None  # the server already reported its cache
+        elif recorder is not None:
+            with subscribed(recorder):
+                convert_cached(input_path, output_path, method, options, cache=cache)
+            recorder.write(args.profile)
         else:
-            convert_with_pandas_reportlab(input_path, output_path, all_sheets=args.all_sheets, verbose=args.verbose)
+            convert_cached(input_path, output_path, method, options, cache=cache)
         
         if args.verbose:
-            print(f"Successfully converted to '{output_path}'")
+            if cache is not None:
+                print(cache.describe(), file=status)
+            if recorder is not None:
+                print(f"Stage timings written to '{args.profile}':", file=status)
+                for line in recorder.summary_lines():
+                    print(line, file=status)
+            print(f"Successfully converted to '{output_label}'", file=status)
         else:
-            print(f"Converted: {output_path}")
+            print(f"Converted: {output_label}", file=status)
             
     except ImportError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Worksheet layout for the win32com engine, planned in Python and applied in bulk.
+
+Every property read or write on an Excel object is a cross-process COM call, so
+the layout pass reads the used range's values once, computes column widths and
+row heights in Python, and writes each distinct width or height to all of its
+columns or rows through multi-area ranges.
+"""
+import math
+
+from .selection import clip_range, excel_address
+
+# Aggressive adjustment limits, in Excel units (characters for widths, points for heights)
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 50
+MIN_ROW_HEIGHT = 20
+MAX_ROW_HEIGHT = 100
+COLUMN_PADDING = 2  # characters added to the longest line, like AutoFit's margin
+LINE_HEIGHT = 1.3  # row height per wrapped line, as a multiple of the font size
+
+XL_LEFT = -4131
+XL_TOP = -4160
+XL_LANDSCAPE = 2
+XL_PAPER_A4 = 7
+XL_SHEET_HIDDEN = 0
+
+# Excel rejects range addresses longer than 255 characters
+MAX_ADDRESS_LENGTH = 255
+
+PAGE_SETUP = {
+    'Orientation': XL_LANDSCAPE,
+    'FitToPagesWide': 1,
+    'FitToPagesTall': False,
+    'Zoom': False,
+    'LeftMargin': 0.5 * 72,  # 0.5 inch in points
+    'RightMargin': 0.5 * 72,
+    'TopMargin': 0.5 * 72,
+    'BottomMargin': 0.5 * 72,
+    'HeaderMargin': 0.3 * 72,
+    'FooterMargin': 0.3 * 72,
+    'CenterHorizontally': True,
+    'CenterVertically': False,
+    'PaperSize': XL_PAPER_A4,
+}
+
+def column_letter(index):
+    """Return the Excel column letters for a 1-based column index."""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def _runs(indexes):
+    """Group sorted indexes into (first, last) runs of consecutive values."""
+    runs = []
+    for index in sorted(indexes):
+        if runs and index == runs[-1][1] + 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return runs
+
+def union_addresses(indexes, columns=True):
+    """Return multi-area addresses ("A:C,F:F" or "1:4,9:9") covering `indexes`.
+
+    Consecutive indexes collapse into one area, and addresses are split so
+    none exceeds Excel's 255 character limit.
+    """
+    label = column_letter if columns else str
+    areas = [f"{label(first)}:{label(last)}" for first, last in _runs(indexes)]
+
+    addresses = []
+    current = ""
+    for area in areas:
+        candidate = f"{current},{area}" if current else area
+        if len(candidate) > MAX_ADDRESS_LENGTH:
+            addresses.append(current)
+            candidate = area
+        current = candidate
+    if current:
+        addresses.append(current)
+    return addresses
+
+def _as_grid(values):
+    """Normalise Range.Value (a scalar for one cell, else nested tuples) into rows."""
+    if values is None:
+        return []
+    if not isinstance(values, (tuple, list)):
+        return [[values]]
+    return [row if isinstance(row, (tuple, list)) else [row] for row in values]
+
+def plan_layout(values, font_size):
+    """Return the aggressive layout for a used range as width and height groups.
+
+    `values` is the used range's Range.Value. The result maps each column
+    width to the 1-based column offsets that get it, and each row height to
+    the row offsets, with widths clamped to 12-50 characters and heights to
+    20-100 points.
+    """
+    grid = _as_grid(values)
+    column_count = max((len(row) for row in grid), default=0)
+    lines = [
+        [str(value).split("\n") if value is not None else [] for value in row]
+        for row in grid
+    ]
+
+    widths = []
+    for col in range(column_count):
+        longest = max(
+            (len(line) for row in lines if col < len(row) for line in row[col]),
+            default=0,
+        )
+        widths.append(max(MIN_COLUMN_WIDTH, min(MAX_COLUMN_WIDTH, longest + COLUMN_PADDING)))
+
+    heights = []
+    for row in lines:
+        wrapped = max(
+            (sum(max(1, math.ceil(len(line) / (widths[col] - COLUMN_PADDING))) for line in cell)
+             for col, cell in enumerate(row)),
+            default=1,
+        )
+        height = round(wrapped * font_size * LINE_HEIGHT, 1)
+        heights.append(max(MIN_ROW_HEIGHT, min(MAX_ROW_HEIGHT, height)))
+
+    plan = {'columns': {}, 'rows': {}}
+    for offset, width in enumerate(widths, 1):
+        plan['columns'].setdefault(width, []).append(offset)
+    for offset, height in enumerate(heights, 1):
+        plan['rows'].setdefault(height, []).append(offset)
+    return plan
+
+def _write_sizes(worksheet, groups, first, attribute, columns):
+    """Write each size group through multi-area ranges, most common size first.
+
+    The most common size is written to the whole span in one call; the other
+    groups then overwrite just their own columns or rows.
+    """
+    if not groups:
+        return
+    ordered = sorted(groups.items(), key=lambda item: len(item[1]), reverse=True)
+    span = max(offset for _, offsets in ordered for offset in offsets)
+    common, _ = ordered[0]
+    label = column_letter if columns else str
+    setattr(worksheet.Range(f"{label(first)}:{label(first + span - 1)}"), attribute, common)
+    for size, offsets in ordered[1:]:
+        for address in union_addresses([first + offset - 1 for offset in offsets], columns=columns):
+            setattr(worksheet.Range(address), attribute, size)
+
+def apply_page_setup(xl, worksheet, print_area=None):
+    """Set the landscape, fit-to-width page setup with printer communication paused.
+
+    With PrintCommunication off Excel batches the PageSetup writes instead of
+    talking to the printer driver after each one. A `print_area` address
+    limits the export to that range.
+    """
+    page_setup = worksheet.PageSetup
+    try:
+        xl.PrintCommunication = False
+    except Exception:
+        pass  # Older Excel versions lack PrintCommunication
+    try:
+        for name, value in PAGE_SETUP.items():
+            setattr(page_setup, name, value)
+        if print_area is not None:
+            page_setup.PrintArea = print_area
+    finally:
+        try:
+            xl.PrintCommunication = True
+        except Exception:
+            pass
+
+def _layout_range(worksheet, cell_range):
+    """Return the range to lay out: the used range, or its part inside `cell_range` (None if empty).
+
+    Clipping to the used range keeps whole-column selections and formatted
+    tails beyond the selection out of the bulk reads and writes.
+    """
+    used_range = worksheet.UsedRange
+    if cell_range is None:
+        return used_range
+    row, column = used_range.Row, used_range.Column
+    clipped = clip_range(cell_range, row, column, row + used_range.Rows.Count - 1, column + used_range.Columns.Count - 1)
+    return worksheet.Range(excel_address(clipped)) if clipped is not None else None
+
+def optimize_worksheet_layout(xl, worksheet, auto_adjust=True, aggressive_adjust=False, verbose=False, log=None, cell_range=None):
+    """Lay out one worksheet for PDF export with as few COM calls as possible.
+
+    With a `cell_range` (a selection.CellRange) only that range is laid out
+    and it becomes the sheet's print area.
+    """
+    name = worksheet.Name
+    if auto_adjust:
+        used_range = _layout_range(worksheet, cell_range)
+        font_size = 11 if aggressive_adjust else 10
+        try:
+            if used_range is None:
+                raise ValueError(f"range {excel_address(cell_range)} is outside the used cells")
+            used_range.WrapText = True
+            used_range.HorizontalAlignment = XL_LEFT
+            used_range.VerticalAlignment = XL_TOP
+            used_range.Font.Size = font_size
+
+            if aggressive_adjust:
+                # One bulk read of the cell values; sizes are computed here and
+                # each distinct size is written to all of its columns or rows at once
+                plan = plan_layout(used_range.Value, font_size)
+                _write_sizes(worksheet, plan['columns'], used_range.Column, 'ColumnWidth', columns=True)
+                _write_sizes(worksheet, plan['rows'], used_range.Row, 'RowHeight', columns=False)
+            else:
+                used_range.Columns.AutoFit()
+                used_range.Rows.AutoFit()
+        except Exception as e:
+            if verbose and log:
+                log(f"    Warning: Auto-adjustment failed: {e}")
+            elif verbose:
+                print(f"    Warning: Auto-adjustment failed: {e}")
+
+        if verbose and log:
+            log(f"    Applied {'aggressive' if aggressive_adjust else 'basic'} auto-adjustment for worksheet: {name}")
+        elif verbose:
+            print(f"    Applied {'aggressive' if aggressive_adjust else 'basic'} auto-adjustment for worksheet: {name}")
+    else:
+        if verbose and log:
+            log(f"  Skipping auto-adjustment for worksheet: {name}")
+        elif verbose:
+            print(f"  Skipping auto-adjustment for worksheet: {name}")
+
+    try:
+        apply_page_setup(xl, worksheet, print_area=excel_address(cell_range) if cell_range is not None else None)
+        if verbose and log:
+            log(f"  Optimized layout for worksheet: {name}")
+        elif verbose:
+            print(f"  Optimized layout for worksheet: {name}")
+    except Exception as e:
+        if verbose and log:
+            log(f"  Warning: Page setup failed: {e}")
+        elif verbose:
+            print(f"  Warning: Page setup failed: {e}")
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Resident conversion server that keeps the heavy imports warm between CLI calls.
+
+`exceltopdf serve` imports pandas, openpyxl, reportlab and PyPDF2 once, forks a
+pool of workers that inherit them, and accepts jobs on a Unix socket. The
+regular CLI hands single-file conversions to it when it is running and
+converts in-process otherwise. Requests and responses are one JSON object per
+line.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROTOCOL_VERSION = 1
+CONNECT_TIMEOUT = 1.0
+PRELOAD_MODULES = ("pandas", "openpyxl", "reportlab.platypus", "reportlab.lib.styles", "numpy", "PyPDF2")
+
+def default_socket_path():
+    """Return the per-user socket path ($EXCELTOPDF_SOCKET overrides it)."""
+    if os.environ.get("EXCELTOPDF_SOCKET"):
+        return Path(os.environ["EXCELTOPDF_SOCKET"])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "exceltopdf.sock"
+    return Path(tempfile.gettempdir()) / f"exceltopdf-{os.getuid()}.sock"
+
+def _preload():
+    """Import the conversion dependencies and build the shared reportlab objects."""
+    import importlib
+
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    from . import cli
+    try:
+        cli._sample_styles()
+    except ImportError:
+        pass
+
+def _warm(_):
+    """Run in each worker once so the pool is fully forked before any job arrives."""
+    return os.getpid()
+
+def _run_job(request):
+    """Convert one job inside a worker process and return the response."""
+    from . import cli
+    from .cache import OutputCache
+
+    messages = []
+    options = dict(request["options"])
+    if options.get("verbose"):
+        options["log"] = messages.append
+    cache = None
+    if request.get("cache"):
+        cache = OutputCache(request["cache"]["dir"], max_bytes=request["cache"]["max_bytes"])
+
+    start = time.perf_counter()
+    try:
+        Path(request["output"]).parent.mkdir(parents=True, exist_ok=True)
+        status = cli.convert_cached(request["input"], request["output"], request["method"], options, cache=cache)
+        response = {"ok": True, "cache": status}
+    except Exception as e:
+        response = {"ok": False, "error": str(e), "error_type": type(e).__name__}
+    response.update(messages=messages, seconds=time.perf_counter() - start)
+    if cache is not None:
+        response["cache_summary"] = cache.describe()
+    return response
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self._reply({"ok": False, "error": "Malformed request", "error_type": "ValueError"})
+            return
+
+        command = request.get("command")
+        if request.get("version") != PROTOCOL_VERSION:
+            self._reply({"ok": False, "error": f"Unsupported protocol version {request.get('version')}",
+                         "error_type": "ValueError"})
+        elif command == "ping":
+            self._reply({"ok": True, "pid": os.getpid(), "workers": self.server.workers})
+        elif command == "shutdown":
+            self._reply({"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif command == "convert":
+            self._reply(self.server.convert(request))
+        else:
+            self._reply({"ok": False, "error": f"Unknown command '{command}'", "error_type": "ValueError"})
+
+    def _reply(self, response):
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+class ConversionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that runs conversion jobs on a pre-forked worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, workers=None, verbose=False):
+        self.socket_path = Path(socket_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.verbose = verbose
+        _claim_socket(self.socket_path)
+        _preload()
+        # Fork every worker now, before any handler thread exists, so they inherit the warm imports
+        self.executor = self._start_executor()
+        self._executor_lock = threading.Lock()
+        self._closed = False
+        self._futures = set()  # submitted jobs, cancelled if still queued at shutdown
+        self._futures_lock = threading.Lock()
+
+        old_umask = os.umask(0o177)  # socket readable and writable by this user only
+        try:
+            super().__init__(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def _start_executor(self):
+        """Fork a pool of warm workers."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork"))
+        list(executor.map(_warm, range(self.workers)))
+        return executor
+
+    def _replace_executor(self, broken):
+        """Swap a pool broken by a dead worker for a fresh one and return the pool to use."""
+        with self._executor_lock:
+            if self.executor is broken and not self._closed:
+                broken.shutdown(wait=False)
+                self.executor = self._start_executor()
+            return self.executor
+
+    def _submit(self, request):
+        """Submit a job and return (executor, future), replacing a pool that an earlier worker death broke."""
+        from concurrent.futures.process import BrokenProcessPool
+
+        executor = self.executor
+        try:
+            return executor, executor.submit(_run_job, request)
+        except BrokenProcessPool:
+            executor = self._replace_executor(executor)
+            return executor, executor.submit(_run_job, request)
+
+    def convert(self, request):
+        from concurrent.futures.process import BrokenProcessPool
+
+        executor = future = None
+        try:
+            executor, future = self._submit(request)
+            with self._futures_lock:
+                self._futures.add(future)
+            response = future.result()
+        except Exception as e:
+            # A worker died (killed or out of memory); the client falls back to converting itself
+            response = {"ok": False, "error": f"Worker failed: {e}", "error_type": type(e).__name__, "retry": True}
+            if isinstance(e, BrokenProcessPool) and executor is not None:
+                # Every later job would fail on the broken pool too
+                self._replace_executor(executor)
+        finally:
+            if future is not None:
+                with self._futures_lock:
+                    self._futures.discard(future)
+        if self.verbose:
+            state = "ok" if response["ok"] else f"failed ({response['error']})"
+            print(f"{request['input']} -> {request['output']}: {state} in {response.get('seconds', 0.0):.2f}s",
+                  flush=True)
+        return response
+
+    def server_close(self):
+        super().server_close()
+        with self._executor_lock:
+            self._closed = True
+        # shutdown(cancel_futures=True) needs Python 3.9
+        with self._futures_lock:
+            for future in self._futures:
+                future.cancel()
+        self.executor.shutdown(wait=False)
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+def _claim_socket(socket_path):
+    """Remove a stale socket file, refusing to start if another server answers on it."""
+    if not socket_path.exists():
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    if request_server({"command": "ping"}, socket_path) is not None:
+        raise RuntimeError(f"A conversion server is already listening on {socket_path}")
+    socket_path.unlink()
+
+def request_server(request, socket_path=None, connect_timeout=CONNECT_TIMEOUT):
+    """Send `request` to a running server and return its response, or None if none is reachable."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    if not socket_path.exists():
+        return None
+
+    request = dict(request, version=PROTOCOL_VERSION)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(connect_timeout)
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return None
+        # Conversions can take as long as they need once the server has accepted
+        client.settimeout(None)
+        try:
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as reader:
+                line = reader.readline()
+        except OSError:
+            return None
+    if not line:
+        return None
+    return json.loads(line)
+
+def main(argv=None):
+    """Entry point for `exceltopdf serve`."""
+    parser = argparse.ArgumentParser(
+        prog="exceltopdf serve",
+        description="Run a resident conversion server that the exceltopdf command hands jobs to."
+    )
+    parser.add_argument("--socket", default=None, help=f"Unix socket path (default: {default_socket_path()})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes forked at startup (default: number of CPUs)")
+    parser.add_argument("--stop", action="store_true", help="Stop the server listening on the socket")
+    parser.add_argument("--status", action="store_true", help="Report whether a server is listening")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every job")
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: the conversion server needs Unix domain sockets, which this platform lacks.", file=sys.stderr)
+        sys.exit(1)
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+    if args.stop or args.status:
+        response = request_server({"command": "shutdown" if args.stop else "ping"}, socket_path)
+        if response is None:
+            print(f"No conversion server on {socket_path}")
+            sys.exit(1)
+        if args.status:
+            print(f"Conversion server running on {socket_path} (pid {response['pid']}, {response['workers']} workers)")
+        else:
+            print(f"Stopped conversion server on {socket_path}")
+        return
+
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        server = ConversionServer(socket_path, workers=args.workers, verbose=args.verbose)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Serving conversions on {socket_path} with {server.workers} workers", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""Cell text as Excel displays it, formatted a whole column at a time.
+
+str() prints a float with every digit of its binary value (1234.5000000001)
+and a date with its time of day (2024-01-01 00:00:00). Instead, each column's
+number format is read once from the workbook (the format of its first value
+cell) and the whole column is formatted in a few numpy operations: numbers
+through integer digit strings, dates through their year, month, day and time
+components. Columns that repeat their values format each distinct value once.
+Fixed decimals, thousands separators, percent, scientific, currency and other
+literal text, negative and zero sections and the usual date and time codes
+are understood; cells a format does not cover (text, conditions, fractions,
+elapsed times) fall back to General or str().
+"""
+import datetime
+import functools
+import re
+from collections import namedtuple
+
+from .selection import FULL_SHEET
+
+GENERAL = 'General'
+FORMAT_SAMPLE_ROWS = 20  # rows searched for each column's first value cell
+
+# One section of a number format: literal text around a number with
+# `min_decimals`..`max_decimals` decimals and at least `min_integer` integer
+# digits; sections without `number` show only their text
+NumberSection = namedtuple(
+    'NumberSection',
+    'prefix suffix number min_integer min_decimals max_decimals grouping percent scientific scale',
+)
+
+# Date parts without a format (e.g. .xls workbooks): ISO dates, with the time when there is one
+ISO_DATE = (('year', 4), '-', ('month', 2), '-', ('day', 2))
+ISO_DATETIME = ISO_DATE + (' ', ('hour', 2), ':', ('minute', 2), ':', ('second', 2))
+MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December')
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+_DIGITS = '0#?'
+_DATE_CODES = 'ymdhse'
+_AM_PM = re.compile('AM/PM|A/P', re.IGNORECASE)
+_AM_PM_MARKER = '\x02'
+# Scaled integers below this are exact in a float64
+_EXACT_LIMIT = 2.0 ** 53
+_COLORS = {'black', 'blue', 'cyan', 'green', 'magenta', 'red', 'white', 'yellow'}
+
+def _split_sections(number_format):
+    """Split a format at the ';' that separate its sections, skipping quoted text and escapes."""
+    sections, current, quoted, escaped = [], [], False, False
+    for char in number_format:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char == ';' and not quoted:
+            sections.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    sections.append(''.join(current))
+    return sections
+
+def _tokens(section):
+    """Yield (kind, text) tokens of a section: 'literal', 'tag' ([...]) or 'code' characters."""
+    index = 0
+    while index < len(section):
+        char = section[index]
+        if char == '"':
+            end = section.find('"', index + 1)
+            end = len(section) if end < 0 else end
+            yield 'literal', section[index + 1:end]
+            index = end + 1
+        elif char == '\\':
+            yield 'literal', section[index + 1:index + 2]
+            index += 2
+        elif char in '_*':
+            # Padding to the width of the next character, or repeating it to fill the cell
+            index += 2
+        elif char == '[':
+            end = section.find(']', index)
+            end = len(section) if end < 0 else end
+            yield 'tag', section[index + 1:end]
+            index = end + 1
+        else:
+            yield 'code', char
+            index += 1
+
+def _tag_literal(tag):
+    """Return the text a [...] tag shows: '' for colours and locales, None when unsupported."""
+    if tag.startswith('$'):
+        return tag[1:].split('-')[0]
+    if tag.lower() in _COLORS or tag.lower().startswith('color'):
+        return ''
+    return None
+
+def _parse_number_section(section):
+    """Return the NumberSection of one section, or None for formats not handled here."""
+    prefix, suffix, digits = [], [], []
+    percent = scientific = False
+    for kind, text in _tokens(section):
+        if kind == 'tag':
+            text = _tag_literal(text)
+            if text is None:
+                return None
+            kind = 'literal'
+        elif text in _DIGITS or (text in '.,' and digits and not scientific):
+            if suffix:
+                return None  # digits after literal text, e.g. fractions or phone numbers
+            digits.append(text)
+            continue
+        elif text in 'Ee' and digits:
+            scientific = True
+            continue
+        elif text in '+-' and scientific and digits and digits[-1] != 'E':
+            digits.append('E')
+            continue
+        elif text in '/@?':
+            return None
+        elif text == '%':
+            percent = True
+        (suffix if digits else prefix).append(text)
+    if not digits:
+        return NumberSection(''.join(prefix), '', False, 0, 0, 0, False, percent, False, 0)
+
+    pattern = ''.join(digits)
+    mantissa = pattern.split('E')[0]
+    stripped = mantissa.rstrip(',')
+    scale = len(mantissa) - len(stripped)  # trailing commas divide by 1000 each
+    integer, _, fraction = stripped.partition('.')
+    return NumberSection(
+        prefix=''.join(prefix),
+        suffix=''.join(suffix),
+        number=True,
+        min_integer=integer.count('0'),
+        min_decimals=fraction.count('0'),
+        max_decimals=sum(fraction.count(char) for char in _DIGITS),
+        grouping=',' in integer,
+        percent=percent,
+        scientific=scientific,
+        scale=scale,
+    )
+
+def _date_parts(section):
+    """Return a date/time section as literal strings and (field, size) parts, or None for
+    elapsed times and the like."""
+    # AM/PM markers switch hours to the 12-hour clock
+    section, markers = _AM_PM.subn(_AM_PM_MARKER, section)
+    tokens = []
+    for kind, text in _tokens(section):
+        if kind == 'tag':
+            text = _tag_literal(text)
+            if text is None:
+                return None
+            kind = 'literal'
+        elif text.lower() in _DATE_CODES and tokens and tokens[-1][0] == 'field' and tokens[-1][1][0] == text.lower():
+            tokens[-1] = ('field', tokens[-1][1] + text.lower())
+            continue
+        elif text.lower() in _DATE_CODES:
+            kind, text = 'field', text.lower()
+        tokens.append((kind, text))
+
+    fields = [text for kind, text in tokens if kind == 'field']
+    parts = []
+    position = 0
+    fraction = False
+    for index, (kind, text) in enumerate(tokens):
+        if kind != 'field':
+            # Fractions of a second (the '.' and every '0' after it) are not shown
+            fraction = (fraction and text == '0') or (
+                text == '.' and index + 1 < len(tokens) and tokens[index + 1][1] == '0')
+            if fraction:
+                continue
+            parts.append(('ampm', 2) if text == _AM_PM_MARKER else text)
+            continue
+        fraction = False
+        letter, size = text[0], len(text)
+        before = fields[position - 1] if position else ''
+        after = fields[position + 1] if position + 1 < len(fields) else ''
+        position += 1
+        if letter == 'm' and (before.startswith('h') or after.startswith('s')):
+            parts.append(('minute', min(size, 2)))
+        elif letter in 'ye':
+            parts.append(('year', 2 if letter == 'y' and size <= 2 else 4))
+        elif letter == 'm':
+            parts.append(('month', size) if size <= 2 else ('month_name', 3 if size == 3 else 0))
+        elif letter == 'd':
+            parts.append(('day', size) if size <= 2 else ('day_name', 3 if size == 3 else 0))
+        elif letter == 'h':
+            parts.append(('hour12' if markers else 'hour', min(size, 2)))
+        else:
+            parts.append(('second', min(size, 2)))
+    return tuple(parts)
+
+@functools.lru_cache(maxsize=256)
+def parse_number_format(number_format):
+    """Return ('general',), ('text',), ('date', parts) or ('number', sections) for a format code."""
+    if not number_format or number_format.strip().lower() == 'general':
+        return ('general',)
+    if number_format.strip() == '@':
+        return ('text',)
+    try:
+        from openpyxl.styles.numbers import is_date_format
+    except ImportError as e:
+        raise ImportError(f"Required packages not available: {e}")
+
+    sections = _split_sections(number_format)
+    if is_date_format(number_format):
+        parts = _date_parts(sections[0])
+        return ('date', parts) if parts else ('general',)
+    parsed = []
+    for section in sections[:3]:
+        # An empty section hides its numbers
+        section = _parse_number_section(section)
+        if section is None:
+            return ('general',)
+        parsed.append(section)
+    return ('number', tuple(parsed))
+
+def column_number_formats(workbook, sheet_name, width, sample_rows=FORMAT_SAMPLE_ROWS, cell_range=None):
+    """Return the number format of each of the first `width` columns of a sheet.
+
+    A column's format is that of its first value cell within `sample_rows`
+    rows below the header, General if there is none. `workbook` is an open
+    openpyxl workbook (e.g. a pd.ExcelFile's book) or a path or bytes to open
+    read-only; only the first rows of the sheet are parsed. With a
+    `cell_range` (a selection.CellRange) columns and rows count from its corner.
+    """
+    opened = None
+    if not hasattr(workbook, 'worksheets'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise ImportError(f"Required packages not available: {e}")
+        from .streams import open_workbook
+
+        workbook = opened = load_workbook(open_workbook(workbook), read_only=True, data_only=True)
+    try:
+        first_row, first_col, last_row, _ = cell_range or FULL_SHEET
+        max_row = first_row + sample_rows if last_row is None else min(first_row + sample_rows, last_row)
+        formats = [None] * width
+        for row in workbook[sheet_name].iter_rows(min_row=first_row + 1, max_row=max_row):
+            for index, cell in enumerate(row[first_col - 1:first_col - 1 + width]):
+                if formats[index] is None and cell.value is not None:
+                    formats[index] = cell.number_format or GENERAL
+            if all(formats):
+                break
+        return [number_format or GENERAL for number_format in formats]
+    finally:
+        if opened is not None:
+            opened.close()
+
+def _fixed_digits(values, decimals):
+    """Round non-negative floats half away from zero to `decimals` places (a number or an array).
+
+    Returns the integer and the zero-padded fraction digit strings, or None
+    when the rounded values are too large to be held exactly as integers.
+    """
+    import numpy as np
+
+    # Excel rounds at 15 significant digits, so 1.005 shows as 1.01 even though the float is below it
+    scaled = values * 10.0 ** decimals
+    scaled = np.floor(scaled + 0.5 + np.minimum(scaled * 1e-15, 1e-6))
+    if not (scaled < _EXACT_LIMIT).all():
+        return None
+    scaled = scaled.astype(np.int64)
+    if np.ndim(decimals) == 0 and decimals == 0:
+        return scaled.astype(str), None
+    unit = 10 ** np.asarray(decimals, dtype=np.int64)
+    fraction = np.char.zfill((scaled % unit).astype(str), decimals)
+    if np.ndim(decimals):
+        fraction = np.where(unit == 1, '', fraction)
+    return (scaled // unit).astype(str), fraction
+
+def _format_general(values):
+    """Format a float array the way Excel's General format shows numbers: up to ten significant digits."""
+    import numpy as np
+
+    text = np.empty(len(values), dtype=object)
+    magnitude = np.abs(values)
+    fixed = (magnitude < 1e11) & ((magnitude >= 1e-4) | (magnitude == 0))
+    if fixed.any():
+        shown = magnitude[fixed]
+        with np.errstate(divide='ignore'):
+            integer_digits = np.floor(np.log10(shown, where=shown > 0, out=np.zeros_like(shown))) + 1
+        decimals = np.clip(10 - integer_digits, 0, 10).astype(np.int64)
+        integer, fraction = _fixed_digits(shown, decimals)
+        fraction = np.char.rstrip(fraction, '0')
+        digits = np.where(fraction == '', integer, np.char.add(np.char.add(integer, '.'), fraction))
+        text[fixed] = np.where(values[fixed] < 0, np.char.add('-', digits), digits)
+    if not fixed.all():
+        text[~fixed] = np.char.mod('%.6G', values[~fixed])
+    return text
+
+def _group_thousands(digits):
+    """Insert thousands separators into an array of digit strings."""
+    import numpy as np
+
+    width = digits.dtype.itemsize // 4
+    if width <= 3 or not len(digits):
+        return digits
+    # Right-align the digits in a character matrix and copy them between comma columns
+    chars = np.char.rjust(digits, width).view('U1').reshape(len(digits), width)
+    columns = []
+    for index in range(width):
+        if index and (width - index) % 3 == 0:
+            columns.append(np.where(chars[:, index - 1] == ' ', ' ', ','))
+        columns.append(chars[:, index])
+    grouped = np.ascontiguousarray(np.stack(columns, axis=1)).view(f'U{len(columns)}').ravel()
+    return np.char.lstrip(grouped, ' ')
+
+def _format_section(values, section):
+    """Format a non-negative float array with one NumberSection."""
+    import numpy as np
+
+    if not section.number:
+        return np.full(len(values), section.prefix, dtype=object)
+    if section.percent:
+        values = values * 100
+    if section.scale:
+        values = values / 1000 ** section.scale
+    if section.scientific:
+        text = np.char.mod(f'%.{section.max_decimals}E', values)
+    else:
+        digits = _fixed_digits(values, section.max_decimals)
+        if digits is None:
+            # Too large for exact integers: printf rounds the float itself, the digits get the same treatment
+            fixed = np.char.mod(f'%.{section.max_decimals}f', values)
+            if section.max_decimals:
+                split = np.char.partition(fixed, '.')
+                digits = split[:, 0], split[:, 2]
+            else:
+                digits = fixed, None
+        integer, fraction = digits
+        if section.grouping:
+            integer = _group_thousands(integer)
+        elif section.min_integer > 1:
+            integer = np.char.zfill(integer, section.min_integer)
+        elif section.min_integer == 0:
+            integer = np.char.lstrip(integer, '0')
+        if section.max_decimals > section.min_decimals:
+            fraction = np.char.ljust(np.char.rstrip(fraction, '0'), section.min_decimals, '0')
+            text = np.where(fraction == '', integer, np.char.add(np.char.add(integer, '.'), fraction))
+        elif section.max_decimals:
+            text = np.char.add(np.char.add(integer, '.'), fraction)
+        else:
+            text = integer
+    if section.prefix:
+        text = np.char.add(section.prefix, text)
+    if section.suffix:
+        text = np.char.add(text, section.suffix)
+    return text
+
+def _format_numbers(values, number_format):
+    """Format a finite float array with a number format code."""
+    import numpy as np
+
+    parsed = parse_number_format(number_format)
+    if parsed[0] != 'number':
+        return _format_general(values)
+    sections = parsed[1]
+    text = np.empty(len(values), dtype=object)
+    negative = values < 0
+    zero = values == 0 if len(sections) > 2 else np.zeros(len(values), dtype=bool)
+    positive = ~negative & ~zero
+    if positive.any():
+        text[positive] = _format_section(values[positive], sections[0])
+    if negative.any():
+        if len(sections) > 1:
+            text[negative] = _format_section(-values[negative], sections[1])
+        else:
+            text[negative] = np.char.add('-', _format_section(-values[negative], sections[0]))
+    if zero.any():
+        text[zero] = _format_section(values[zero], sections[2])
+    return text
+
+def _date_field(values, field, size):
+    """Return one part of a datetime64 array as strings, Excel's `size` being the number of pattern letters."""
+    import numpy as np
+
+    if field in ('month_name', 'day_name'):
+        if field == 'month_name':
+            index = values.astype('datetime64[M]').astype(np.int64) % 12
+            names = MONTH_NAMES
+        else:
+            # 1970-01-01 was a Thursday
+            index = (values.astype('datetime64[D]').astype(np.int64) + 3) % 7
+            names = DAY_NAMES
+        names = np.array([name[:size] if size else name for name in names])
+        return names[index]
+
+    if field == 'year':
+        number = values.astype('datetime64[Y]').astype(np.int64) + 1970
+        number = number % 100 if size == 2 else number
+    elif field == 'month':
+        number = values.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    elif field == 'day':
+        number = (values.astype('datetime64[D]') - values.astype('datetime64[M]')).astype(np.int64) + 1
+    else:
+        seconds = (values - values.astype('datetime64[D]')).astype('timedelta64[s]').astype(np.int64)
+        hours = seconds // 3600
+        if field == 'ampm':
+            return np.where(hours < 12, 'AM', 'PM')
+        number = {
+            'hour': hours,
+            'hour12': (hours + 11) % 12 + 1,
+            'minute': seconds // 60 % 60,
+            'second': seconds % 60,
+        }[field]
+    text = number.astype(str)
+    return np.char.zfill(text, size) if size > 1 else text
+
+def _format_dates(values, number_format):
+    """Format a datetime64 array (NaT excluded) with a date format code."""
+    import numpy as np
+
+    parsed = parse_number_format(number_format)
+    if parsed[0] == 'date':
+        parts = parsed[1]
+    else:
+        has_time = (values != values.astype('datetime64[D]')).any()
+        parts = ISO_DATETIME if has_time else ISO_DATE
+    text = None
+    for part in parts:
+        piece = part if isinstance(part, str) else _date_field(values, *part)
+        text = piece if text is None else np.char.add(text, piece)
+    if text is None or isinstance(text, str):
+        return np.full(len(values), text or '', dtype=object)
+    return text.astype(object)
+
+def _format_distinct(values, formatter, number_format):
+    """Format each distinct value once when a column repeats its values (dates, codes, amounts)."""
+    import numpy as np
+
+    distinct, inverse = np.unique(values, return_inverse=True)
+    if len(distinct) * 2 > len(values):
+        return formatter(values, number_format)
+    # Repeated cells share one string object
+    return np.asarray(formatter(distinct, number_format), dtype=object)[inverse]
+
+def _cell_text(value):
+    """str() of a cell no format applies to, as the unformatted readers print it."""
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return str(value)
+
+def format_column(values, number_format=GENERAL):
+    """Return the cells of one column as an object array of display strings.
+
+    `values` is a pandas Series (as read by pandas) or a sequence of cell
+    values (as read by openpyxl); missing cells become ''.
+    """
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError(f"Required packages not available: {e}")
+
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values))
+    kind = series.dtype.kind
+    if kind == 'b':
+        return np.where(series.to_numpy(), 'TRUE', 'FALSE').astype(object)
+
+    text = np.full(len(series), '', dtype=object)
+    if kind in 'iuf':
+        array = series.to_numpy(dtype=np.float64)
+        present = np.isfinite(array)
+        if present.any():
+            text[present] = _format_distinct(array[present], _format_numbers, number_format)
+        return text
+    if kind == 'M':
+        array = series.to_numpy()
+        present = ~np.isnat(array)
+        if present.any():
+            text[present] = _format_distinct(array[present], _format_dates, number_format)
+        return text
+
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ('string', 'empty'):
+        present = series.notna().to_numpy()
+        text[present] = series[present].astype(str).to_numpy(dtype=object)
+        return text
+
+    # Mixed columns: numbers and dates are formatted together, anything else goes through str()
+    cells = np.array(series.to_numpy(dtype=object))
+    numbers, dates, others = [], [], []
+    for index, value in enumerate(cells):
+        if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+            continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            numbers.append(index)
+        elif isinstance(value, (datetime.datetime, datetime.date)):
+            dates.append(index)
+        elif isinstance(value, datetime.time) and parse_number_format(number_format)[0] == 'date':
+            dates.append(index)
+            cells[index] = datetime.datetime.combine(datetime.date(1899, 12, 30), value)
+        else:
+            others.append(index)
+    if numbers:
+        text[numbers] = _format_numbers(np.array(cells[numbers], dtype=np.float64), number_format)
+    if dates:
+        text[dates] = _format_dates(pd.to_datetime(pd.Series(cells[dates])).to_numpy(), number_format)
+    for index in others:
+        text[index] = _cell_text(cells[index])
+    return text
+
+def columns_to_rows(columns, row_count):
+    """Return formatted column arrays transposed into the row lists the renderers draw."""
+    import numpy as np
+
+    if not columns:
+        return [[] for _ in range(row_count)]
+    return np.column_stack(columns).tolist()
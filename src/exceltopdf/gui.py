@@ -5,9 +5,11 @@ A graphical user interface for converting Excel files to PDF with various option
 """
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import threading
 import os
+from concurrent.futures import ThreadPoolExecutor
 from .cli import convert_with_pandas_reportlab, convert_with_win32com
+from .instrument import LogHook, subscribe
+from .pool import close_default_excel_pool
 
 class ExcelToPDFGUI:
     def __init__(self, root):
@@ -27,6 +29,14 @@ class ExcelToPDFGUI:
         self.auto_adjust = tk.BooleanVar(value=True)  # New option for auto-adjusting cell dimensions
         self.aggressive_adjust = tk.BooleanVar(value=True)  # New option for aggressive adjustment - now default
         
+        # One long-lived worker thread, so pooled Excel instances (which belong
+        # to the thread that started them) are reused across conversions
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conversion")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Stage timings of each conversion are written to the log when verbose
+        subscribe(LogHook(self.log_stage_timing))
+        
         self.setup_ui()
         
     def setup_styles(self):
@@ -274,6 +284,11 @@ class ExcelToPDFGUI:
         self.log_text.see(tk.END)
         self.root.update_idletasks()
         
+    def log_stage_timing(self, message):
+        """Log instrumentation summaries when verbose output is enabled."""
+        if self.verbose.get():
+            self.log_message(message)
+            
     def start_conversion(self):
         """Start conversion in a separate thread."""
         if not self.input_file.get():
@@ -289,10 +304,8 @@ class ExcelToPDFGUI:
         self.progress.start()
         self.log_text.delete(1.0, tk.END)
         
-        # Start conversion in background thread
-        thread = threading.Thread(target=self.convert_file)
-        thread.daemon = True
-        thread.start()
+        # Start conversion in the background worker thread
+        self.worker.submit(self.convert_file)
         
     def convert_file(self):
         """Convert Excel file to PDF."""
@@ -360,6 +373,12 @@ class ExcelToPDFGUI:
         self.convert_btn.config(state="normal")
         self.progress.stop()
 
+    def on_close(self):
+        """Quit the pooled Excel instances on the worker thread that owns them, then close the window."""
+        self.worker.submit(close_default_excel_pool).result()
+        self.worker.shutdown()
+        self.root.destroy()
+
 def main():
     """Main entry point for the GUI application."""
     root = tk.Tk()
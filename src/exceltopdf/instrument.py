@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Timed spans, counters and subscriber hooks for conversion diagnostics.
+
+Converters wrap each stage in `span()` and report sizes with `count()`. Nothing
+is measured until a hook is subscribed, so uninstrumented runs pay only an
+empty-list check. Hooks receive event dicts:
+
+    {'event': 'start', 'name': ..., 'path': (...), 'fields': {...}}
+    {'event': 'end', 'name': ..., 'path': (...), 'fields': {...}, 'seconds': ...}
+    {'event': 'count', 'name': ..., 'path': (...), 'value': ...}
+
+`path` lists the enclosing span names, outermost first.
+"""
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+_hooks = []
+_local = threading.local()
+
+def subscribe(hook):
+    """Register `hook` to receive every instrumentation event; returns the hook."""
+    _hooks.append(hook)
+    return hook
+
+def unsubscribe(hook):
+    """Stop sending events to `hook`."""
+    try:
+        _hooks.remove(hook)
+    except ValueError:
+        pass
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def _emit(event):
+    for hook in list(_hooks):
+        hook(event)
+
+@contextmanager
+def span(name, **fields):
+    """Time the enclosed stage; the yielded dict can be filled with fields for the end event."""
+    if not _hooks:
+        yield fields
+        return
+
+    stack = _stack()
+    stack.append(name)
+    path = tuple(stack)
+    start = time.perf_counter()
+    try:
+        # A start hook may raise (a cancellation, say); the stack is unwound all the same
+        _emit({'event': 'start', 'name': name, 'path': path, 'fields': fields})
+        yield fields
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        _emit({'event': 'end', 'name': name, 'path': path, 'fields': fields, 'seconds': seconds})
+
+def timed(name):
+    """Decorator that runs the whole function inside `span(name)`."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(name, value=1):
+    """Add `value` to the counter `name` (rows, cells, pages, bytes, ...)."""
+    if _hooks:
+        _emit({'event': 'count', 'name': name, 'path': tuple(_stack()), 'value': value})
+
+class ProfileRecorder:
+    """Hook that collects spans and counters into a report, optionally with cProfile per stage.
+
+    With `cprofile_dir` each stage name gets its own cProfile.Profile, enabled
+    only while that stage is the innermost running span, so every
+    `<stage>.prof` file holds the stage's own time and nested stages land in
+    their own files.
+    """
+
+    def __init__(self, cprofile_dir=None):
+        self.spans = []
+        self.counters = {}
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self._open = []  # [start offset, child seconds] per running span
+        self._profilers = {}
+        self._active = []
+        self._origin = time.perf_counter()
+
+    def __call__(self, event):
+        kind = event['event']
+        if kind == 'start':
+            self._open.append([time.perf_counter() - self._origin, 0.0])
+            if self.cprofile_dir is not None:
+                self._switch_profiler(event['name'])
+        elif kind == 'end':
+            start, children = self._open.pop() if self._open else (0.0, 0.0)
+            if self._open:
+                self._open[-1][1] += event['seconds']
+            self.spans.append({
+                'name': event['name'],
+                'path': list(event['path']),
+                'start': round(start, 6),
+                'seconds': round(event['seconds'], 6),
+                'self_seconds': round(max(event['seconds'] - children, 0.0), 6),
+                'fields': {key: value for key, value in event['fields'].items() if value is not None},
+            })
+            if self.cprofile_dir is not None:
+                self._restore_profiler()
+        elif kind == 'count':
+            self.counters[event['name']] = self.counters.get(event['name'], 0) + event['value']
+
+    def _switch_profiler(self, name):
+        import cProfile
+
+        if self._active:
+            self._active[-1].disable()
+        profiler = self._profilers.get(name)
+        if profiler is None:
+            profiler = self._profilers[name] = cProfile.Profile()
+        self._active.append(profiler)
+        profiler.enable()
+
+    def _restore_profiler(self):
+        if self._active:
+            self._active.pop().disable()
+        if self._active:
+            self._active[-1].enable()
+
+    def stages(self):
+        """Return {stage: {'calls', 'seconds', 'self_seconds'}} summed over every span of that name."""
+        stages = {}
+        for record in self.spans:
+            stage = stages.setdefault(record['name'], {'calls': 0, 'seconds': 0.0, 'self_seconds': 0.0})
+            stage['calls'] += 1
+            # Recursive spans of one name would double count their total time
+            if record['name'] not in record['path'][:-1]:
+                stage['seconds'] += record['seconds']
+            stage['self_seconds'] += record['self_seconds']
+        return stages
+
+    def report(self):
+        """Return the JSON-serialisable profile."""
+        return {
+            'total_seconds': round(sum(s['seconds'] for s in self.spans if len(s['path']) == 1), 6),
+            'stages': self.stages(),
+            'counters': self.counters,
+            'spans': self.spans,
+        }
+
+    def summary_lines(self):
+        """Return one line per stage, slowest first, for verbose output."""
+        stages = sorted(self.stages().items(), key=lambda item: item[1]['self_seconds'], reverse=True)
+        lines = [
+            f"  {name:<14} {stage['self_seconds']:8.3f}s self {stage['seconds']:8.3f}s total  ({stage['calls']} calls)"
+            for name, stage in stages
+        ]
+        if self.counters:
+            lines.append("  " + ", ".join(f"{name}: {value}" for name, value in sorted(self.counters.items())))
+        return lines
+
+    def write(self, path):
+        """Write the report as JSON and dump the per-stage cProfile statistics."""
+        Path(path).write_text(json.dumps(self.report(), indent=2, default=str))
+        if self.cprofile_dir is not None:
+            self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+            for name, profiler in self._profilers.items():
+                profiler.dump_stats(str(self.cprofile_dir / f"{name}.prof"))
+
+class LogHook(ProfileRecorder):
+    """Hook that sends a per-stage timing summary to `log` whenever a conversion finishes."""
+
+    def __init__(self, log, root='convert'):
+        super().__init__()
+        self.log = log
+        self.root = root
+
+    def __call__(self, event):
+        super().__call__(event)
+        if event['event'] == 'end' and event['name'] == self.root and len(event['path']) == 1:
+            self.log(f"Stage timings ({event['seconds']:.2f}s total):")
+            for line in self.summary_lines():
+                self.log(line)
+            self.spans, self.counters = [], {}
+
+@contextmanager
+def subscribed(hook):
+    """Context manager that subscribes `hook` for the duration of the block."""
+    subscribe(hook)
+    try:
+        yield hook
+    finally:
+        unsubscribe(hook)
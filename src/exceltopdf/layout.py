@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Column width analysis for the reportlab table renderer."""
+
+# Fonts set by the table style in cli._table_style_commands()
+HEADER_FONT = ("Helvetica-Bold", 10)
+BODY_FONT = ("Helvetica", 9)
+CELL_PADDING = 12  # LEFTPADDING + RIGHTPADDING, in points
+LEADING = 12  # LEADING of every row, in points
+HEADER_ROW_PADDING = 20  # TOPPADDING + BOTTOMPADDING of the header row
+BODY_ROW_PADDING = 16  # TOPPADDING + BOTTOMPADDING of body rows
+
+# Sheets with more data rows than this have their widths estimated from a sample
+DEFAULT_SAMPLE_THRESHOLD = 20000
+DEFAULT_SAMPLE_SIZE = 2000  # rows measured: a quarter from each end, the rest at random
+WIDTH_PERCENTILE = 99  # sampled column width, so a lone outlier cell cannot widen its column
+SAMPLE_SEED = 0  # fixed, so the same sheet always gets the same widths
+
+# Per-font lookup arrays of glyph widths indexed by code point, in 1/1000 of the
+# font size. Entries are NaN until that glyph is first measured.
+_GLYPH_WIDTHS = {}
+
+def _glyph_width_table(font_name, codes):
+    """Return the glyph width lookup array for `font_name`, measuring new glyphs in `codes`."""
+    import numpy as np
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    table = _GLYPH_WIDTHS.get(font_name)
+    top = int(codes.max()) if codes.size else 0
+    if table is None or table.size <= top:
+        grown = np.full(max(top + 1, 256), np.nan)
+        if table is not None:
+            grown[:table.size] = table
+        table = _GLYPH_WIDTHS[font_name] = grown
+
+    present = np.flatnonzero(np.bincount(codes.ravel(), minlength=1))
+    for codepoint in present[np.isnan(table[present])]:
+        # Code point 0 is numpy's padding for short strings
+        table[codepoint] = stringWidth(chr(codepoint), font_name, 1000) if codepoint else 0.0
+    return table
+
+def cell_widths(values, font_name, font_size, block_size=4096):
+    """Return the width in points of each cell in `values`, multiline cells by their widest line.
+
+    Line widths are summed from the glyph width table over code point matrices,
+    so no string is measured character by character in Python. Lines are
+    grouped by length (within a factor of two) before being widened to fixed
+    width strings, so one very long cell does not pad every other cell to its
+    length.
+    """
+    import numpy as np
+
+    cells = list(map(str, np.asarray(values, dtype=object).ravel()))
+    if not cells:
+        return np.zeros(0)
+
+    multiline = [index for index, cell in enumerate(cells) if "\n" in cell]
+    if multiline:
+        lines, owners = [], []
+        for index, cell in enumerate(cells):
+            split = cell.split("\n")
+            lines.extend(split)
+            owners.extend([index] * len(split))
+        owners = np.asarray(owners, dtype=np.intp)
+    else:
+        lines, owners = cells, np.arange(len(cells))
+    lines = np.asarray(lines, dtype=object)
+
+    lengths = np.fromiter(map(len, lines), dtype=np.intp, count=lines.size)
+    groups = np.frexp(lengths)[1]  # 2**(g-1) <= length < 2**g; 0 for empty lines
+    order = np.argsort(groups, kind="stable")
+    bounds = np.flatnonzero(np.diff(groups[order])) + 1
+    line_widths = np.zeros(lines.size)
+    for group in np.split(order, bounds):
+        if lengths[group[0]] == 0:
+            continue
+        for start in range(0, group.size, block_size):
+            indices = group[start:start + block_size]
+            block = np.asarray(lines[indices].tolist(), dtype=str)
+            codes = block.view(np.uint32).reshape(block.size, -1)
+            table = _glyph_width_table(font_name, codes)
+            line_widths[indices] = table[codes].sum(axis=1)
+
+    widths = np.zeros(len(cells))
+    np.maximum.at(widths, owners, line_widths)
+    return widths * font_size / 1000.0
+
+def longest_line_width(values, font_name, font_size, block_size=4096):
+    """Return the width in points of the widest line found in `values`."""
+    import numpy as np
+    import pandas as pd
+
+    cells = pd.unique(np.asarray(values, dtype=object))
+    if len(cells) == 0:
+        return 0.0
+    return float(cell_widths(cells, font_name, font_size, block_size).max())
+
+def sample_row_indices(row_count, sample_size, seed=SAMPLE_SEED):
+    """Return sorted row indices covering the head, the tail and random rows in between."""
+    import numpy as np
+
+    if row_count <= sample_size:
+        return np.arange(row_count)
+    edge = sample_size // 4
+    middle = np.arange(edge, row_count - edge)
+    chosen = np.random.default_rng(seed).choice(middle, sample_size - 2 * edge, replace=False)
+    return np.sort(np.concatenate([np.arange(edge), chosen, np.arange(row_count - edge, row_count)]))
+
+def measure_column_widths(header, columns, percentile=None):
+    """Return the natural width in points of each column, padding included.
+
+    `header` holds the header labels and `columns` one sequence of cell strings
+    per column, taken from the already stringified table. Body cells count by
+    their widest cell, or by the given `percentile` of the cell widths.
+    """
+    import numpy as np
+
+    widths = []
+    for label, values in zip(header, columns):
+        header_width = longest_line_width([str(label)], *HEADER_FONT)
+        if percentile is None:
+            body_width = longest_line_width(values, *BODY_FONT)
+        else:
+            body = cell_widths(values, *BODY_FONT)
+            body_width = float(np.percentile(body, percentile)) if body.size else 0.0
+        widths.append(max(header_width, body_width) + CELL_PADDING)
+    return widths
+
+def header_row_height(header):
+    """Return the height in points reportlab gives the header row."""
+    lines = max((str(label).count("\n") + 1 for label in header), default=1)
+    return float(lines * LEADING + HEADER_ROW_PADDING)
+
+def body_row_heights(columns, row_count):
+    """Return a float32 array with the height in points of each body row.
+
+    Reportlab does not wrap plain string cells, so a row is as tall as its
+    cell with the most lines: lines times the leading plus the padding. This
+    is the height Table.wrap() would measure cell by cell.
+    """
+    import numpy as np
+
+    lines = np.ones(row_count, dtype=np.int32)
+    for values in columns:
+        if row_count:
+            # Counted per string: a fixed width cast would pad every cell to the longest one
+            newlines = np.fromiter((str(value).count("\n") for value in values), dtype=np.int32, count=row_count)
+            np.maximum(lines, newlines + 1, out=lines)
+    return (lines * LEADING + BODY_ROW_PADDING).astype(np.float32)
+
+def fit_column_widths(natural_widths, available_width, min_width, max_width):
+    """Clamp natural widths and scale or spread them to fill `available_width`."""
+    col_count = len(natural_widths)
+    if col_count == 0:
+        return []
+    col_widths = [max(min_width, min(max_width, width)) for width in natural_widths]
+
+    total_width = sum(col_widths)
+    if total_width > available_width:
+        # Scale down proportionally but keep the minimum width
+        scale_factor = available_width / total_width
+        scaled_widths = [max(min_width, w * scale_factor) for w in col_widths]
+        remaining_space = available_width - sum(scaled_widths)
+        if remaining_space > 0:
+            extra_per_col = remaining_space / col_count
+            col_widths = [w + extra_per_col for w in scaled_widths]
+        else:
+            col_widths = scaled_widths
+    elif total_width < available_width:
+        # Distribute extra space evenly
+        extra_per_col = (available_width - total_width) / col_count
+        col_widths = [w + extra_per_col for w in col_widths]
+
+    return col_widths
+
+def calculate_column_widths(header, columns, auto_adjust=True, sample_threshold=DEFAULT_SAMPLE_THRESHOLD,
+                            sample_size=DEFAULT_SAMPLE_SIZE, percentile=WIDTH_PERCENTILE):
+    """Return the final column widths for a sheet on an A4 landscape page.
+
+    Sheets with more than `sample_threshold` rows (None to always measure
+    every cell) are estimated from `sample_size` rows at the given width
+    `percentile`; smaller sheets use the widest cell of each column.
+    """
+    from reportlab.lib.pagesizes import landscape, A4
+    from reportlab.lib.units import cm
+
+    available_width = landscape(A4)[0] - 2 * cm  # A4 landscape width minus margins
+    col_count = len(header)
+
+    if not auto_adjust:
+        col_width = available_width / col_count if col_count > 0 else 2 * cm
+        return [col_width] * col_count
+
+    row_count = len(columns[0]) if col_count else 0
+    if sample_threshold is not None and row_count > sample_threshold:
+        import numpy as np
+
+        rows = sample_row_indices(row_count, sample_size)
+        columns = [np.asarray(values, dtype=object)[rows] for values in columns]
+        natural_widths = measure_column_widths(header, columns, percentile)
+    else:
+        natural_widths = measure_column_widths(header, columns)
+    return fit_column_widths(natural_widths, available_width, 2 * cm, 6 * cm)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Low-memory PDF merging that writes each part as soon as it is read."""
+import hashlib
+
+# Object types that are worth sharing between parts
+SHARED_TYPES = ('/Font', '/FontDescriptor', '/XObject', '/ExtGState')
+SHARED_SUBTYPES = ('/Image', '/Form')
+# Resource dictionary entries whose indirect values are shareable as a whole
+SHARED_RESOURCE_KEYS = ('/Font', '/XObject', '/ExtGState', '/ColorSpace')
+# Page attributes a page may inherit from its parent /Pages node
+INHERITED_PAGE_KEYS = ('/Resources', '/MediaBox', '/CropBox', '/Rotate')
+
+CATALOG_NUMBER = 1
+PAGES_NUMBER = 2
+
+class _DigestWriter:
+    """File-like sink that hashes and counts what is written to it."""
+
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.hasher.update(data)
+        self.size += len(data)
+
+class StreamingPdfMerger:
+    """Append PDF files to an output file or seekable binary stream one part at a time.
+
+    Objects are written to the output as soon as they are copied, so memory holds
+    only the part being read plus the cross-reference offsets. Fonts, images and
+    resource dictionaries whose content is identical to one already written are
+    replaced by a reference to the earlier copy.
+    """
+
+    def __init__(self, output_path, dedupe=True):
+        try:
+            from PyPDF2 import PdfReader
+            from PyPDF2 import generic
+        except ImportError:
+            raise ImportError("PyPDF2 not available for PDF merging")
+
+        self._reader_class = PdfReader
+        self._generic = generic
+        # A seekable stream (offsets are taken from tell()) is left open for the caller
+        self._owns_output = not hasattr(output_path, 'write')
+        self._output = open(output_path, 'wb') if self._owns_output else output_path
+        self._dedupe = dedupe
+        self._offsets = {}
+        self._next_number = PAGES_NUMBER + 1
+        self._kids = []
+        self._shared = {}  # content digest -> object number in the output
+        self._closed = False
+        self.stats = {
+            'parts': 0,
+            'pages': 0,
+            'objects_written': 0,
+            'objects_deduplicated': 0,
+            'bytes_written': 0,
+            'bytes_saved': 0,
+        }
+        self._output.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._owns_output:
+            self._output.close()
+
+    def _allocate(self):
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+    def append(self, pdf_path):
+        """Copy every page of `pdf_path` to the end of the output."""
+        with open(pdf_path, 'rb') as handle:
+            reader = self._reader_class(handle)
+            if reader.is_encrypted:
+                raise ValueError(f"Cannot merge encrypted PDF: {pdf_path}")
+
+            # Per-part state: source reference -> output number, and digest memo
+            self._refs = {}
+            self._digests = {}
+            self._pending = []
+
+            pages = list(reader.pages)
+            for page in pages:
+                ref = page.indirect_reference
+                self._refs[(ref.idnum, ref.generation)] = self._allocate()
+
+            for page in pages:
+                ref = page.indirect_reference
+                number = self._refs[(ref.idnum, ref.generation)]
+                entries = {key: value for key, value in page.items() if key != '/Parent'}
+                for key in INHERITED_PAGE_KEYS:
+                    if key not in entries:
+                        value = self._inherited(page, key)
+                        if value is not None:
+                            entries[key] = value
+                self._write_object(number, entries, page_parent=True)
+                self._kids.append(number)
+                self._drain()
+
+            self.stats['parts'] += 1
+            self.stats['pages'] += len(pages)
+            self._refs = self._digests = self._pending = None
+
+    @staticmethod
+    def _inherited(page, key):
+        node = page.get('/Parent')
+        while node is not None:
+            node = node.get_object()
+            if key in node:
+                return node[key]
+            node = node.get('/Parent')
+        return None
+
+    def _drain(self):
+        while self._pending:
+            number, obj = self._pending.pop()
+            self._write_object(number, obj)
+
+    def _write_object(self, number, obj, page_parent=False):
+        self._offsets[number] = self._output.tell()
+        self._output.write(f"{number} 0 obj\n".encode())
+        if page_parent:
+            self._output.write(b"<<")
+            for key, value in obj.items():
+                self._output.write(b" ")
+                self._write_value(key, self._output)
+                self._output.write(b" ")
+                self._write_value(value, self._output, resource_key=key)
+            self._output.write(f" /Parent {PAGES_NUMBER} 0 R >>".encode())
+        else:
+            self._write_value(obj, self._output)
+        self._output.write(b"\nendobj\n")
+        self.stats['objects_written'] += 1
+
+    def _reference(self, ref, shareable=False):
+        """Return the output number for a source reference, queueing it for writing."""
+        key = (ref.idnum, ref.generation)
+        if key in self._refs:
+            return self._refs[key]
+
+        obj = ref.get_object()
+        if hasattr(obj, 'get') and obj.get('/Type') in ('/Page', '/Pages'):
+            # Links to page tree nodes outside the copied pages point at the new root
+            return PAGES_NUMBER
+
+        if self._dedupe and (shareable or self._is_shareable(obj)):
+            digest, size = self._digest(ref)
+            if digest in self._shared:
+                self._refs[key] = self._shared[digest]
+                self.stats['objects_deduplicated'] += 1
+                self.stats['bytes_saved'] += size
+                return self._refs[key]
+            number = self._refs[key] = self._allocate()
+            self._shared[digest] = number
+        else:
+            number = self._refs[key] = self._allocate()
+
+        self._pending.append((number, obj))
+        return number
+
+    @staticmethod
+    def _is_shareable(obj):
+        if not hasattr(obj, 'get'):
+            return False
+        return obj.get('/Type') in SHARED_TYPES or obj.get('/Subtype') in SHARED_SUBTYPES
+
+    def _digest(self, ref, _active=None):
+        """Return (digest, serialized size) of the object tree under `ref`."""
+        key = (ref.idnum, ref.generation)
+        if key in self._digests:
+            return self._digests[key]
+        active = _active if _active is not None else set()
+        if key in active:
+            return b"cycle", 0
+        active.add(key)
+
+        buffer = _DigestWriter()
+        children_size = []
+
+        def on_reference(child):
+            digest, size = self._digest(child, active)
+            children_size.append(size)
+            return b"<" + digest + b">"
+
+        self._write_value(ref.get_object(), buffer, on_reference=on_reference)
+        active.discard(key)
+        result = (buffer.hasher.digest(), buffer.size + sum(children_size))
+        self._digests[key] = result
+        return result
+
+    def _write_value(self, value, out, resource_key=None, on_reference=None):
+        """Serialize a PyPDF2 object, rewriting indirect references as it goes."""
+        generic = self._generic
+        if isinstance(value, generic.IndirectObject):
+            if on_reference is not None:
+                out.write(on_reference(value))
+            else:
+                number = self._reference(value, shareable=resource_key in SHARED_RESOURCE_KEYS)
+                out.write(f"{number} 0 R".encode())
+        elif isinstance(value, dict):
+            is_stream = isinstance(value, generic.StreamObject)
+            out.write(b"<<")
+            for key, item in value.items():
+                if is_stream and key == '/Length':
+                    continue
+                out.write(b" ")
+                self._write_value(key, out)
+                out.write(b" ")
+                self._write_value(item, out, resource_key=key, on_reference=on_reference)
+            if is_stream:
+                data = value._data
+                if isinstance(data, str):
+                    data = data.encode('latin-1')
+                out.write(f" /Length {len(data)} >>\nstream\n".encode())
+                out.write(data)
+                out.write(b"\nendstream")
+            else:
+                out.write(b" >>")
+        elif isinstance(value, list):
+            out.write(b"[")
+            for item in value:
+                out.write(b" ")
+                self._write_value(item, out, resource_key=resource_key, on_reference=on_reference)
+            out.write(b" ]")
+        else:
+            value.write_to_stream(out, None)
+
+    def close(self):
+        """Write the page tree, catalog and cross-reference table, then close the file."""
+        if self._closed:
+            return self.stats
+        self._closed = True
+
+        kids = " ".join(f"{number} 0 R" for number in self._kids)
+        self._offsets[PAGES_NUMBER] = self._output.tell()
+        self._output.write(
+            f"{PAGES_NUMBER} 0 obj\n<< /Type /Pages /Kids [{kids}] /Count {len(self._kids)} >>\nendobj\n".encode()
+        )
+        self._offsets[CATALOG_NUMBER] = self._output.tell()
+        self._output.write(f"{CATALOG_NUMBER} 0 obj\n<< /Type /Catalog /Pages {PAGES_NUMBER} 0 R >>\nendobj\n".encode())
+
+        xref_offset = self._output.tell()
+        size = self._next_number
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for number in range(1, size):
+            offset = self._offsets.get(number)
+            lines.append(f"{offset:010d} 00000 n \n" if offset is not None else "0000000000 65535 f \n")
+        lines.append(f"trailer\n<< /Size {size} /Root {CATALOG_NUMBER} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._output.write("".join(lines).encode())
+
+        self.stats['bytes_written'] = self._output.tell()
+        if self._owns_output:
+            self._output.close()
+        return self.stats
+
+def merge_pdfs(pdf_paths, output_path, dedupe=True):
+    """Merge `pdf_paths` into `output_path` in order and return the merge statistics."""
+    with StreamingPdfMerger(output_path, dedupe=dedupe) as merger:
+        for pdf_path in pdf_paths:
+            merger.append(pdf_path)
+    return merger.stats
+
+def format_merge_stats(stats):
+    """Return a one-line description of a merge for verbose output."""
+    return (
+        f"Merged {stats['pages']} pages from {stats['parts']} parts "
+        f"({stats['bytes_written']} bytes, {stats['objects_deduplicated']} shared objects, "
+        f"{stats['bytes_saved']} bytes saved)"
+    )
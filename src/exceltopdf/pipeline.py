@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Read the next sheet in a separate process while the current one renders.
+
+Parsing a sheet (openpyxl XML) and laying it out (reportlab) are both
+CPU-bound Python, so a reader thread would only take turns with the renderer
+under the GIL. The reader stage runs in its own process instead and hands
+row blocks over a bounded queue: it can run at most `depth` blocks ahead of
+the renderer, which caps memory at a few blocks whatever the workbook size.
+
+Both sides record how long they stalled: the reader waiting for room in a
+full queue (rendering is the bottleneck) and the renderer waiting on an empty
+one (reading is the bottleneck).
+"""
+import multiprocessing
+import queue
+import time
+
+from .instrument import ProfileRecorder, count, span, subscribed
+
+DEFAULT_PIPELINE_DEPTH = 2
+POLL_SECONDS = 0.5  # how often a waiting renderer checks that the reader is alive
+
+_ITEM, _DONE, _FAILED = range(3)
+
+class PipelineStats:
+    """Queue depth and stall times of one pipelined run."""
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.items = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.render_stall_seconds = 0.0
+        self.reader_stall_seconds = 0.0
+        self.reader_seconds = 0.0
+        self.reader_stages = {}
+
+    def _sample(self, depth):
+        self.items += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def summary_lines(self):
+        """Return lines for verbose output."""
+        mean_depth = self.depth_total / self.items if self.items else 0.0
+        lines = [
+            f"Pipeline: {self.items} items through a queue of {self.depth}, "
+            f"depth {mean_depth:.1f} on average (max {self.max_depth})",
+            f"  reader   {self.reader_seconds:8.3f}s busy, {self.reader_stall_seconds:8.3f}s stalled on a full queue",
+            f"  renderer {self.render_stall_seconds:8.3f}s stalled on an empty queue",
+        ]
+        stages = sorted(self.reader_stages.items(), key=lambda item: item[1]['self_seconds'], reverse=True)
+        lines.extend(f"  reader {name:<14} {stage['self_seconds']:8.3f}s self" for name, stage in stages)
+        return lines
+
+def _queue_size(channel):
+    try:
+        return channel.qsize()
+    except NotImplementedError:  # macOS has no sem_getvalue()
+        return 0
+
+def _produce(channel, produce, args):
+    """Reader process: put every item of produce(*args) on the queue, then the reader's totals."""
+    recorder = ProfileRecorder()
+    stalled = 0.0
+    start = time.perf_counter()
+    try:
+        with subscribed(recorder):
+            for item in produce(*args):
+                waited = time.perf_counter()
+                channel.put((_ITEM, item))
+                stalled += time.perf_counter() - waited
+    except BaseException as e:
+        try:
+            channel.put((_FAILED, e))
+        except Exception:
+            # The exception itself could not be pickled
+            channel.put((_FAILED, RuntimeError(f"{type(e).__name__}: {e}")))
+        return
+    channel.put((_DONE, {
+        'seconds': time.perf_counter() - start - stalled,
+        'stalled': stalled,
+        'stages': recorder.stages(),
+        'counters': recorder.counters,
+    }))
+
+def iter_pipelined(produce, args, depth=DEFAULT_PIPELINE_DEPTH, stats=None, mp_context=None):
+    """Yield the items of produce(*args), generated in a reader process at most `depth` items ahead.
+
+    `produce` must be a module-level generator function and `args` picklable,
+    so the reader also starts under the spawn start method. Exceptions raised
+    by the reader are re-raised here; counters it records are replayed into
+    this process's hooks. `stats` (a PipelineStats) is filled in as items arrive.
+    """
+    if depth < 1:
+        raise ValueError("Pipeline depth must be at least 1")
+    context = mp_context or multiprocessing.get_context()
+    channel = context.Queue(maxsize=depth)
+    reader = context.Process(target=_produce, args=(channel, produce, args), daemon=True)
+    reader.start()
+    try:
+        while True:
+            waited = time.perf_counter()
+            with span("wait"):
+                while True:
+                    try:
+                        kind, payload = channel.get(timeout=POLL_SECONDS)
+                        break
+                    except queue.Empty:
+                        if reader.is_alive():
+                            continue
+                    # The reader may have put its last item and exited just before the timeout
+                    try:
+                        kind, payload = channel.get_nowait()
+                        break
+                    except queue.Empty:
+                        raise RuntimeError(f"Sheet reader process exited with code {reader.exitcode}")
+            if stats is not None:
+                stats.render_stall_seconds += time.perf_counter() - waited
+            if kind == _FAILED:
+                raise payload
+            if kind == _DONE:
+                for name, value in payload['counters'].items():
+                    count(name, value)
+                if stats is not None:
+                    stats.reader_seconds = payload['seconds']
+                    stats.reader_stall_seconds = payload['stalled']
+                    stats.reader_stages = payload['stages']
+                return
+            if stats is not None:
+                stats._sample(_queue_size(channel) + 1)
+            yield payload
+    finally:
+        # Closed early (e.g. rendering failed): stop the reader instead of waiting on it
+        if reader.is_alive():
+            reader.terminate()
+        reader.join()
+        channel.close()
+        channel.join_thread()
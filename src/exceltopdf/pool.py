@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Pool of long-lived Excel instances shared by win32com conversions."""
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_USES = 50  # workbooks converted before an instance is recycled
+DEFAULT_IDLE_SECONDS = 600
+DEFAULT_CHECKOUT_TIMEOUT = 300
+
+def dispatch_excel():
+    """Start a hidden Excel instance for the calling thread."""
+    try:
+        import pythoncom
+        import win32com.client as win32
+    except ImportError:
+        raise ImportError("pywin32 not available")
+
+    # Each thread that uses COM must initialise it; repeated calls are harmless
+    pythoncom.CoInitialize()
+    xl = win32.DispatchEx("Excel.Application")
+    xl.Visible = False
+    xl.DisplayAlerts = False
+    return xl
+
+class _PooledInstance:
+    """An Excel application object with the bookkeeping the pool needs."""
+
+    def __init__(self, app):
+        self.app = app
+        self.thread = threading.get_ident()
+        self.uses = 0
+        self.idle_since = time.monotonic()
+
+class ExcelPool:
+    """Bounded pool of Excel application objects checked out one conversion at a time.
+
+    `factory` returns a new application object; anything offering
+    `Workbooks.Count` and `Quit()` works, so tests can pass a fake Excel.
+    Instances are health-checked on checkout and return, recycled after
+    `max_uses` workbooks or any failed conversion, and quit after sitting idle
+    for `max_idle_seconds`. COM objects belong to the thread that created them,
+    so an instance is only handed back to, and only quit by, that thread: an
+    instance of another thread that must make room is set aside and quit on its
+    owner's next acquire() or release().
+    """
+
+    def __init__(self, factory=dispatch_excel, max_size=DEFAULT_POOL_SIZE, max_uses=DEFAULT_MAX_USES,
+                 max_idle_seconds=DEFAULT_IDLE_SECONDS, checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT):
+        if max_size < 1:
+            raise ValueError("Excel pool size must be at least 1")
+        if max_uses < 1:
+            raise ValueError("Excel instance uses must be at least 1")
+        self.factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self._idle = []
+        self._retiring = []  # instances to be quit by the thread that owns them
+        self._leases = {}  # id(app) -> checked out _PooledInstance
+        self._busy = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.stats = {'started': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0, 'waits': 0}
+
+    @staticmethod
+    def is_healthy(app):
+        """Return True if `app` still answers and has no workbooks left open."""
+        try:
+            return app.Workbooks.Count == 0
+        except Exception:
+            return False
+
+    def _quit(self, instance):
+        try:
+            instance.app.Quit()
+        except Exception:
+            pass
+
+    def _take_retiring(self, thread):
+        """Pop the instances set aside for `thread` to quit."""
+        retired = [instance for instance in self._retiring if instance.thread == thread]
+        self._retiring = [instance for instance in self._retiring if instance.thread != thread]
+        return retired
+
+    def _take_idle(self, thread):
+        """Pop a healthy idle instance owned by `thread`, retiring stale ones on the way."""
+        now = time.monotonic()
+        retired = self._take_retiring(thread)
+        found = None
+        for instance in list(self._idle):
+            if now - instance.idle_since > self.max_idle_seconds and instance.thread == thread:
+                self._idle.remove(instance)
+                retired.append(instance)
+                self.stats['recycled'] += 1
+            elif found is None and instance.thread == thread:
+                self._idle.remove(instance)
+                found = instance
+        if found is None and self._idle and len(self._idle) + self._busy >= self.max_size:
+            # Make room by setting aside the longest idle instance of another thread for its owner to quit
+            self._retiring.append(self._idle.pop(0))
+            self.stats['recycled'] += 1
+        return found, retired
+
+    def acquire(self, timeout=None):
+        """Check out an instance, starting one if the pool has room.
+
+        Raises TimeoutError if none becomes available within `timeout` seconds
+        (the pool's checkout timeout by default).
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        thread = threading.get_ident()
+        while True:
+            with self._condition:
+                closed = self._closed
+                if closed:
+                    instance, retired = None, self._take_retiring(thread)
+                else:
+                    instance, retired = self._take_idle(thread)
+                    start_new = instance is None and len(self._idle) + self._busy < self.max_size
+                    if instance is not None or start_new:
+                        self._busy += 1
+                    elif not retired:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f"Timed out after {timeout}s waiting for an Excel instance")
+                        self.stats['waits'] += 1
+                        self._condition.wait(remaining)
+            for stale in retired:
+                self._quit(stale)
+            if closed:
+                raise RuntimeError("Excel pool is closed")
+
+            if instance is not None:
+                if self.is_healthy(instance.app):
+                    self.stats['reused'] += 1
+                    return self._lease(instance)
+                self.stats['unhealthy'] += 1
+                self._quit(instance)
+                start_new = True
+            if start_new:
+                try:
+                    instance = _PooledInstance(self.factory())
+                except BaseException:
+                    with self._condition:
+                        self._busy -= 1
+                        self._condition.notify()
+                    raise
+                self.stats['started'] += 1
+                return self._lease(instance)
+
+    def _lease(self, instance):
+        with self._condition:
+            self._leases[id(instance.app)] = instance
+        return instance.app
+
+    def release(self, app, failed=False):
+        """Return an instance; it is quit instead if it failed, is worn out or unhealthy."""
+        thread = threading.get_ident()
+        with self._condition:
+            instance = self._leases.pop(id(app), None)
+            retired = self._take_retiring(thread)
+        if instance is None:
+            raise ValueError("Excel instance was not checked out from this pool")
+        instance.uses += 1
+
+        keep = not failed and not self._closed and instance.uses < self.max_uses and self.is_healthy(app)
+        if not keep:
+            self.stats['recycled'] += 1
+            if instance.thread == thread:
+                retired.append(instance)
+        with self._condition:
+            self._busy -= 1
+            if keep:
+                instance.idle_since = time.monotonic()
+                self._idle.append(instance)
+            elif instance.thread != thread:
+                self._retiring.append(instance)
+            self._condition.notify()
+        for stale in retired:
+            self._quit(stale)
+
+    @contextmanager
+    def instance(self, timeout=None):
+        """Context manager that checks out an instance and recycles it if the block raises."""
+        app = self.acquire(timeout)
+        try:
+            yield app
+        except BaseException:
+            self.release(app, failed=True)
+            raise
+        self.release(app)
+
+    def close(self):
+        """Quit this thread's idle instances; the others and those still checked out are quit by their owners."""
+        thread = threading.get_ident()
+        with self._condition:
+            self._closed = True
+            self._retiring.extend(self._idle)
+            self._idle = []
+            retired = self._take_retiring(thread)
+            self._condition.notify_all()
+        for instance in retired:
+            self._quit(instance)
+
+    def describe(self):
+        """Return the pool counters for verbose output."""
+        return (
+            f"Excel pool: {self.stats['started']} started, {self.stats['reused']} reused, "
+            f"{self.stats['recycled']} recycled"
+        )
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def default_excel_pool():
+    """Return the process-wide Excel pool, creating it on first use."""
+    global _default_pool
+    try:
+        import win32com.client
+    except ImportError:
+        raise ImportError("pywin32 not available")
+
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ExcelPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+def close_default_excel_pool():
+    """Close the process-wide Excel pool if it was started.
+
+    Instances are only quit on the thread that owns them, so every thread that
+    converted with the default pool runs this before it finishes; the atexit
+    hook covers the main thread.
+    """
+    with _default_pool_lock:
+        pool = _default_pool
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Workbook readers that feed rows to the PDF renderers.
+
+Rows come from one of several parsing backends, all normalised to what
+openpyxl reads so every backend yields the same header and rows:
+
+- "openpyxl": loads the whole workbook into memory (also reads workbooks
+  whose dimensions are missing or wrong).
+- "openpyxl-readonly": streams rows from the sheet XML, holding one row.
+- "calamine": python-calamine (Rust) parses the sheet in one pass, many
+  times faster than openpyxl; it also reads .xls, .xlsb and .ods workbooks.
+"""
+import contextlib
+import datetime
+import io
+import itertools
+
+from .selection import FULL_SHEET
+from .streams import is_path, open_workbook
+
+DEFAULT_ROW_WINDOW = 1000
+READER_BACKENDS = ("openpyxl", "openpyxl-readonly", "calamine")
+DEFAULT_BACKEND = "openpyxl-readonly"
+
+# Floats calamine returns for whole numbers are ints in openpyxl, up to the exact float range
+_EXACT_INTEGER = 2 ** 53
+_MIDNIGHT = datetime.time()
+
+def calamine_available():
+    """Return True if python-calamine is installed."""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _cell_to_str(value):
+    """Stringify a cell value the same way the pandas path does."""
+    if value is None:
+        return ''
+    return str(value)
+
+def _load_openpyxl(excel_path, read_only=True):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError(f"Required packages not available: {e}")
+
+    return load_workbook(open_workbook(excel_path), read_only=read_only, data_only=True)
+
+def _load_calamine(excel_path):
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError as e:
+        raise ImportError(f"Required packages not available: {e}")
+
+    if is_path(excel_path):
+        return CalamineWorkbook.from_path(str(excel_path))
+    return CalamineWorkbook.from_filelike(io.BytesIO(excel_path))
+
+def _calamine_row(row, offset):
+    """Return a calamine row with cell values as openpyxl reads them."""
+    values = [None] * offset
+    for value in row:
+        kind = type(value)
+        if kind is str:
+            values.append(value if value else None)
+        elif kind is float:
+            values.append(int(value) if value.is_integer() and -_EXACT_INTEGER < value < _EXACT_INTEGER else value)
+        elif kind is datetime.date:
+            values.append(datetime.datetime.combine(value, _MIDNIGHT))
+        else:
+            values.append(value)
+    return values
+
+@contextlib.contextmanager
+def _sheet_rows(excel_path, sheet_name, backend):
+    """Open a sheet with `backend` and give (width, rows), rows being sequences of raw values from row 1."""
+    if backend not in READER_BACKENDS:
+        raise ValueError(f"Unknown reader backend '{backend}'. Expected one of: {', '.join(READER_BACKENDS)}")
+    if backend == "calamine":
+        wb = _load_calamine(excel_path)
+        try:
+            sheet = wb.get_sheet_by_name(sheet_name)
+            # Rows start at row 1 but at the first used column; pad back to column A as openpyxl reads them
+            first_col = sheet.start[1] if sheet.start else 0
+            yield first_col + sheet.width, (_calamine_row(row, first_col) for row in sheet.iter_rows())
+        finally:
+            wb.close()
+    else:
+        wb = _load_openpyxl(excel_path, read_only=backend == "openpyxl-readonly")
+        try:
+            ws = wb[sheet_name]
+            yield ws.max_column or 0, ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+def streaming_sheet_names(excel_path, backend=DEFAULT_BACKEND):
+    """Return the sheet names of a workbook without loading any cell data."""
+    if backend == "calamine":
+        wb = _load_calamine(excel_path)
+    else:
+        wb = _load_openpyxl(excel_path)
+    try:
+        return list(wb.sheet_names if backend == "calamine" else wb.sheetnames)
+    finally:
+        wb.close()
+
+def _range_rows(rows, sheet_width, cell_range):
+    """Return (width, rows) limited to `cell_range`; rows past its last row are never pulled."""
+    first_row, first_col, last_row, last_col = cell_range
+    if cell_range == FULL_SHEET:
+        return sheet_width, rows
+    width = max((sheet_width if last_col is None else min(sheet_width, last_col)) - first_col + 1, 0)
+    rows = itertools.islice(rows, first_row - 1, last_row)
+    return width, (row[first_col - 1:last_col] for row in rows)
+
+def iter_sheet_rows(excel_path, sheet_name, raw=False, backend=DEFAULT_BACKEND, cell_range=None):
+    """Yield the rows of a sheet as lists of strings, header row first.
+
+    Rows are read with `backend` (see READER_BACKENDS); the default streams
+    them with openpyxl in read-only mode so only the current row is held in
+    memory. Rows are padded or trimmed to the sheet width, blank header cells
+    are named like pandas does ("Unnamed: N") and trailing empty rows are dropped.
+    With `raw` the rows below the header keep their cell values (None for
+    empty cells) for formatting.format_column().
+
+    With a `cell_range` (a selection.CellRange) only that block is read, its
+    first row being the header; the rows are parsed lazily, so the streamed
+    backends stop parsing at its last row (calamine loads the whole sheet).
+    Blank header cells keep the name of their column in the sheet.
+    """
+    cell_range = cell_range or FULL_SHEET
+    with _sheet_rows(excel_path, sheet_name, backend) as (sheet_width, rows):
+        sheet_width, rows = _range_rows(rows, sheet_width, cell_range)
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return
+
+        width = max(len(first), sheet_width)
+        first = list(first) + [None] * (width - len(first))
+        yield [
+            _cell_to_str(value) if value is not None else f"Unnamed: {idx}"
+            for idx, value in enumerate(first, cell_range.first_col - 1)
+        ]
+
+        # Blank rows are only emitted once a non-blank row follows them,
+        # matching pandas which drops trailing empty rows.
+        empty = None if raw else ''
+        pending_blank = 0
+        for row in rows:
+            if all(value is None for value in row):
+                pending_blank += 1
+                continue
+            for _ in range(pending_blank):
+                yield [empty] * width
+            pending_blank = 0
+            values = list(row[:width]) if raw else [_cell_to_str(value) for value in row[:width]]
+            values.extend([empty] * (width - len(values)))
+            yield values
+
+def iter_row_windows(rows, window=DEFAULT_ROW_WINDOW):
+    """Group an iterable of rows into lists of at most `window` rows."""
+    if window < 1:
+        raise ValueError("Row window must be at least 1")
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= window:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
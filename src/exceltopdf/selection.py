@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Sheet and cell-range selection shared by both conversion engines.
+
+Sheets are picked with a comma-separated list of names, 1-based indexes and
+index ranges ("Summary,3,5-7"); a cell range ("A1:H5000", "A:H" or "1:500")
+limits every selected sheet to that block, whose first row is the header.
+"""
+import re
+from collections import namedtuple
+
+MAX_ROWS = 1048576
+MAX_COLUMNS = 16384
+
+# 1-based, inclusive bounds; None for an open end (whole rows or whole columns)
+CellRange = namedtuple('CellRange', 'first_row first_col last_row last_col')
+FULL_SHEET = CellRange(1, 1, None, None)
+
+_CELLS = re.compile(r"^\$?([A-Z]{1,3})\$?(\d+):\$?([A-Z]{1,3})\$?(\d+)$")
+_COLUMNS = re.compile(r"^\$?([A-Z]{1,3}):\$?([A-Z]{1,3})$")
+_ROWS = re.compile(r"^\$?(\d+):\$?(\d+)$")
+_INDEX_RANGE = re.compile(r"^(\d+)-(\d+)?$")
+
+def column_index(letters):
+    """Return the 1-based column index of Excel column letters ("A" is 1, "AB" is 28)."""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index
+
+def parse_cell_range(spec):
+    """Return the CellRange of an "A1:H5000", "A:H" or "1:500" address (a CellRange is returned as is)."""
+    if spec is None or isinstance(spec, CellRange):
+        return spec
+    address = str(spec).strip().upper()
+    match = _CELLS.match(address)
+    if match:
+        first_col, first_row, last_col, last_row = match.groups()
+        cell_range = CellRange(int(first_row), column_index(first_col), int(last_row), column_index(last_col))
+    elif _COLUMNS.match(address):
+        first_col, last_col = _COLUMNS.match(address).groups()
+        cell_range = CellRange(1, column_index(first_col), None, column_index(last_col))
+    elif _ROWS.match(address):
+        first_row, last_row = _ROWS.match(address).groups()
+        cell_range = CellRange(int(first_row), 1, int(last_row), None)
+    else:
+        raise ValueError(f"Invalid cell range '{spec}'. Expected e.g. A1:H5000, A:H or 1:500")
+
+    first_row, first_col, last_row, last_col = cell_range
+    if (first_row < 1 or first_col < 1 or (last_row or first_row) > MAX_ROWS or (last_col or first_col) > MAX_COLUMNS
+            or (last_row is not None and last_row < first_row) or (last_col is not None and last_col < first_col)):
+        raise ValueError(f"Invalid cell range '{spec}': corners out of order or outside the sheet")
+    return cell_range
+
+def clip_range(cell_range, first_row, first_col, last_row, last_col):
+    """Return the part of `cell_range` inside the given inclusive bounds, or None if they do not overlap."""
+    clipped = CellRange(
+        max(cell_range.first_row, first_row),
+        max(cell_range.first_col, first_col),
+        last_row if cell_range.last_row is None else min(cell_range.last_row, last_row),
+        last_col if cell_range.last_col is None else min(cell_range.last_col, last_col),
+    )
+    if clipped.first_row > clipped.last_row or clipped.first_col > clipped.last_col:
+        return None
+    return clipped
+
+def excel_address(cell_range):
+    """Return the A1-style address of a CellRange ("A1:H5000", "A:H" or "1:500")."""
+    from .comlayout import column_letter
+
+    first_row, first_col, last_row, last_col = cell_range
+    if last_row is None:
+        return f"{column_letter(first_col)}:{column_letter(last_col or MAX_COLUMNS)}"
+    if last_col is None and first_col == 1:
+        return f"{first_row}:{last_row}"
+    return f"{column_letter(first_col)}{first_row}:{column_letter(last_col or MAX_COLUMNS)}{last_row}"
+
+def select_sheets(sheet_names, spec):
+    """Return the sheets of `sheet_names` picked by `spec`, in workbook order.
+
+    `spec` is a comma-separated string or a list of sheet names, 1-based
+    indexes and index ranges ("5-7", or "5-" for the fifth sheet onwards). An
+    item naming a sheet is taken as its name, even if it looks like an index.
+    """
+    items = spec.split(",") if isinstance(spec, str) else spec
+    picked = set()
+    for item in items:
+        item = str(item).strip()
+        if not item:
+            continue
+        if item in sheet_names:
+            picked.add(sheet_names.index(item))
+            continue
+        match = _INDEX_RANGE.match(item)
+        if item.isdigit():
+            first = last = int(item)
+        elif match:
+            first, last = int(match.group(1)), int(match.group(2) or len(sheet_names))
+        else:
+            raise ValueError(f"Sheet '{item}' not found. Available sheets: {', '.join(sheet_names)}")
+        if not 1 <= first <= last <= len(sheet_names):
+            raise ValueError(f"Sheet index '{item}' out of range: the workbook has {len(sheet_names)} sheets")
+        picked.update(range(first - 1, last))
+    if not picked:
+        raise ValueError("No sheets selected")
+    return [sheet_names[index] for index in sorted(picked)]
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""HTTP conversion service with a bounded job queue, isolated workers and metrics.
+
+`exceltopdf server` accepts workbooks over HTTP on localhost and converts them
+with the pandas engine in worker processes:
+
+- POST /convert with the workbook as the request body converts it; the PDF
+  is the response (sync mode, the default) or, with ?mode=async, the reply
+  is 202 with a job id to poll at GET /jobs/<id> and fetch from
+  GET /jobs/<id>/pdf. Query parameters set conversion options (sheets,
+  range, all_sheets, engine, reader, preserve_styles, raw_values,
+  auto_adjust, chunk_rows, row_window).
+- Jobs wait in a queue of bounded length; a submission that finds it full is
+  rejected at once with 429 and a Retry-After header instead of piling up.
+- Each worker process runs one job at a time under a memory limit (the
+  address space a job may add, enforced with RLIMIT_AS on Linux) and a time
+  limit, after which the worker is killed and replaced.
+- GET /metrics reports queue depth, running jobs, job counts, p50/p99
+  latency from submission to finished PDF and recent throughput as JSON.
+"""
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_TIME_LIMIT = 120.0
+DEFAULT_MEMORY_LIMIT_MB = 1024
+DEFAULT_MAX_UPLOAD_MB = 100
+DEFAULT_KEEP_RESULTS = 100
+LATENCY_SAMPLES = 1000  # latencies kept for the percentiles
+THROUGHPUT_WINDOW = 60.0  # seconds of finished jobs the throughput is measured over
+PRELOAD_MODULES = ["exceltopdf.cli", "pandas", "openpyxl", "reportlab.platypus", "numpy", "PyPDF2"]
+
+# Query parameters accepted by POST /convert, as converter options
+_BOOLEAN_OPTIONS = {"all_sheets": "all_sheets", "preserve_styles": "preserve_styles", "auto_adjust": "auto_adjust"}
+_INTEGER_OPTIONS = {"chunk_rows": "chunk_rows", "row_window": "row_window"}
+_TEXT_OPTIONS = {"sheets": "sheets", "range": "cell_range", "engine": "engine", "reader": "reader"}
+
+class JobFailed(Exception):
+    """A job did not produce a PDF; `kind` is "error", "invalid", "timeout", "memory" or "crashed"."""
+
+    def __init__(self, message, kind="error"):
+        super().__init__(message)
+        self.kind = kind
+
+def _address_space():
+    """Return this process's virtual memory size in bytes, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _limit_memory(limit_bytes):
+    """Cap the address space at its current size plus `limit_bytes`; returns the previous limits or None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    baseline = _address_space()
+    if baseline is None:
+        return None
+    previous = resource.getrlimit(resource.RLIMIT_AS)
+    soft = baseline + limit_bytes
+    if previous[1] != resource.RLIM_INFINITY:
+        soft = min(soft, previous[1])
+    resource.setrlimit(resource.RLIMIT_AS, (soft, previous[1]))
+    return previous
+
+def _worker_main(connection, memory_limit):
+    """Run jobs received on `connection` until it closes (runs in a worker process)."""
+    from . import cli
+    from .cache import OutputCache
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C reaches the whole process group; the server shuts workers down
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        start = time.perf_counter()
+        previous = _limit_memory(memory_limit) if memory_limit else None
+        try:
+            cache = OutputCache(job["cache"]["dir"], max_bytes=job["cache"]["max_bytes"]) if job["cache"] else None
+            status = cli.convert_cached(job["input"], job["output"], "pandas", job["options"], cache=cache)
+            response = {"ok": True, "cache": status}
+        except MemoryError:
+            response = {"ok": False, "kind": "memory", "error": "Job exceeded its memory limit"}
+        except ValueError as e:
+            response = {"ok": False, "kind": "invalid", "error": str(e)}
+        except Exception as e:
+            response = {"ok": False, "kind": "error", "error": f"{type(e).__name__}: {e}"}
+        finally:
+            if previous is not None:
+                import resource
+
+                resource.setrlimit(resource.RLIMIT_AS, previous)
+        response["seconds"] = time.perf_counter() - start
+        connection.send(response)
+        if response.get("kind") == "memory":
+            return  # the heap may be left fragmented or half-built; the supervisor starts a fresh worker
+
+def _start_method():
+    """Return the multiprocessing context workers are started with: a preloaded forkserver where available."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context("spawn")
+
+class Job:
+    """One conversion: its files, state and timings."""
+
+    def __init__(self, job_dir, options, sync, suffix=".xlsx"):
+        self.id = uuid.uuid4().hex
+        self.input = job_dir / f"{self.id}{suffix}"
+        self.output = job_dir / f"{self.id}.pdf"
+        self.options = options
+        self.sync = sync
+        self.state = "queued"
+        self.error = None
+        self.kind = None
+        self.cache = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+    def describe(self):
+        info = {"id": self.id, "state": self.state, "submitted": self.submitted,
+                "started": self.started, "finished": self.finished}
+        if self.finished is not None:
+            info["latency_seconds"] = self.finished - self.submitted
+        if self.error is not None:
+            info.update(error=self.error, kind=self.kind)
+        if self.cache is not None:
+            info["cache"] = self.cache
+        return info
+
+    def remove_files(self):
+        for path in (self.input, self.output):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+class _Worker:
+    """A supervisor thread that feeds queued jobs to one worker process, replacing it when it dies or hangs."""
+
+    def __init__(self, service, context):
+        self.service = service
+        self.context = context
+        self.process = None
+        self.connection = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _spawn(self):
+        parent, child = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_main, args=(child, self.service.memory_limit), daemon=True)
+        self.process.start()
+        child.close()
+        self.connection = parent
+
+    def stop(self):
+        if self.process is not None:
+            self.connection.close()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+
+    def _kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+        self.process = None
+
+    def _discard(self):
+        """Drop the worker process and its pipe after an unexpected error, so the next job starts afresh."""
+        process, self.process = self.process, None
+        connection, self.connection = self.connection, None
+        try:
+            if process is not None and process.is_alive():
+                process.kill()
+                process.join()
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _run(self):
+        while True:
+            job = self.service.jobs_queue.get()
+            if job is None:
+                self.stop()
+                return
+            self.service.job_started(job)
+            try:
+                response = self._execute(job)
+                error = None if response["ok"] else JobFailed(response["error"], response["kind"])
+            except JobFailed as e:
+                response, error = {}, e
+            except Exception as e:
+                # e.g. no worker could be started (EAGAIN, EMFILE): fail this job and keep serving the queue
+                response, error = {}, JobFailed(f"Worker failed: {type(e).__name__}: {e}", "crashed")
+                try:
+                    self._discard()
+                except Exception:
+                    pass
+            self.service.job_finished(job, error, response.get("cache"))
+
+    def _execute(self, job):
+        """Run `job` on the worker process and return its response; raises JobFailed if it hangs or dies."""
+        if self.process is None or not self.process.is_alive():
+            self._spawn()
+        request = {"input": str(job.input), "output": str(job.output), "options": job.options,
+                   "cache": self.service.cache}
+        try:
+            self.connection.send(request)
+            if not self.connection.poll(self.service.time_limit):
+                self._kill()
+                raise JobFailed(f"Job exceeded its time limit of {self.service.time_limit:g}s", "timeout")
+            response = self.connection.recv()
+        except (EOFError, OSError):
+            self._kill()
+            raise JobFailed("Worker process died during the job", "crashed")
+        if response.get("kind") == "memory":
+            self.process.join()
+            self.connection.close()
+            self.process = None
+        return response
+
+class ConversionService:
+    """The job queue, worker processes, job table and metrics behind the HTTP handler."""
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE, time_limit=DEFAULT_TIME_LIMIT, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, keep_results=DEFAULT_KEEP_RESULTS, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.keep_results = keep_results
+        self.cache = cache  # {'dir': ..., 'max_bytes': ...} or None
+        self.job_dir = Path(tempfile.mkdtemp(prefix="exceltopdf-jobs-"))
+        self.jobs_queue = queue.Queue(maxsize=queue_size)
+        self.jobs = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.running = 0
+        self.counts = collections.Counter()
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.finish_times = collections.deque()
+
+        context = _start_method()
+        self._workers = [_Worker(self, context) for _ in range(self.workers)]
+        for worker in self._workers:
+            worker.thread.start()
+
+    def submit(self, workbook, options, sync, suffix=".xlsx"):
+        """Queue a conversion of `workbook` (bytes) and return its Job; raises queue.Full when the queue is full."""
+        job = Job(self.job_dir, options, sync, suffix)
+        job.input.write_bytes(workbook)
+        try:
+            self.jobs_queue.put_nowait(job)
+        except queue.Full:
+            job.remove_files()
+            with self.lock:
+                self.counts["rejected"] += 1
+            raise
+        with self.lock:
+            self.counts["accepted"] += 1
+            if not sync:
+                self.jobs[job.id] = job
+        return job
+
+    def job_started(self, job):
+        with self.lock:
+            self.running += 1
+        job.state = "running"
+        job.started = time.time()
+
+    def job_finished(self, job, error, cache_status):
+        job.finished = time.time()
+        with self.lock:
+            self.running -= 1
+            if error is None:
+                job.state = "done"
+                job.cache = cache_status
+                self.counts["completed"] += 1
+            else:
+                job.state = "failed"
+                job.error, job.kind = str(error), error.kind
+                self.counts["failed"] += 1
+                self.counts[error.kind] += 1
+            self.latencies.append(job.finished - job.submitted)
+            self.finish_times.append(job.finished)
+            self._evict()
+        job.done.set()
+
+    def _evict(self):
+        """Drop the oldest finished async jobs beyond `keep_results` (call with the lock held)."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(finished) - self.keep_results)]:
+            self.jobs.pop(job_id).remove_files()
+
+    def job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def metrics(self):
+        """Return the service metrics as a JSON-serialisable dict."""
+        now = time.time()
+        with self.lock:
+            while self.finish_times and self.finish_times[0] < now - THROUGHPUT_WINDOW:
+                self.finish_times.popleft()
+            latencies = sorted(self.latencies)
+            window = min(THROUGHPUT_WINDOW, max(now - self.started, 1e-9))
+            return {
+                "queue_depth": self.jobs_queue.qsize(),
+                "queue_capacity": self.queue_size,
+                "running": self.running,
+                "workers": self.workers,
+                "accepted": self.counts["accepted"],
+                "rejected": self.counts["rejected"],
+                "completed": self.counts["completed"],
+                "failed": self.counts["failed"],
+                "timed_out": self.counts["timeout"],
+                "memory_exceeded": self.counts["memory"],
+                "latency_seconds": {
+                    "p50": _percentile(latencies, 50),
+                    "p99": _percentile(latencies, 99),
+                    "samples": len(latencies),
+                },
+                "throughput_per_second": len(self.finish_times) / window,
+                "uptime_seconds": now - self.started,
+            }
+
+    def close(self):
+        """Stop the workers once the queued jobs are done and remove the job files."""
+        for _ in self._workers:
+            self.jobs_queue.put(None)
+        for worker in self._workers:
+            worker.thread.join()
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+def _percentile(ordered, percent):
+    """Return the nearest-rank percentile of sorted values, or None if there are none."""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+def parse_options(query):
+    """Return the converter options of POST /convert query parameters; raises ValueError for bad ones."""
+    from .cli import ENGINES, READERS
+    from .selection import parse_cell_range
+
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    # Jobs stay in their one worker process, so the pipeline reader and parallel sheets are off
+    options = {"verbose": False, "pipeline_depth": 0, "parallel_sheets": False}
+    for name, value in params.items():
+        if name == "mode":
+            continue
+        if name in _BOOLEAN_OPTIONS:
+            options[_BOOLEAN_OPTIONS[name]] = value.lower() in ("1", "true", "yes", "on")
+        elif name == "raw_values":
+            options["number_formats"] = value.lower() not in ("1", "true", "yes", "on")
+        elif name in _INTEGER_OPTIONS:
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"{name} must be a positive integer")
+            options[_INTEGER_OPTIONS[name]] = int(value)
+        elif name in _TEXT_OPTIONS:
+            options[_TEXT_OPTIONS[name]] = value
+        else:
+            raise ValueError(f"Unknown parameter '{name}'")
+    if options.get("engine", ENGINES[0]) not in ENGINES:
+        raise ValueError(f"engine must be one of: {', '.join(ENGINES)}")
+    if options.get("reader", READERS[0]) not in READERS:
+        raise ValueError(f"reader must be one of: {', '.join(READERS)}")
+    parse_cell_range(options.get("cell_range"))
+    return options
+
+# HTTP status of a failed job, by JobFailed kind
+_FAILURE_STATUS = {"invalid": 422, "timeout": 504}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8") + b"\n"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send(status, {"error": message}, headers=headers)
+
+    def do_GET(self):
+        service = self.server.service
+        parts = [part for part in urlsplit(self.path).path.split("/") if part]
+        if parts == ["metrics"]:
+            self._send(200, service.metrics())
+        elif parts == ["health"]:
+            self._send(200, {"ok": True})
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and parts[2:] in ([], ["pdf"]):
+            job = service.job(parts[1])
+            if job is None:
+                self._error(404, f"Unknown job '{parts[1]}'")
+            elif len(parts) == 2:
+                self._send(200, job.describe())
+            elif job.state == "done":
+                self._send(200, job.output.read_bytes(), "application/pdf")
+            elif job.state == "failed":
+                self._error(_FAILURE_STATUS.get(job.kind, 500), job.error)
+            else:
+                self._error(409, f"Job is {job.state}")
+        else:
+            self._error(404, "Not found")
+
+    def do_POST(self):
+        from .streams import FORMAT_SUFFIXES, detect_format
+
+        service = self.server.service
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/convert":
+            self._error(404, "Not found")
+            return
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            self._error(411, "Content-Length is required")
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # A negative length would make rfile.read() wait for the client to close
+            self.close_connection = True
+            self._error(400, "Invalid Content-Length")
+            return
+        if length > self.server.max_upload:
+            self.close_connection = True
+            self._error(413, f"Workbook larger than {self.server.max_upload // (1024 * 1024)} MB")
+            return
+        workbook = self.rfile.read(length)
+        mode = parse_qs(url.query).get("mode", ["sync"])[-1]
+        try:
+            if mode not in ("sync", "async"):
+                raise ValueError("mode must be 'sync' or 'async'")
+            options = parse_options(url.query)
+            workbook_format = detect_format(workbook)
+            if workbook_format is None:
+                raise ValueError("Request body is not a workbook (.xlsx, .xls, .xlsb or .ods)")
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+
+        try:
+            job = service.submit(workbook, options, sync=mode == "sync", suffix=FORMAT_SUFFIXES[workbook_format])
+        except queue.Full:
+            self._error(429, f"Queue is full ({service.queue_size} jobs waiting); retry later",
+                        headers={"Retry-After": "1"})
+            return
+
+        if mode == "async":
+            self._send(202, {"id": job.id, "state": job.state, "status_url": f"/jobs/{job.id}",
+                             "result_url": f"/jobs/{job.id}/pdf"})
+            return
+        job.done.wait()
+        try:
+            if job.state == "done":
+                self._send(200, job.output.read_bytes(), "application/pdf",
+                           headers={"X-Job-Seconds": f"{job.finished - job.submitted:.3f}"})
+            else:
+                self._error(_FAILURE_STATUS.get(job.kind, 500), job.error)
+        finally:
+            job.remove_files()
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """HTTP server whose handler threads hand jobs to a ConversionService."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, max_upload_mb=DEFAULT_MAX_UPLOAD_MB, verbose=False):
+        self.service = service
+        self.max_upload = max_upload_mb * 1024 * 1024
+        self.verbose = verbose
+        super().__init__(address, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        self.service.close()
+
+def main(argv=None):
+    """Entry point for `exceltopdf server`."""
+    parser = argparse.ArgumentParser(
+        prog="exceltopdf server",
+        description="Run an HTTP conversion service with a bounded job queue and isolated worker processes."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes, each converting one job at a time (default: number of CPUs)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Jobs that may wait for a worker; more are rejected with 429 (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT,
+                        help=f"Seconds a job may run before its worker is killed (default: {DEFAULT_TIME_LIMIT:g})")
+    parser.add_argument("--memory-limit", type=int, default=DEFAULT_MEMORY_LIMIT_MB,
+                        help="MB of memory a job may allocate, enforced on Linux; 0 for no limit "
+                             f"(default: {DEFAULT_MEMORY_LIMIT_MB})")
+    parser.add_argument("--max-upload", type=int, default=DEFAULT_MAX_UPLOAD_MB,
+                        help=f"Largest accepted workbook in MB (default: {DEFAULT_MAX_UPLOAD_MB})")
+    parser.add_argument("--keep-results", type=int, default=DEFAULT_KEEP_RESULTS,
+                        help=f"Finished async jobs whose PDFs are kept for download (default: {DEFAULT_KEEP_RESULTS})")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory of cached PDFs reused for unchanged workbooks (default: per-user cache directory)")
+    parser.add_argument("--no-cache", action="store_true", help="Always convert, without the PDF cache")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    for name in ("workers", "queue_size", "max_upload", "keep_results"):
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            print(f"Error: --{name.replace('_', '-')} must be at least 1.", file=sys.stderr)
+            sys.exit(1)
+    if args.time_limit <= 0 or args.memory_limit < 0:
+        print("Error: --time-limit must be positive and --memory-limit cannot be negative.", file=sys.stderr)
+        sys.exit(1)
+
+    cache = None
+    if not args.no_cache:
+        from .cache import DEFAULT_CACHE_SIZE_MB, OutputCache
+
+        cache = {"dir": str(Path(OutputCache(args.cache_dir).cache_dir).resolve()),
+                 "max_bytes": DEFAULT_CACHE_SIZE_MB * 1024 * 1024}
+    service = ConversionService(workers=args.workers, queue_size=args.queue_size, time_limit=args.time_limit,
+                                memory_limit_mb=args.memory_limit, keep_results=args.keep_results, cache=cache)
+    try:
+        server = ServiceHTTPServer((args.host, args.port), service, max_upload_mb=args.max_upload,
+                                   verbose=args.verbose)
+    except OSError as e:
+        service.close()
+        print(f"Error: cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    host, port = server.server_address[:2]
+    print(f"Serving conversions on http://{host}:{port} with {service.workers} workers "
+          f"(queue {service.queue_size}, time limit {service.time_limit:g}s)", flush=True)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""In-memory workbooks and PDF streams for the converters.
+
+Converters accept a workbook as a path, bytes or a binary file-like object and
+write the PDF to a path or any writable binary stream. In-memory workbooks are
+kept as bytes so every reader can open its own BytesIO over them and worker
+processes receive them by pickling.
+"""
+import io
+import os
+import zipfile
+
+XLSX_MAGIC = b"PK\x03\x04"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # OLE2 compound document
+ODS_MIMETYPE = b"application/vnd.oasis.opendocument.spreadsheet"
+FORMAT_SUFFIXES = {'xlsx': '.xlsx', 'xlsb': '.xlsb', 'xls': '.xls', 'ods': '.ods'}
+
+def is_path(value):
+    """Return True if `value` names a file rather than holding data or a stream."""
+    return isinstance(value, (str, os.PathLike))
+
+def workbook_input(source):
+    """Return `source` as a path or as bytes, reading file-like objects to the end."""
+    if is_path(source):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        data = source.read()
+        if not isinstance(data, bytes):
+            raise TypeError("Workbook streams must be opened in binary mode")
+        return data
+    raise TypeError(f"Expected a path, bytes or a binary file-like object, not {type(source).__name__}")
+
+def open_workbook(source):
+    """Return what pandas and openpyxl should open: the path itself, or a fresh BytesIO over bytes."""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+def describe_source(source):
+    """Return a label for log messages."""
+    if is_path(source):
+        return str(source)
+    if isinstance(source, bytes):
+        return f"<in-memory workbook, {len(source)} bytes>"
+    return f"<{type(source).__name__} stream>"
+
+def detect_format(source):
+    """Return 'xlsx', 'xlsb', 'xls' or 'ods' from the workbook's bytes, or None if it is not a workbook.
+
+    Zip containers are only accepted when they hold an Excel workbook part or
+    an OpenDocument spreadsheet mimetype, so .docx and .odt files and plain
+    archives are rejected too.
+    """
+    if is_path(source):
+        with open(source, 'rb') as handle:
+            head = handle.read(len(XLS_MAGIC))
+    else:
+        head = source[:len(XLS_MAGIC)]
+
+    if head.startswith(XLS_MAGIC):
+        return 'xls'
+    if not head.startswith(XLSX_MAGIC):
+        return None
+    try:
+        with zipfile.ZipFile(open_workbook(source)) as archive:
+            names = set(archive.namelist())
+            mimetype = archive.read('mimetype').strip() if 'mimetype' in names else None
+    except zipfile.BadZipFile:
+        return None
+    if 'xl/workbook.xml' in names:
+        return 'xlsx'
+    if 'xl/workbook.bin' in names:
+        return 'xlsb'
+    if mimetype == ODS_MIMETYPE:
+        return 'ods'
+    return None
+
+def write_output(output, data):
+    """Write finished PDF bytes to a path or a writable binary stream."""
+    if is_path(output):
+        with open(output, 'wb') as handle:
+            handle.write(data)
+    else:
+        output.write(data)
+        if hasattr(output, 'flush'):
+            output.flush()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Excel cell styles for the renderers: interned per sheet and run-length encoded into regions.
+
+Only what the table renderers can show is kept from a cell's format: bold and
+italic (as Helvetica variants), the font colour, a solid fill colour and the
+horizontal alignment. Each distinct combination is interned once in a
+StyleTable, so a sheet becomes a grid of small integer style ids.
+table_style_commands() splits that grid into one grid per attribute and
+style_regions() collapses each into rectangles of one value, so banded fills,
+bold columns and aligned columns each merge on their own however the other
+attributes vary. The number of TableStyle commands follows the distinct style
+regions of a sheet rather than its cell count.
+"""
+from collections import namedtuple
+
+from .selection import FULL_SHEET
+
+DEFAULT_STYLE_ID = 0
+
+CellStyle = namedtuple('CellStyle', 'font_name text_color fill_color align')
+DEFAULT_STYLE = CellStyle(None, None, None, None)
+# The styles of a block of rows: its sheet's StyleTable and a (rows, columns) id grid
+BlockStyles = namedtuple('BlockStyles', 'table grid')
+
+# Colours of Office's default theme, by theme index (tints are not applied)
+THEME_COLORS = (
+    'FFFFFF', '000000', 'E7E6E6', '44546A', '4472C4',
+    'ED7D31', 'A5A5A5', 'FFC000', '5B9BD5', '70AD47',
+)
+FONT_VARIANTS = {
+    (False, False): None,
+    (True, False): 'Helvetica-Bold',
+    (False, True): 'Helvetica-Oblique',
+    (True, True): 'Helvetica-BoldOblique',
+}
+ALIGNMENTS = {'center': 'CENTER', 'centerContinuous': 'CENTER', 'right': 'RIGHT'}
+# TableStyle command for each CellStyle field
+STYLE_COMMANDS = (
+    ('fill_color', 'BACKGROUND'),
+    ('text_color', 'TEXTCOLOR'),
+    ('font_name', 'FONTNAME'),
+    ('align', 'ALIGN'),
+)
+
+def _hex_color(color):
+    """Return an openpyxl Color as 'RRGGBB', or None when it cannot be resolved."""
+    if color is None:
+        return None
+    if color.type == 'rgb' and isinstance(color.rgb, str):
+        return color.rgb[-6:].upper()
+    if color.type == 'indexed':
+        from openpyxl.styles.colors import COLOR_INDEX
+
+        if 0 <= color.indexed < len(COLOR_INDEX):
+            return COLOR_INDEX[color.indexed][-6:].upper()
+    if color.type == 'theme' and 0 <= color.theme < len(THEME_COLORS):
+        return THEME_COLORS[color.theme]
+    return None
+
+def cell_style(cell):
+    """Return the CellStyle of an openpyxl cell (normal or read-only)."""
+    font = cell.font
+    font_name = FONT_VARIANTS[bool(font.b), bool(font.i)] if font is not None else None
+    text_color = _hex_color(font.color) if font is not None else None
+    if text_color == '000000':
+        text_color = None
+
+    fill = cell.fill
+    fill_color = None
+    if getattr(fill, 'fill_type', None) == 'solid':
+        fill_color = _hex_color(fill.fgColor)
+
+    alignment = cell.alignment
+    align = ALIGNMENTS.get(alignment.horizontal) if alignment is not None else None
+    return CellStyle(font_name, text_color, fill_color, align)
+
+class StyleTable:
+    """Interns the styles of one sheet: each distinct CellStyle gets an id, 0 being the default.
+
+    Workbooks already share one format record (xf) between all cells formatted
+    alike, so each xf is resolved once and later cells are a dictionary lookup.
+    """
+
+    def __init__(self):
+        self.styles = [DEFAULT_STYLE]
+        self._ids = {DEFAULT_STYLE: DEFAULT_STYLE_ID}
+        self._by_format = {}
+        self._colors = {}
+        self._lookups = {}
+
+    def __len__(self):
+        return len(self.styles)
+
+    def intern(self, style):
+        """Return the id of `style`, adding it to the table if it is new."""
+        style_id = self._ids.get(style)
+        if style_id is None:
+            style_id = self._ids[style] = len(self.styles)
+            self.styles.append(style)
+        return style_id
+
+    def cell_id(self, cell):
+        """Return the style id of an openpyxl cell."""
+        # Read-only cells carry their xf index; empty cells have none
+        format_id = getattr(cell, '_style_id', None)
+        if format_id is None:
+            format_id = getattr(cell, 'style_id', DEFAULT_STYLE_ID)
+        style_id = self._by_format.get(format_id)
+        if style_id is None:
+            style_id = self._by_format[format_id] = self.intern(cell_style(cell)) if format_id else DEFAULT_STYLE_ID
+        return style_id
+
+    def attribute_lookup(self, field):
+        """Return (values, lookup) for a CellStyle field: its distinct values, None first, and
+        a numpy array mapping each style id to the index of its value."""
+        import numpy as np
+
+        cached = self._lookups.get(field)
+        if cached is None or len(cached[1]) != len(self.styles):
+            values = [None]
+            indexes = {None: 0}
+            lookup = np.zeros(len(self.styles), dtype=np.int32)
+            for style_id, style in enumerate(self.styles):
+                value = getattr(style, field)
+                if value not in indexes:
+                    indexes[value] = len(values)
+                    values.append(value)
+                lookup[style_id] = indexes[value]
+            cached = self._lookups[field] = (values, lookup)
+        return cached
+
+    def color(self, hex_color):
+        """Return the reportlab Color for 'RRGGBB', one shared object per colour."""
+        color = self._colors.get(hex_color)
+        if color is None:
+            from reportlab.lib import colors
+
+            color = self._colors[hex_color] = colors.HexColor('#' + hex_color)
+        return color
+
+    def __getstate__(self):
+        # Colours are rebuilt on demand, so only plain data crosses processes
+        return dict(self.__dict__, _colors={}, _lookups={})
+
+def iter_style_rows(workbook, sheet_name, width, table, cell_range=None):
+    """Yield the style ids of every row below the header, padded or trimmed to `width` columns.
+
+    `workbook` is an open openpyxl workbook (e.g. a pd.ExcelFile's book) or a
+    path or bytes to open read-only. Rows line up with the value rows of both
+    readers, which drop only trailing empty rows; callers stop consuming once
+    the values run out. With a `cell_range` (a selection.CellRange) rows and
+    columns count from its corner.
+    """
+    opened = None
+    if not hasattr(workbook, 'worksheets'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise ImportError(f"Required packages not available: {e}")
+        from .streams import open_workbook
+
+        workbook = opened = load_workbook(open_workbook(workbook), read_only=True, data_only=True)
+    try:
+        first_row, first_col, last_row, _ = cell_range or FULL_SHEET
+        padding = [DEFAULT_STYLE_ID] * width
+        for row in workbook[sheet_name].iter_rows(min_row=first_row + 1, max_row=last_row):
+            ids = [table.cell_id(cell) for cell in row[first_col - 1:first_col - 1 + width]]
+            if len(ids) < width:
+                ids.extend(padding[len(ids):])
+            yield ids
+    finally:
+        if opened is not None:
+            opened.close()
+
+def read_style_grid(rows, row_count, width):
+    """Return the next `row_count` rows of an iter_style_rows() iterator as a numpy id grid."""
+    import numpy as np
+    from itertools import islice
+
+    grid = np.zeros((row_count, width), dtype=np.int32)
+    for index, ids in enumerate(islice(rows, row_count)):
+        grid[index] = ids
+    return grid
+
+def style_regions(grid):
+    """Return (row0, col0, row1, col1, style_id) rectangles, inclusive, covering every non-default cell.
+
+    Runs of identical rows are collapsed first, each distinct row is split
+    into runs of one style, and runs spanning the same columns in consecutive
+    bands are merged into one rectangle.
+    """
+    import numpy as np
+
+    grid = np.asarray(grid)
+    if grid.size == 0 or not grid.any():
+        return []
+
+    row_count, width = grid.shape
+    band_starts = np.flatnonzero(np.concatenate(([True], (grid[1:] != grid[:-1]).any(axis=1))))
+    band_ends = np.append(band_starts[1:], row_count) - 1
+
+    regions = []
+    open_runs = {}  # (col0, col1, style_id) -> [row0, row1] of rectangles reaching the previous band
+    for start, end in zip(band_starts.tolist(), band_ends.tolist()):
+        row = grid[start]
+        edges = np.flatnonzero(row[1:] != row[:-1]) + 1
+        run_starts = np.concatenate(([0], edges)).tolist()
+        run_ends = (np.append(edges, width) - 1).tolist()
+        current = {}
+        for col0, col1, style_id in zip(run_starts, run_ends, row[run_starts].tolist()):
+            if style_id == DEFAULT_STYLE_ID:
+                continue
+            key = (col0, col1, style_id)
+            rows = open_runs.pop(key, None)
+            if rows is None:
+                rows = [start, end]
+            else:
+                rows[1] = end
+            current[key] = rows
+        regions.extend((rows[0], col0, rows[1], col1, style_id) for (col0, col1, style_id), rows in open_runs.items())
+        open_runs = current
+    regions.extend((rows[0], col0, rows[1], col1, style_id) for (col0, col1, style_id), rows in open_runs.items())
+    return regions
+
+def table_style_commands(grid, table, row_offset=1):
+    """Return TableStyle commands applying the styles in `grid`, whose first row is table row `row_offset`.
+
+    Each attribute is run-length encoded on its own grid, so one command covers
+    every rectangle of cells sharing that attribute's value.
+    """
+    import numpy as np
+
+    grid = np.asarray(grid)
+    commands = []
+    for field, command in STYLE_COMMANDS:
+        values, lookup = table.attribute_lookup(field)
+        if len(values) == 1:
+            continue
+        for row0, col0, row1, col1, index in style_regions(lookup[grid]):
+            value = values[index]
+            if field.endswith('_color'):
+                value = table.color(value)
+            commands.append((command, (col0, row0 + row_offset), (col1, row1 + row_offset), value))
+    return commands
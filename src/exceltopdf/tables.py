@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Sheets as reportlab tables that are laid out one page at a time.
+
+Reportlab re-measures a Table every time it splits it across a page, so one
+Table per sheet costs quadratic time in the row count. A SheetTable instead
+holds a sheet's row blocks and, each time the document splits it at a page
+end, builds a Table of just the rows that fit there from their planned row
+heights. The header therefore starts every page and appears nowhere else,
+and the zebra stripes run on across pages and row blocks.
+"""
+from collections import deque
+
+from reportlab.platypus import Table, TableStyle
+from reportlab.platypus.flowables import Flowable
+
+from .instrument import count, span
+from .layout import header_row_height
+from .styles import table_style_commands
+
+_FUZZ = 1e-6  # reportlab's tolerance when fitting a flowable into a frame
+
+def body_style_commands(commands):
+    """Return table style commands for a table that has no header row.
+
+    Header-only commands are dropped and the others move up a row.
+    """
+    body = []
+    for command in commands:
+        name, (col0, row0), (col1, row1) = command[:3]
+        if row1 == 0:
+            continue
+        body.append((name, (col0, max(row0 - 1, 0)), (col1, row1 - 1 if row1 > 0 else row1)) + tuple(command[3:]))
+    return body
+
+class SheetTable(Flowable):
+    """The rows of one sheet, handed to the document as page-sized tables.
+
+    `blocks` yields the (header, rows, col_widths, row_heights, styles)
+    blocks of the sheet (see cli._iter_sheet_blocks) and is read one block at
+    a time as pages fill. `table_style` styles the header and body rows and
+    `body_style` the tables without a header. A page that holds more than
+    `chunk_rows` rows is laid out as several tables, and only the first of
+    them has the header.
+    """
+
+    def __init__(self, blocks, table_style, body_style, chunk_rows):
+        super().__init__()
+        if chunk_rows < 1:
+            raise ValueError("Table chunk size must be at least 1 row")
+        self._blocks = iter(blocks)
+        self._segments = deque()  # [rows, row_heights, styles, first pending row] of blocks read so far
+        self._row = 0  # sheet row index of the first pending row, for the stripes
+        self.table_style = table_style
+        self.body_style = body_style
+        self.chunk_rows = chunk_rows
+        self.header = self.col_widths = None
+        self._read_block()
+        self.header_height = header_row_height(self.header)
+        self._stripes = next((command[3] for command in table_style.getCommands()
+                              if command[0] == 'ROWBACKGROUNDS'), None)
+
+    def _read_block(self):
+        """Queue the rows of the next block; returns False when the sheet has no more blocks."""
+        for header, rows, col_widths, row_heights, styles in self._blocks:
+            self.header, self.col_widths = header, col_widths
+            if len(rows):
+                self._segments.append([rows, row_heights, styles, 0])
+                return True
+        self._blocks = iter(())
+        return False
+
+    def wrap(self, availWidth, availHeight):
+        # Never fits as a whole: the document calls split() with the space left on the page
+        self.width = sum(self.col_widths)
+        self.height = availHeight + 1
+        return self.width, self.height
+
+    def _fill(self, space):
+        """Take the rows that fit in `space` points: returns their (segment, start, stop) runs and whether rows remain."""
+        runs = []
+        while self._segments or self._read_block():
+            segment = self._segments[0]
+            rows, row_heights, _, start = segment
+            stop = start
+            while stop < len(rows) and row_heights[stop] <= space + _FUZZ:
+                space -= float(row_heights[stop])
+                stop += 1
+            if stop > start:
+                runs.append((segment, start, stop))
+                segment[3] = stop
+            if stop < len(rows):
+                return runs, True
+            self._segments.popleft()
+        return runs, False
+
+    def split(self, availWidth, availHeight):
+        if availHeight < self.header_height - _FUZZ:
+            return []
+        runs, more = self._fill(availHeight - self.header_height)
+        if not runs and more:
+            return []  # not even one row fits below the header: start a new page
+        self.__dict__.pop('_postponed', None)  # set by the document when an earlier page had no room
+
+        pieces = _chunk_runs(runs, self.chunk_rows) or [[]]
+        tables = [self._table(piece, header=index == 0) for index, piece in enumerate(pieces)]
+        return tables + [self] if more else tables
+
+    def _table(self, piece, header):
+        """Build the Table of one piece's runs of rows, with the header row first if `header` is set."""
+        with span("tables"):
+            offset = 1 if header else 0
+            data = [self.header] if header else []
+            heights = [self.header_height] if header else []
+            commands = []
+            for (rows, row_heights, styles, _), start, stop in piece:
+                if styles is not None:
+                    commands += table_style_commands(styles.grid[start:stop], styles.table, len(data))
+                data.extend(rows[start:stop])
+                heights.extend(float(height) for height in row_heights[start:stop])
+            if self._stripes and self._row % 2:
+                commands.insert(0, ('ROWBACKGROUNDS', (0, offset), (-1, -1), self._stripes[1:] + self._stripes[:1]))
+            self._row += len(data) - offset
+            table = Table(data, colWidths=self.col_widths, rowHeights=heights, repeatRows=offset)
+            table.setStyle(self.table_style if header else self.body_style)
+            if commands:
+                table.setStyle(TableStyle(commands))
+        count("tables")
+        return table
+
+def _chunk_runs(runs, chunk_rows):
+    """Group (segment, start, stop) runs into pieces of at most `chunk_rows` rows in all."""
+    pieces, piece, size = [], [], 0
+    for segment, start, stop in runs:
+        while start < stop:
+            take = min(stop - start, chunk_rows - size)
+            piece.append((segment, start, start + take))
+            start += take
+            size += take
+            if size == chunk_rows:
+                pieces.append(piece)
+                piece, size = [], 0
+    if piece:
+        pieces.append(piece)
+    return pieces
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Watch a folder and reconvert its workbooks shortly after they are saved.
+
+Changes are picked up with inotify on Linux and by polling file sizes and
+modification times elsewhere (or on network shares, where inotify sees no
+remote writes). A workbook is converted once it has been quiet for the
+debounce interval, so the several writes of one save become one conversion,
+and only when the hash of its content differs from the last converted
+version. Conversions run on a bounded pool of worker processes and each one
+reports its latency from the save to the finished PDF.
+"""
+import hashlib
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+from .batch import _is_workbook, convert_one
+
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify(7) constants
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_Q_OVERFLOW = 0x4000
+_EVENT_HEADER = struct.Struct("iIII")
+
+def content_digest(path):
+    """Return the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class InotifyEvents:
+    """Names of the files written or moved into a directory, read from inotify (Linux only)."""
+
+    name = "inotify"
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"Cannot watch {directory}")
+        self.directory = Path(directory)
+
+    def wait(self, timeout):
+        """Return the paths changed within `timeout` seconds (None on a queue overflow: rescan everything)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self._fd, 64 * 1024)
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                paths.add(self.directory / os.fsdecode(name))
+        return paths
+
+    def close(self):
+        os.close(self._fd)
+
+class PollingEvents:
+    """Names of the files whose size or modification time changed since the previous poll."""
+
+    name = "polling"
+
+    def __init__(self, directory, interval=DEFAULT_POLL_INTERVAL):
+        self.directory = Path(directory)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    pass  # removed while scanning
+        return snapshot
+
+    def wait(self, timeout):
+        """Sleep up to `timeout` seconds (at most one poll interval) and return the changed paths."""
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        snapshot = self._scan()
+        changed = {Path(path) for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+def open_events(directory, polling=False, poll_interval=DEFAULT_POLL_INTERVAL):
+    """Return an inotify event source for `directory`, or a polling one if inotify is unavailable or `polling` is set."""
+    if not polling:
+        try:
+            return InotifyEvents(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingEvents(directory, poll_interval)
+
+class Debouncer:
+    """Paths that become due once no change has been seen for `delay` seconds."""
+
+    def __init__(self, delay=DEFAULT_DEBOUNCE):
+        self.delay = delay
+        self._last_change = {}
+
+    def __len__(self):
+        return len(self._last_change)
+
+    def touch(self, path, now):
+        self._last_change[path] = now
+
+    def due(self, now):
+        """Remove and return the paths that have been quiet for the delay."""
+        ready = [path for path, changed in self._last_change.items() if now - changed >= self.delay]
+        for path in ready:
+            del self._last_change[path]
+        return sorted(ready)
+
+    def timeout(self, now):
+        """Return the seconds until the next path is due, or None if none is pending."""
+        if not self._last_change:
+            return None
+        return max(0.0, min(self._last_change.values()) + self.delay - now)
+
+class WorkbookWatcher:
+    """Reconverts the workbooks of `directory` into `output_dir` (the same directory by default) as they change.
+
+    `method`, `options` and `cache` are those of batch.convert_one(). Up to
+    `workers` conversions run at once in worker processes (in this process
+    with one worker); a workbook saved again while it converts is queued once
+    more and converted after. `on_result` receives each convert_one() result,
+    extended with 'latency', the seconds from the save to the finished PDF,
+    and 'skipped' results for saves that left the content unchanged.
+    """
+
+    def __init__(self, directory, method, options, output_dir=None, workers=1, debounce=DEFAULT_DEBOUNCE, cache=None, on_result=None, events=None):
+        self.directory = Path(directory)
+        self.output_dir = Path(output_dir) if output_dir is not None else self.directory
+        self.method = method
+        self.options = options
+        self.workers = workers
+        self.cache = cache
+        self.on_result = on_result
+        self.events = events if events is not None else open_events(self.directory)
+        self.debouncer = Debouncer(debounce)
+        self.digests = {}  # path -> content digest of the last converted (or already current) version
+        self._running = {}  # future -> (path, digest, saved_at)
+        self._waiting = []  # settled paths waiting for a free worker or for their running conversion
+        self._executor = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def output_path(self, path):
+        return self.output_dir / f"{path.stem}.pdf"
+
+    def _workbooks(self):
+        return sorted(path for path in self.directory.iterdir() if path.is_file() and _is_workbook(path))
+
+    def start(self):
+        """Queue the workbooks whose PDF is missing or older than the workbook; remember the others as current."""
+        now = time.monotonic()
+        for path in self._workbooks():
+            try:
+                pdf_stat = self.output_path(path).stat()
+                if pdf_stat.st_mtime >= path.stat().st_mtime:
+                    self.digests[path] = content_digest(path)
+                    continue
+            except OSError:
+                pass
+            self.debouncer.touch(path, now - self.debouncer.delay)
+
+    def _submit(self, path):
+        """Convert `path` if its content changed since the last conversion; returns False if it was skipped."""
+        try:
+            saved_at = path.stat().st_mtime
+            digest = content_digest(path)
+        except OSError:
+            return False  # removed or renamed away before it settled
+        if self.digests.get(path) == digest:
+            if self.on_result:
+                self.on_result({'input': str(path), 'output': str(self.output_path(path)), 'ok': True,
+                                'skipped': True, 'error': None, 'seconds': 0.0, 'cache': None, 'latency': 0.0})
+            return False
+        arguments = (path, self.output_path(path), self.method, self.options, self.cache)
+        if self._executor is None:
+            self._finish(path, digest, saved_at, convert_one(*arguments))
+        else:
+            self._running[self._executor.submit(convert_one, *arguments)] = (path, digest, saved_at)
+        return True
+
+    def _finish(self, path, digest, saved_at, result):
+        if result['ok']:
+            self.digests[path] = digest
+        result['latency'] = max(0.0, time.time() - saved_at)
+        if self.on_result:
+            self.on_result(result)
+
+    def _collect(self):
+        for future in [future for future in self._running if future.done()]:
+            path, digest, saved_at = self._running.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed or out of memory)
+                result = {'input': str(path), 'output': str(self.output_path(path)), 'ok': False,
+                          'error': f"{type(e).__name__}: {e}", 'seconds': 0.0, 'cache': None}
+            self._finish(path, digest, saved_at, result)
+
+    def pending(self):
+        """Return the number of workbooks changed but not yet converted, running conversions included."""
+        return len(self.debouncer) + len(self._waiting) + len(self._running)
+
+    def step(self, max_wait=DEFAULT_POLL_INTERVAL):
+        """Wait for changes up to `max_wait` seconds, then start the conversions that are due."""
+        timeout = self.debouncer.timeout(time.monotonic())
+        timeout = max_wait if timeout is None else min(timeout, max_wait)
+        if self._running:
+            timeout = min(timeout, 0.1)  # collect finished conversions promptly
+        changed = self.events.wait(timeout)
+        now = time.monotonic()
+        if changed is None:
+            changed = set(self._workbooks())
+        for path in changed:
+            if _is_workbook(path):
+                self.debouncer.touch(path, now)
+
+        self._collect()
+        for path in self.debouncer.due(now):
+            if path not in self._waiting:
+                self._waiting.append(path)
+        # A workbook saved again while converting waits for that conversion to finish
+        waiting, self._waiting = self._waiting, []
+        for path in waiting:
+            busy = any(running == path for running, _, _ in self._running.values())
+            if busy or (self._executor is not None and len(self._running) >= self.workers):
+                self._waiting.append(path)
+            else:
+                self._submit(path)
+
+    def run(self, should_stop=lambda: False):
+        """Watch until `should_stop()` returns True (or KeyboardInterrupt), then finish running conversions."""
+        self.start()
+        try:
+            while not should_stop():
+                self.step()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._collect()
+        self.events.close()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""In-process stand-in for the Excel COM object model used by convert_with_win32com.
+
+Every public attribute read, write and method lookup on a fake object counts as
+one cross-process COM call in `FakeExcel.com_calls`, so tests and benchmarks
+can check how chatty the win32com engine is without Office installed.
+"""
+import re
+import threading
+import time
+
+_CELL_AREA = re.compile(r"^([A-Z]+)(\d+):([A-Z]+)(\d+)$")
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index
+
+
+class FakeComObject:
+    """Base class that counts public attribute access as COM calls."""
+
+    def __init__(self, excel):
+        object.__setattr__(self, "_excel", excel)
+
+    def __getattribute__(self, name):
+        if not name.startswith("_"):
+            excel = object.__getattribute__(self, "_excel")
+            excel._check_alive()
+            excel.com_calls += 1
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._excel._check_alive()
+            self._excel.com_calls += 1
+        object.__setattr__(self, name, value)
+
+
+class FakeFont(FakeComObject):
+    def __init__(self, excel):
+        super().__init__(excel)
+        object.__setattr__(self, "Size", 11)
+
+
+class FakeRange(FakeComObject):
+    """A rectangular range; `values` holds its cells as nested tuples."""
+
+    def __init__(self, excel, values=(), row=1, column=1, address=None):
+        super().__init__(excel)
+        for name, value in (
+            ("WrapText", False), ("HorizontalAlignment", 1), ("VerticalAlignment", 1),
+            ("Font", FakeFont(excel)), ("ColumnWidth", 8.43), ("RowHeight", 15),
+            ("Row", row), ("Column", column), ("Address", address),
+        ):
+            object.__setattr__(self, name, value)
+        self._values = tuple(tuple(r) for r in values)
+
+    @property
+    def Value(self):
+        # Like Excel: one cell comes back as a scalar, several as nested tuples
+        if len(self._values) == 1 and len(self._values[0]) == 1:
+            return self._values[0][0]
+        return self._values or None
+
+    @property
+    def Rows(self):
+        return FakeLines(self._excel, len(self._values))
+
+    @property
+    def Columns(self):
+        return FakeLines(self._excel, max((len(r) for r in self._values), default=0))
+
+
+class FakeLines(FakeComObject):
+    """The Rows or Columns collection of a range."""
+
+    def __init__(self, excel, count):
+        super().__init__(excel)
+        object.__setattr__(self, "Count", count)
+
+    def AutoFit(self):
+        return True
+
+
+class FakePageSetup(FakeComObject):
+    def __init__(self, excel):
+        super().__init__(excel)
+        object.__setattr__(self, "PrintArea", "")
+
+
+class FakeWorksheet(FakeComObject):
+    """A worksheet whose used range holds `values`; ranges from Range() are kept in `_ranges`.
+
+    Cell areas such as "B2:D40" hold the used values inside them.
+    """
+
+    def __init__(self, excel, name, values):
+        super().__init__(excel)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "Visible", -1)
+        object.__setattr__(self, "UsedRange", FakeRange(excel, values))
+        object.__setattr__(self, "PageSetup", FakePageSetup(excel))
+        self._ranges = []
+
+    def Activate(self):
+        self._excel.active_sheet = self.Name
+
+    def Range(self, address):
+        area = _CELL_AREA.match(address)
+        if area:
+            first_col, first_row, last_col, last_row = area.groups()
+            first_row, first_col = int(first_row), _column_index(first_col)
+            rows = object.__getattribute__(self, "UsedRange")._values[first_row - 1:int(last_row)]
+            values = [row[first_col - 1:_column_index(last_col)] for row in rows]
+            sheet_range = FakeRange(self._excel, values, row=first_row, column=first_col, address=address)
+        else:
+            sheet_range = FakeRange(self._excel, address=address)
+        self._ranges.append(sheet_range)
+        return sheet_range
+
+    def ExportAsFixedFormat(self, file_type, path, **kwargs):
+        self._excel._export(path, self.Name)
+
+
+class FakeSheets(FakeComObject):
+    """The Worksheets collection: iterable, sized and callable with a 1-based index."""
+
+    def __init__(self, excel, sheets):
+        super().__init__(excel)
+        self._sheets = sheets
+
+    def __len__(self):
+        return len(self._sheets)
+
+    def __iter__(self):
+        self._excel.com_calls += 1
+        return iter(self._sheets)
+
+    def __call__(self, index):
+        self._excel.com_calls += 1
+        return self._sheets[index - 1]
+
+
+class FakeWorkbook(FakeComObject):
+    def __init__(self, excel, path, sheets):
+        super().__init__(excel)
+        object.__setattr__(self, "FullName", str(path))
+        object.__setattr__(self, "Worksheets", FakeSheets(excel, [
+            FakeWorksheet(excel, name, values) for name, values in sheets.items()
+        ]))
+
+    def ExportAsFixedFormat(self, file_type, path, **kwargs):
+        # Like Excel, hidden sheets are left out of a workbook export
+        sheets = self.Worksheets._sheets
+        visible = [sheet.Name for sheet in sheets if object.__getattribute__(sheet, "Visible")]
+        self._excel._export(path, "workbook" if len(visible) == len(sheets) else f"workbook: {', '.join(visible)}")
+
+    def Close(self, SaveChanges=None):
+        self._excel.Workbooks._open.remove(self)
+
+
+class FakeWorkbooks(FakeComObject):
+    def __init__(self, excel):
+        super().__init__(excel)
+        self._open = []
+
+    @property
+    def Count(self):
+        return len(self._open)
+
+    def Open(self, path):
+        if self._excel.fail_on_open:
+            raise OSError(f"Excel could not open {path}")
+        workbook = FakeWorkbook(self._excel, path, self._excel.sheets)
+        self._open.append(workbook)
+        return workbook
+
+
+def make_values(rows, columns):
+    """Build a grid of cell values with a header row and varying text lengths."""
+    header = tuple(f"Column {c + 1}" for c in range(columns))
+    body = [
+        tuple(r * 1.5 if c == 0 else f"r{r}c{c} " + "x" * ((r * 7 + c) % 60) for c in range(columns))
+        for r in range(rows - 1)
+    ]
+    return (header, *body)
+
+
+class FakeExcel:
+    """Fake Excel.Application.
+
+    Every workbook opened holds `sheets`, a mapping of sheet names to value
+    grids (one 10 x 5 sheet by default). `startup_seconds` and
+    `export_seconds` simulate the cost of launching Excel and of exporting a
+    workbook. After Quit() (or `crash()`) every call raises, like a COM server
+    that has gone away.
+    """
+
+    instances = 0
+
+    def __init__(self, sheets=None, startup_seconds=0.0, export_seconds=0.0):
+        time.sleep(startup_seconds)
+        FakeExcel.instances += 1
+        self.com_calls = 0
+        self.sheets = sheets if sheets is not None else {"Sheet1": make_values(10, 5)}
+        self.export_seconds = export_seconds
+        self.fail_on_open = False
+        self.quit_called = False
+        self.thread = threading.get_ident()
+        self.quit_thread = None
+        self.alive = True
+        self.active_sheet = None
+        self.exports = []
+        self.Visible = False
+        self.DisplayAlerts = False
+        self.PrintCommunication = True
+        self.Workbooks = FakeWorkbooks(self)
+
+    def _check_alive(self):
+        if not self.alive:
+            raise OSError("The RPC server is unavailable.")
+
+    def _export(self, path, what):
+        time.sleep(self.export_seconds)
+        self.exports.append(what)
+        with open(path, "wb") as handle:
+            handle.write(b"%PDF-1.4\n%fake export\n%%EOF\n")
+
+    def crash(self):
+        self.alive = False
+
+    def Quit(self):
+        self.quit_called = True
+        self.quit_thread = threading.get_ident()
+        self.alive = False
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Tests for the asyncio conversion API."""
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("pandas")
+pytest.importorskip("reportlab")
+pytest.importorskip("openpyxl")
+
+from exceltopdf import cli
+from exceltopdf.aio import AsyncConverter, convert_many_async
+from exceltopdf.instrument import count
+
+if "fork" not in multiprocessing.get_all_start_methods():
+    pytest.skip("patched converters reach the workers only with the fork start method", allow_module_level=True)
+
+FORK = multiprocessing.get_context("fork")
+
+
+def _workbook(path):
+    import pandas as pd
+
+    pd.DataFrame({"Name": ["a", "b"], "Value": [1, 2]}).to_excel(path, index=False)
+    return path
+
+
+def test_convert_many_yields_every_result(tmp_path):
+    """Results arrive as dicts like batch mode's, failures included."""
+    book = _workbook(tmp_path / "book.xlsx")
+    planned = [(book, tmp_path / "a.pdf"), (tmp_path / "missing.xlsx", tmp_path / "b.pdf"), (book, tmp_path / "c.pdf")]
+
+    async def collect():
+        return [result async for result in convert_many_async(planned, max_concurrency=2)]
+
+    results = {Path(result['output']).name: result for result in asyncio.run(collect())}
+
+    assert results["a.pdf"]['ok'] and results["c.pdf"]['ok']
+    assert not results["b.pdf"]['ok'] and "FileNotFoundError" in results["b.pdf"]['error']
+    assert (tmp_path / "c.pdf").read_bytes().startswith(b"%PDF")
+
+
+def test_concurrency_is_bounded(tmp_path, monkeypatch):
+    """No more than max_concurrency jobs run at once, however many are awaited."""
+    running = tmp_path / "running"
+    running.mkdir()
+
+    def slow_convert(input_path, output_path, method, options, cache=None):
+        marker = running / f"{os.getpid()}-{Path(output_path).stem}"
+        marker.touch()
+        Path(output_path).write_text(str(len(list(running.iterdir()))))
+        time.sleep(0.3)
+        marker.unlink()
+
+    monkeypatch.setattr(cli, "convert_cached", slow_convert)
+    book = tmp_path / "book.xlsx"
+    book.touch()
+
+    async def run():
+        async with AsyncConverter(max_concurrency=2, mp_context=FORK) as converter:
+            await asyncio.gather(*(converter.convert(book, tmp_path / f"{i}.pdf") for i in range(5)))
+
+    asyncio.run(run())
+    assert max(int((tmp_path / f"{i}.pdf").read_text()) for i in range(5)) <= 2
+
+
+def test_converter_serves_successive_event_loops(tmp_path, monkeypatch):
+    """A converter made outside any loop keeps working across asyncio.run() calls."""
+    def quick_convert(input_path, output_path, method, options, cache=None):
+        Path(output_path).write_text("done")
+
+    monkeypatch.setattr(cli, "convert_cached", quick_convert)
+    book = tmp_path / "book.xlsx"
+    book.touch()
+    converter = AsyncConverter(max_concurrency=1, mp_context=FORK)
+
+    async def run(prefix):
+        # Two jobs on one slot, so the second waits on the loop's semaphore
+        await asyncio.gather(*(converter.convert(book, tmp_path / f"{prefix}{i}.pdf") for i in range(2)))
+
+    try:
+        asyncio.run(run("a"))
+        asyncio.run(run("b"))
+    finally:
+        asyncio.run(converter.close())
+    assert sorted(path.name for path in tmp_path.glob("*.pdf")) == ["a0.pdf", "a1.pdf", "b0.pdf", "b1.pdf"]
+
+
+def test_cancellation_stops_running_job(tmp_path, monkeypatch):
+    """Cancelling the awaiting task stops the worker at its next checkpoint."""
+    started = tmp_path / "started"
+
+    def endless_convert(input_path, output_path, method, options, cache=None):
+        Path(output_path).write_bytes(b"%PDF partial")
+        started.touch()
+        while True:
+            count("rows", 100)
+            time.sleep(0.01)
+
+    monkeypatch.setattr(cli, "convert_cached", endless_convert)
+    book = tmp_path / "book.xlsx"
+    book.touch()
+
+    async def run():
+        async with AsyncConverter(max_concurrency=1, mp_context=FORK) as converter:
+            task = asyncio.ensure_future(converter.convert(book, tmp_path / "out.pdf"))
+            while not started.exists():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # The single slot and its worker are free again straight away
+            with pytest.raises(FileNotFoundError):
+                await asyncio.wait_for(converter.convert(tmp_path / "missing.xlsx", tmp_path / "next.pdf"), timeout=10)
+
+    asyncio.run(run())
+    assert not (tmp_path / "out.pdf").exists()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for batch conversion mode."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf.batch import expand_inputs, format_summary, is_batch_input, plan_outputs, run_batch
+
+
+def _write_workbook(path, rows=(("a", "b"), (1, 2))):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(list(row))
+    wb.save(path)
+    return path
+
+
+def test_expand_directory_skips_lock_and_other_files(tmp_path):
+    """Only Excel files are picked up and Excel ~$ lock files are ignored."""
+    for name in ["b.xlsx", "a.xls", "~$b.xlsx", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"")
+
+    assert is_batch_input(tmp_path)
+    assert expand_inputs(tmp_path) == [tmp_path / "a.xls", tmp_path / "b.xlsx"]
+
+
+def test_expand_glob_and_manifest(tmp_path):
+    """Glob patterns and @manifest files expand to workbook paths."""
+    (tmp_path / "sub").mkdir()
+    for name in ["one.xlsx", "sub/two.xlsx"]:
+        (tmp_path / name).write_bytes(b"")
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("# nightly\none.xlsx\n\n/abs/missing.xlsx\n")
+
+    assert expand_inputs(str(tmp_path / "**" / "*.xlsx")) == [tmp_path / "one.xlsx", tmp_path / "sub" / "two.xlsx"]
+    assert expand_inputs(f"@{manifest}") == [tmp_path / "one.xlsx", Path("/abs/missing.xlsx")]
+    assert not is_batch_input(tmp_path / "one.xlsx")
+
+
+def test_existing_files_with_glob_characters_are_single_workbooks(tmp_path):
+    """A workbook whose name contains [ ] or ? is converted on its own, not globbed."""
+    for name in ["Q1 [final].xlsx", "report?.xlsx"]:
+        (tmp_path / name).write_bytes(b"")
+        assert not is_batch_input(tmp_path / name)
+    assert is_batch_input(str(tmp_path / "Q2 [draft].xlsx"))  # no such file: a pattern
+
+
+def test_plan_outputs_avoids_name_clashes(tmp_path):
+    """Workbooks with the same stem get distinct PDF names."""
+    planned = plan_outputs([Path("x/report.xlsx"), Path("y/report.xlsx")], tmp_path)
+    assert [out.name for _, out in planned] == ["report.pdf", "report_1.pdf"]
+
+
+def test_run_batch_reports_failures_in_input_order(tmp_path):
+    """Results keep input order and failures do not stop the other workbooks."""
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    good = _write_workbook(tmp_path / "good.xlsx")
+    missing = tmp_path / "missing.xlsx"
+    planned = plan_outputs([good, missing], tmp_path / "out")
+
+    results = run_batch(planned, "pandas", {}, jobs=2)
+
+    assert [r['ok'] for r in results] == [True, False]
+    assert (tmp_path / "out" / "good.pdf").exists()
+    assert "missing.xlsx" in results[1]['error']
+    assert format_summary(results)[-1] == "Converted 1 of 2 workbooks (1 failed)"
+
+
+def test_cli_batch_mode_exit_code(tmp_path, monkeypatch):
+    """The CLI exits non-zero when any workbook in the batch fails."""
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    from exceltopdf.cli import main
+
+    _write_workbook(tmp_path / "good.xlsx")
+    (tmp_path / "broken.xlsx").write_bytes(b"not a workbook")
+    monkeypatch.setattr(sys, "argv", ["exceltopdf", str(tmp_path), str(tmp_path / "out"), "--jobs", "1", "--no-cache"])
+
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
+    assert (tmp_path / "out" / "good.pdf").exists()
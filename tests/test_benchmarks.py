@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for the benchmark workbook generator and result comparison."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src and the repository root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from benchmarks.compare import compare
+from benchmarks.run import expand_matrix
+from benchmarks.workbooks import column_kinds, generate_workbook
+
+
+def test_column_kinds_follow_ratios():
+    """Number, date and text columns appear in the requested proportions."""
+    kinds = column_kinds(10, numeric_ratio=0.4, date_ratio=0.2)
+    assert (kinds.count("number"), kinds.count("date"), kinds.count("text")) == (4, 2, 4)
+    assert column_kinds(1) == ["text"]
+
+
+def test_generate_workbook_shape(tmp_path):
+    """Generated workbooks have the requested sheets, rows, columns and multiline cells."""
+    path = generate_workbook(tmp_path / "book.xlsx", rows=50, columns=5, sheets=2,
+                             text_length=30, multiline_density=1.0)
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    assert wb.sheetnames == ["Sheet 1", "Sheet 2"]
+    rows = list(wb["Sheet 2"].iter_rows(values_only=True))
+    assert len(rows) == 51 and all(len(row) == 5 for row in rows)
+    text_cells = [value for value in rows[1] if isinstance(value, str)]
+    assert text_cells and all("\n" in value for value in text_cells)
+    wb.close()
+
+    # Seeded generation makes runs comparable
+    again = generate_workbook(tmp_path / "again.xlsx", rows=50, columns=5, sheets=2,
+                              text_length=30, multiline_density=1.0)
+    first = openpyxl.load_workbook(path, read_only=True)
+    second = openpyxl.load_workbook(again, read_only=True)
+    assert list(first["Sheet 1"].values) == list(second["Sheet 1"].values)
+
+
+def test_matrix_and_compare():
+    """The matrix is the product of its dimensions and compare pairs up matching cases."""
+    shapes = expand_matrix([10, 20], [3], [1, 2], [5], [0.0], 0.4, 0.2)
+    assert len(shapes) == 4
+
+    case = dict(shapes[0], auto_adjust=True, aggressive_adjust=False)
+    before = {"results": [{"case": case, "seconds": 2.0, "peak_rss_mb": 100.0, "output_bytes": 10}]}
+    after = {"results": [{"case": case, "seconds": 1.0, "peak_rss_mb": 100.0, "output_bytes": 10}]}
+    rows = compare(before, after)
+    assert [(metric, ratio) for _, metric, _, _, ratio in rows] == [
+        ("seconds", 0.5), ("peak_rss_mb", 1.0), ("output_bytes", 1.0),
+    ]
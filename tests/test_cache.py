@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Tests for the content-addressed PDF output cache."""
+import hashlib
+import os
+import stat
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf.cache import MARKER_BYTES, OutputCache, detach_output
+
+
+def test_key_changes_with_bytes_and_options(tmp_path):
+    """The key covers both the workbook contents and the conversion options."""
+    book = tmp_path / "book.xlsx"
+    book.write_bytes(b"first")
+    cache = OutputCache(tmp_path / "cache")
+
+    key = cache.key(book, {"all_sheets": False})
+    assert key == cache.key(book, {"all_sheets": False})
+    assert key != cache.key(book, {"all_sheets": True})
+
+    book.write_bytes(b"second")
+    assert key != cache.key(book, {"all_sheets": False})
+
+
+def test_store_then_fetch_copies_read_only_entry(tmp_path):
+    """A stored PDF comes back at the new output path as a writable copy and is read-only in the cache."""
+    cache = OutputCache(tmp_path / "cache")
+    pdf = tmp_path / "made.pdf"
+    pdf.write_bytes(b"%PDF-1.4 cached")
+
+    assert not cache.fetch("ab" * 32, tmp_path / "out.pdf")
+    cache.store("ab" * 32, pdf)
+    entry = next((tmp_path / "cache").glob("*/*.pdf"))
+    assert not entry.stat().st_mode & stat.S_IWUSR
+
+    assert cache.fetch("ab" * 32, tmp_path / "out.pdf")
+    assert (tmp_path / "out.pdf").read_bytes() == b"%PDF-1.4 cached"
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (tmp_path / "out.pdf").stat().st_nlink == 1
+    assert (tmp_path / "out.pdf").stat().st_mode & stat.S_IWUSR
+
+    # Detaching the output before a rewrite leaves the cache entry untouched
+    detach_output(tmp_path / "out.pdf")
+    assert entry.read_bytes() == b"%PDF-1.4 cached"
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    """Entries beyond max_bytes are evicted oldest access first."""
+    cache = OutputCache(tmp_path / "cache", max_bytes=25)
+    pdf = tmp_path / "made.pdf"
+    pdf.write_bytes(b"x" * 10)
+
+    for index, key in enumerate(["aa" * 32, "bb" * 32]):
+        cache.store(key, pdf)
+        os.utime(cache._entry(key), (1000 + index, 1000 + index))
+    # Touch the older entry so the other one becomes least recently used
+    assert cache.fetch("aa" * 32, tmp_path / "out.pdf")
+    cache.store("cc" * 32, pdf)
+
+    assert cache._entry("aa" * 32).exists()
+    assert not cache._entry("bb" * 32).exists()
+    assert cache._entry("cc" * 32).exists()
+
+
+def test_seen_markers_count_towards_the_size_limit(tmp_path):
+    """Markers are charged a disk block each and evicted least recently used first."""
+    cache = OutputCache(tmp_path / "cache", max_bytes=3 * MARKER_BYTES)
+    names = [f"book{index}.xlsx" for index in range(4)]
+    for index, name in enumerate(names):
+        assert not cache.seen(name)
+        os.utime(cache.cache_dir / "seen" / hashlib.sha256(name.encode("utf-8")).hexdigest(), (1000 + index,) * 2)
+    cache.evict()
+
+    assert len(list((cache.cache_dir / "seen").iterdir())) == 3
+    assert not cache.seen(names[0])
+    assert cache.seen(names[3])
+
+
+def test_fragments_share_the_cache_size_limit(tmp_path):
+    """Whole PDFs and sheet fragments together stay within one max_bytes."""
+    cache = OutputCache(tmp_path / "cache", max_bytes=40)
+    fragments = cache.sheet_cache()
+    pdf = tmp_path / "made.pdf"
+    pdf.write_bytes(b"x" * 10)
+
+    for key in ("aa" * 32, "bb" * 32):
+        fragments.store(key, pdf)
+    for key in ("cc" * 32, "dd" * 32, "ee" * 32, "ff" * 32):
+        cache.store(key, pdf)
+
+    sizes = [path.stat().st_size for path in (tmp_path / "cache").rglob("*.pdf")]
+    assert sum(sizes) <= 40
+    assert fragments.max_bytes == 10
+
+
+def test_cached_conversion_skips_workbook(tmp_path, monkeypatch):
+    """A second conversion of an unchanged workbook is served from the cache."""
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("reportlab")
+    pytest.importorskip("pandas")
+    from exceltopdf import cli
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["id", "name"])
+    wb.active.append([1, "one"])
+    wb.save(tmp_path / "book.xlsx")
+    cache = OutputCache(tmp_path / "cache")
+
+    assert cli.convert_cached(tmp_path / "book.xlsx", tmp_path / "a.pdf", "pandas", {}, cache=cache) == "miss"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook was converted again")
+
+    monkeypatch.setattr(cli, "_open_excel_source", fail)
+    assert cli.convert_cached(tmp_path / "book.xlsx", tmp_path / "b.pdf", "pandas", {"verbose": True}, cache=cache) == "hit"
+    assert (tmp_path / "b.pdf").read_bytes() == (tmp_path / "a.pdf").read_bytes()
+
+
+def test_sheet_fragments_rerender_only_changed_sheets(tmp_path):
+    """Once a workbook is reconverted, a later edit to one sheet renders only that sheet; the output matches a full build."""
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("reportlab")
+    pytest.importorskip("pandas")
+    PyPDF2 = pytest.importorskip("PyPDF2")
+    from exceltopdf import cli
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for s in range(3):
+        ws = wb.create_sheet(f"Tab {s + 1}")
+        ws.append(["id", "label"])
+        for r in range(50):
+            ws.append([r, f"sheet {s + 1} row {r}"])
+    wb.save(tmp_path / "book.xlsx")
+    fragments = OutputCache(tmp_path / "cache").sheet_cache()
+
+    messages = []
+    cli.convert_with_pandas_reportlab(tmp_path / "book.xlsx", tmp_path / "once.pdf", all_sheets=True,
+                                      verbose=True, log=messages.append, fragment_cache=fragments)
+    # A first conversion is not fingerprinted: it renders as one document
+    assert not any("cached sheets" in message for message in messages)
+
+    messages.clear()
+    cli.convert_with_pandas_reportlab(tmp_path / "book.xlsx", tmp_path / "first.pdf", all_sheets=True,
+                                      verbose=True, log=messages.append, fragment_cache=fragments)
+    assert "Reused 0 cached sheets, rendering 3" in messages
+
+    wb["Tab 2"]["B3"] = "edited"
+    wb.save(tmp_path / "book.xlsx")
+    messages.clear()
+    cli.convert_with_pandas_reportlab(tmp_path / "book.xlsx", tmp_path / "second.pdf", all_sheets=True,
+                                      verbose=True, log=messages.append, fragment_cache=fragments)
+    assert "Reused 2 cached sheets, rendering 1" in messages
+    assert "  Rendered sheet 'Tab 2' (1/1)" in messages
+
+    cli.convert_with_pandas_reportlab(tmp_path / "book.xlsx", tmp_path / "full.pdf", all_sheets=True)
+    texts = [[page.extract_text() for page in PyPDF2.PdfReader(str(tmp_path / name)).pages]
+             for name in ("second.pdf", "full.pdf")]
+    assert texts[0] == texts[1]
+    assert any("edited" in text for text in texts[0])
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for the direct-canvas rendering engine."""
+import io
+import re
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("reportlab")
+pytest.importorskip("openpyxl")
+PyPDF2 = pytest.importorskip("PyPDF2")
+
+from exceltopdf.canvas_engine import pdf_string
+from exceltopdf.cli import convert_with_pandas_reportlab
+
+
+def _workbook(path, sheets=1, rows=120):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for s in range(sheets):
+            pd.DataFrame({
+                "Name": [f"item ({i})" if i % 7 else f"item {i}\nsecond line" for i in range(rows)],
+                "Price": [i * 1.5 for i in range(rows)],
+                "Note": ["café" if i % 2 else "" for i in range(rows)],
+            }).to_excel(writer, sheet_name=f"Sheet {s}", index=False)
+    return path
+
+
+def _page_texts(data):
+    return [page.extract_text() for page in PyPDF2.PdfReader(io.BytesIO(data)).pages]
+
+
+_FILLED_RECT = re.compile(r"([\d.]+) ([\d.]+) ([\d.]+) rg\s+(?:n )?([-\d.]+) ([-\d.]+) ([-\d.]+) ([-\d.]+) re")
+
+
+def _first_row_striped(page):
+    """Return True if the first body row below the (dark blue) header has the grey stripe."""
+    rects = [tuple(map(float, match)) for match in _FILLED_RECT.findall(page.get_contents().get_data().decode("latin-1"))]
+    header = next(rect for rect in rects if rect[0] == 0 and rect[2] > 0.5)
+    header_bottom = min(header[4], header[4] + header[6])
+    stripe_tops = [max(rect[4], rect[4] + rect[6]) for rect in rects if abs(rect[0] - 0.827) < 0.01]
+    return abs(max(stripe_tops) - header_bottom) < 0.5
+
+
+@pytest.mark.parametrize("reader", ["pandas", "streaming"])
+def test_canvas_paginates_like_platypus(tmp_path, reader):
+    """Both engines break pages at the same rows and repeat the header on each page."""
+    book = _workbook(tmp_path / "book.xlsx")
+    outputs = {}
+    for engine in ("platypus", "canvas"):
+        output = io.BytesIO()
+        convert_with_pandas_reportlab(book, output, reader=reader, engine=engine)
+        outputs[engine] = _page_texts(output.getvalue())
+
+    canvas_pages = outputs["canvas"]
+    assert len(canvas_pages) == len(outputs["platypus"]) > 1
+    assert all("Name" in text and "Price" in text for text in canvas_pages)
+    assert "item (118)" in canvas_pages[-1]
+    assert "café" in canvas_pages[0]
+
+
+def test_stripes_run_on_across_pages_in_both_engines(tmp_path):
+    """Page 2 continues the stripes of page 1: its first row is grey after an odd number of rows."""
+    names = [f"row {i}" + ("\nmore" if i < 2 else "") for i in range(120)]
+    book = tmp_path / "book.xlsx"
+    pd.DataFrame({"Name": names, "Value": range(120)}).to_excel(book, index=False)
+
+    for engine in ("platypus", "canvas"):
+        output = io.BytesIO()
+        convert_with_pandas_reportlab(book, output, engine=engine)
+        pages = PyPDF2.PdfReader(io.BytesIO(output.getvalue())).pages
+        assert len(re.findall(r"row \d+", pages[0].extract_text())) == 13
+        assert _first_row_striped(pages[1]), engine
+
+
+def test_canvas_starts_each_sheet_on_a_titled_page(tmp_path):
+    book = _workbook(tmp_path / "book.xlsx", sheets=3, rows=5)
+    output = tmp_path / "book.pdf"
+    convert_with_pandas_reportlab(book, output, all_sheets=True, engine="canvas")
+
+    pages = _page_texts(output.read_bytes())
+    assert len(pages) == 3
+    assert [f"Sheet {s}" in text for s, text in enumerate(pages)] == [True] * 3
+
+
+def test_pdf_string_escapes_delimiters_and_encodes_winansi():
+    assert pdf_string("a (b) \\c") == "a \\(b\\) \\\\c"
+    assert pdf_string("café\t€") == "caf\\351\\011\\200"
+
+
+def test_unknown_engine_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown engine"):
+        convert_with_pandas_reportlab(_workbook(tmp_path / "book.xlsx"), io.BytesIO(), engine="svg")
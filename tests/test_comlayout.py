@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the bulk win32com layout pass, run against a fake Excel object."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from exceltopdf import cli
+from exceltopdf.comlayout import (
+    MAX_COLUMN_WIDTH, MIN_COLUMN_WIDTH, MIN_ROW_HEIGHT, column_letter, plan_layout, union_addresses,
+)
+from exceltopdf.pool import ExcelPool
+from fake_excel import FakeExcel, make_values
+
+
+def _convert(tmp_path, sheets, **options):
+    xl = FakeExcel(sheets)
+    pool = ExcelPool(lambda: xl, max_size=1)
+    cli.convert_with_win32com(tmp_path / "book.xlsx", tmp_path / "out.pdf", pool=pool, **options)
+    return xl
+
+
+def test_union_addresses_collapse_runs_and_respect_length_limit():
+    """Consecutive columns or rows become one area and addresses stay under 255 characters."""
+    assert column_letter(1) == "A" and column_letter(28) == "AB" and column_letter(703) == "AAA"
+    assert union_addresses([1, 2, 3, 6], columns=True) == ["A:C,F:F"]
+    assert union_addresses([4, 9, 10], columns=False) == ["4:4,9:10"]
+
+    addresses = union_addresses(range(1, 2000, 2), columns=False)
+    assert len(addresses) > 1
+    assert all(len(address) <= 255 for address in addresses)
+
+
+def test_plan_layout_clamps_and_groups_sizes():
+    """Widths are clamped to 12-50 characters and rows of equal height share a group."""
+    plan = plan_layout((("id", "x" * 80), (1.0, "short"), (2.0, "line one\nline two\nline three")), 11)
+
+    assert plan['columns'] == {MIN_COLUMN_WIDTH: [1], MAX_COLUMN_WIDTH: [2]}
+    assert plan['rows'][MIN_ROW_HEIGHT] == [2]
+    assert sum(len(rows) for rows in plan['rows'].values()) == 3
+    assert plan_layout("only cell", 10)['columns'] == {MIN_COLUMN_WIDTH: [1]}
+
+
+def test_layout_com_calls_stay_far_below_one_per_row(tmp_path):
+    """The aggressive pass reads values once and writes multi-row areas, not single rows."""
+    uniform = {"Data": tuple(("id", "name")) + tuple((i, "same") for i in range(5000))}
+    assert _convert(tmp_path, uniform, aggressive_adjust=True).com_calls < 60
+
+    small = _convert(tmp_path, {"Data": make_values(50, 8)}, aggressive_adjust=True)
+    large = _convert(tmp_path, {"Data": make_values(5000, 8)}, aggressive_adjust=True)
+    assert small.com_calls < 60
+    assert large.com_calls < 5000 / 20
+
+
+def test_only_exported_sheets_are_laid_out(tmp_path):
+    """Without all_sheets only the first sheet is laid out and exported."""
+    sheets = {f"Tab {i}": make_values(20, 4) for i in range(1, 4)}
+    xl = _convert(tmp_path, sheets)
+
+    assert xl.exports == ["Tab 1"]
+    assert xl.Workbooks.Count == 0  # closed without saving before returning to the pool
+
+    all_xl = _convert(tmp_path, sheets, all_sheets=True)
+    assert all_xl.exports == ["workbook"]
+    assert all_xl.com_calls < 3 * xl.com_calls + 10
+
+
+
+def test_most_common_size_is_written_to_the_whole_span():
+    """The dominant row height covers every used row in one write; other heights follow."""
+    from exceltopdf.comlayout import optimize_worksheet_layout
+    from fake_excel import FakeWorksheet
+
+    values = (("id", "name"),) + tuple((i, "x" * 200 if i == 7 else "short") for i in range(30))
+    xl = FakeExcel()
+    worksheet = FakeWorksheet(xl, "Data", values)
+    optimize_worksheet_layout(xl, worksheet, aggressive_adjust=True)
+
+    heights = [(r.Address, r.RowHeight) for r in worksheet._ranges if ":" in r.Address and r.Address[0].isdigit()]
+    assert heights[0] == ("1:31", MIN_ROW_HEIGHT)
+    assert [address for address, _ in heights[1:]] == ["9:9"]
+    assert xl.PrintCommunication is True
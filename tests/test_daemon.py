@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tests for the resident conversion server and the CLI handoff to it."""
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("pandas")
+pytest.importorskip("reportlab")
+pytest.importorskip("openpyxl")
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("Unix domain sockets are not available", allow_module_level=True)
+
+from exceltopdf import cli
+from exceltopdf.daemon import ConversionServer, request_server
+
+
+@pytest.fixture
+def socket_path():
+    # tmp_path can exceed the ~100 character limit on socket paths
+    directory = tempfile.mkdtemp(prefix="e2p")
+    yield Path(directory) / "server.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(socket_path):
+    server = ConversionServer(socket_path, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _workbook(path):
+    import pandas as pd
+
+    pd.DataFrame({"Name": ["a", "b"], "Value": [1, 2]}).to_excel(path, index=False)
+    return path
+
+
+def _run_cli(monkeypatch, *arguments):
+    monkeypatch.setattr(sys, "argv", ["exceltopdf", *arguments])
+    cli.main()
+
+
+def test_cli_hands_conversion_to_running_server(server, socket_path, tmp_path, monkeypatch, capsys):
+    """With a server listening the CLI does not convert in its own process."""
+    book = _workbook(tmp_path / "book.xlsx")
+    output = tmp_path / "out" / "book.pdf"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("converted in the client process")
+
+    # The server's worker was forked before this patch and still has the real converter
+    monkeypatch.setattr(cli, "convert_cached", fail)
+    _run_cli(monkeypatch, str(book), str(output), "--method", "pandas", "--no-cache",
+             "--socket", str(socket_path), "-v")
+
+    assert output.read_bytes().startswith(b"%PDF")
+    assert "Converted by the conversion server" in capsys.readouterr().out
+
+
+def test_server_replaces_a_pool_broken_by_a_dead_worker(server, socket_path, tmp_path, monkeypatch, capsys):
+    """After a worker is killed the server starts new workers instead of failing every later job."""
+    book = _workbook(tmp_path / "book.xlsx")
+    broken = server.executor
+    for pid in list(broken._processes):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while not broken._broken:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    # The replacement workers are forked from this process, so patching the converter here would reach them
+    for name in ("first.pdf", "second.pdf"):
+        _run_cli(monkeypatch, str(book), str(tmp_path / name), "--method", "pandas", "--no-cache",
+                 "--socket", str(socket_path), "-v")
+        assert (tmp_path / name).read_bytes().startswith(b"%PDF")
+    assert server.executor is not broken
+    assert capsys.readouterr().out.count("Converted by the conversion server") == 2
+
+
+def test_server_reports_conversion_errors(server, socket_path, tmp_path, monkeypatch, capsys):
+    """A failed job exits non-zero with the server's error message."""
+    import zipfile
+
+    # Recognised as a workbook by its bytes, but unreadable
+    book = tmp_path / "broken.xlsx"
+    with zipfile.ZipFile(book, "w") as archive:
+        archive.writestr("xl/workbook.xml", "<broken")
+
+    with pytest.raises(SystemExit) as exit_info:
+        _run_cli(monkeypatch, str(book), str(tmp_path / "out.pdf"), "--method", "pandas", "--no-cache",
+                 "--socket", str(socket_path))
+
+    assert exit_info.value.code == 1
+    assert "Error during conversion" in capsys.readouterr().err
+
+
+def test_cli_falls_back_when_no_server_answers(socket_path, tmp_path, monkeypatch):
+    """A missing or stale socket means converting in-process."""
+    book = _workbook(tmp_path / "book.xlsx")
+    calls = []
+    monkeypatch.setattr(cli, "convert_cached", lambda *args, **kwargs: calls.append(args))
+
+    _run_cli(monkeypatch, str(book), str(tmp_path / "a.pdf"), "--method", "pandas", "--no-cache",
+             "--socket", str(socket_path))
+
+    # A socket file left behind by a server that is gone
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()
+    assert request_server({"command": "ping"}, socket_path) is None
+    _run_cli(monkeypatch, str(book), str(tmp_path / "b.pdf"), "--method", "pandas", "--no-cache",
+             "--socket", str(socket_path))
+
+    assert len(calls) == 2
+
+
+def test_second_server_on_same_socket_is_refused(server, socket_path):
+    """Only one server may own a socket, while stale sockets are replaced."""
+    assert request_server({"command": "ping"}, socket_path)["workers"] == 1
+    with pytest.raises(RuntimeError, match="already listening"):
+        ConversionServer(socket_path, workers=1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for cell text formatted with each column's Excel number format."""
+import datetime
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+from exceltopdf.formatting import column_number_formats, format_column, parse_number_format
+
+ACCOUNTING = '_("$"* #,##0.00_);_("$"* \\(#,##0.00\\);_("$"* "-"??_);_(@_)'
+
+
+@pytest.mark.parametrize("number_format, values, expected", [
+    ("General", [1234.5000000001, 3.0, 0.1 + 0.2, 1e12, -42], ["1234.5", "3", "0.3", "1E+12", "-42"]),
+    ("0.00", [2.675, 1.005, -0.5, 7], ["2.68", "1.01", "-0.50", "7.00"]),
+    ("#,##0", [1234567.5, 999.4, 0, -1000], ["1,234,568", "999", "0", "-1,000"]),
+    ("0.0%", [0.1234, 1, -0.005], ["12.3%", "100.0%", "-0.5%"]),
+    ("0.00E+00", [12345, 0.00012], ["1.23E+04", "1.20E-04"]),
+    ('"$"#,##0.00_);[Red]("$"#,##0.00)', [1234.5, -1234.5], ["$1,234.50", "($1,234.50)"]),
+    (ACCOUNTING, [1234.5, -0.25, 0], ["$1,234.50", "$(0.25)", "$-"]),
+    ("[$€-407] #,##0.00", [1234.5], ["€ 1,234.50"]),
+    ("00000", [501, 12345], ["00501", "12345"]),
+    ("0.0##", [1.5, 1.23456], ["1.5", "1.235"]),
+    ('#,##0,"K"', [1234567], ["1,235K"]),
+    ("# ?/?", [1.5], ["1.5"]),  # fractions fall back to General
+    # Beyond 2**53 the digits come from printf but are grouped, padded and trimmed the same way
+    ("#,##0", [1.2345678901234568e16], ["12,345,678,901,234,568"]),
+    ("#,##0.0#", [1.2345678901234568e16], ["12,345,678,901,234,568.0"]),
+    ("000000000000000000", [1.2345678901234568e16], ["012345678901234568"]),
+])
+def test_numbers_show_as_excel_displays_them(number_format, values, expected):
+    assert list(format_column(pd.Series(values, dtype=float), number_format)) == expected
+
+
+@pytest.mark.parametrize("number_format, expected", [
+    ("mm-dd-yy", ["01-05-24", "11-30-23"]),
+    ("d-mmm-yy", ["5-Jan-24", "30-Nov-23"]),
+    ("h:mm AM/PM", ["1:04 PM", "12:00 AM"]),
+    ("m/d/yy h:mm", ["1/5/24 13:04", "11/30/23 0:00"]),
+    ("dddd, mmmm d, yyyy", ["Friday, January 5, 2024", "Thursday, November 30, 2023"]),
+    ('dd/mm/yyyy "at" hh:mm:ss', ["05/01/2024 at 13:04:05", "30/11/2023 at 00:00:00"]),
+    ("General", ["2024-01-05 13:04:05", "2023-11-30 00:00:00"]),
+    ("[h]:mm:ss", ["2024-01-05 13:04:05", "2023-11-30 00:00:00"]),  # elapsed time: ISO fallback
+    ("h:mm:ss.00", ["13:04:05", "0:00:00"]),  # fractions of a second are not shown
+    ("hh:mm:ss.000", ["13:04:05", "00:00:00"]),
+    ("mm:ss.0", ["04:05", "00:00"]),
+])
+def test_dates_show_as_excel_displays_them(number_format, expected):
+    dates = pd.Series([datetime.datetime(2024, 1, 5, 13, 4, 5), datetime.datetime(2023, 11, 30)])
+    assert list(format_column(dates, number_format)) == expected
+    assert list(format_column(pd.Series([datetime.datetime(2024, 1, 5)]))) == ["2024-01-05"]
+
+
+def test_mixed_columns_from_openpyxl_values():
+    values = [1, 2.5, None, "text", True, datetime.datetime(2024, 1, 2, 9, 30), datetime.time(9, 5)]
+    assert list(format_column(values, "h:mm")) == ["1", "2.5", "", "text", "TRUE", "9:30", "9:05"]
+    assert list(format_column([None, "a", float("nan")])) == ["", "a", ""]
+    assert list(format_column(pd.Series([3, None]), "0.00")) == ["3.00", ""]
+
+
+def test_parse_number_format_kinds():
+    assert parse_number_format("General") == ("general",)
+    assert parse_number_format("@") == ("text",)
+    assert parse_number_format("yyyy-mm-dd")[0] == "date"
+    assert parse_number_format("[>=100]0;0.00") == ("general",)
+    kind, sections = parse_number_format("#,##0.00;(#,##0.00);-")
+    assert kind == "number" and len(sections) == 3
+    assert (sections[1].prefix, sections[1].suffix, sections[2].prefix) == ("(", ")", "-")
+
+
+def _formatted_workbook(path, amount_format="#,##0.00"):
+    openpyxl = pytest.importorskip("openpyxl")
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Item", "Amount", "Share", "Due"])
+    for i in range(30):
+        ws.append([f"item {i}", 1000 * i + 0.5, i / 40, datetime.datetime(2024, 1, 1 + i)])
+        ws.cell(i + 2, 2).number_format = amount_format
+        ws.cell(i + 2, 3).number_format = "0.0%"
+        ws.cell(i + 2, 4).number_format = "d-mmm-yyyy"
+    wb.save(path)
+    return path
+
+
+def test_column_number_formats_reads_first_value_cells(tmp_path):
+    book = _formatted_workbook(tmp_path / "book.xlsx")
+    assert column_number_formats(book, "Sheet", 5) == ["General", "#,##0.00", "0.0%", "d-mmm-yyyy", "General"]
+
+
+@pytest.mark.parametrize("reader", ["pandas", "streaming"])
+def test_readers_format_cells_and_measure_the_same_text(tmp_path, reader):
+    pytest.importorskip("reportlab")
+    from exceltopdf import cli
+
+    book = _formatted_workbook(tmp_path / "book.xlsx")
+    source = book if reader == "streaming" else pd.ExcelFile(book)
+    blocks = list(cli._iter_sheet_blocks(source, "Sheet", reader=reader, row_window=7))
+    rows = [row for block in blocks for row in block[1]]
+    assert rows[3] == ["item 3", "3,000.50", "7.5%", "4-Jan-2024"]
+    assert len(rows) == 30
+
+    raw = list(cli._iter_sheet_blocks(source, "Sheet", reader=reader, row_window=7, number_formats=False))
+    raw_rows = [row for block in raw for row in block[1]]
+    assert raw_rows[3][:3] == ["item 3", "3000.5", "0.075"]
+    # Widths are measured on the same formatted text that is drawn
+    from exceltopdf.layout import calculate_column_widths
+
+    first_rows = blocks[0][1]
+    header = [str(name) for name in blocks[0][0]]
+    assert blocks[0][2] == calculate_column_widths(header, list(zip(*first_rows)), True)
+
+
+def test_fingerprints_follow_number_formats(tmp_path):
+    from exceltopdf.cache import sheet_fingerprints
+
+    plain = _formatted_workbook(tmp_path / "plain.xlsx")
+    currency = _formatted_workbook(tmp_path / "currency.xlsx", amount_format='"$"#,##0.00')
+    formatted = [sheet_fingerprints(book, ["Sheet"], {"number_formats": True})["Sheet"] for book in (plain, currency)]
+    raw = [sheet_fingerprints(book, ["Sheet"], {"number_formats": False})["Sheet"] for book in (plain, currency)]
+    assert formatted[0] != formatted[1]
+    assert raw[0] == raw[1]
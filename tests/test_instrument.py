@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for conversion instrumentation and the --profile report."""
+import json
+import sys
+import time
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf import instrument
+from exceltopdf.instrument import LogHook, ProfileRecorder, count, span, subscribed
+
+
+def test_spans_nest_and_report_self_time():
+    """Nested spans carry their path, and self time excludes child spans."""
+    events = []
+    recorder = ProfileRecorder()
+    with subscribed(recorder), subscribed(events.append):
+        with span("outer"):
+            with span("inner", sheet="A") as fields:
+                time.sleep(0.02)
+                fields["rows"] = 3
+            count("rows", 3)
+
+    assert [e["event"] for e in events] == ["start", "start", "end", "count", "end"]
+    assert events[2]["path"] == ("outer", "inner") and events[2]["fields"] == {"sheet": "A", "rows": 3}
+    stages = recorder.stages()
+    assert stages["outer"]["seconds"] >= stages["inner"]["seconds"] >= 0.02
+    assert stages["outer"]["self_seconds"] < stages["inner"]["seconds"]
+    assert recorder.counters == {"rows": 3}
+    assert instrument._hooks == []
+
+
+def test_a_raising_start_hook_leaves_the_span_stack_clean():
+    """A hook that raises on a start event (as cancellation does) does not leave the span on the stack."""
+    def cancel(event):
+        if event["event"] == "start" and event["name"] == "read":
+            raise RuntimeError("cancelled")
+
+    events = []
+    with subscribed(cancel), subscribed(events.append):
+        with pytest.raises(RuntimeError):
+            with span("read"):
+                pass
+        with span("build"):
+            pass
+    assert events[-1]["path"] == ("build",)
+
+
+def test_conversion_reports_stages_and_counters(tmp_path):
+    """A pandas conversion emits read, widths, tables and build spans plus size counters."""
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    from exceltopdf import cli
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["id", "name", "amount"])
+    for r in range(300):
+        wb.active.append([r, f"row {r}", r * 2.5])
+    wb.save(tmp_path / "book.xlsx")
+
+    messages = []
+    recorder = ProfileRecorder()
+    with subscribed(recorder), subscribed(LogHook(messages.append)):
+        cli.convert_with_pandas_reportlab(tmp_path / "book.xlsx", tmp_path / "out.pdf", chunk_rows=100)
+
+    report = recorder.report()
+    assert {"convert", "open", "build", "read", "stringify", "widths", "tables"} <= set(report["stages"])
+    assert report["counters"]["rows"] == 300 and report["counters"]["cells"] == 900
+    assert report["counters"]["pages"] > 1
+    assert report["stages"]["tables"]["calls"] == report["counters"]["pages"]  # one table per page
+    assert report["counters"]["bytes"] == (tmp_path / "out.pdf").stat().st_size
+    read = next(s for s in report["spans"] if s["name"] == "read")
+    assert read["path"] == ["convert", "build", "read"] and read["fields"]["rows"] == 300
+    assert messages[0].startswith("Stage timings")
+
+
+def test_cli_profile_writes_json_and_cprofile_dumps(tmp_path, monkeypatch):
+    """--profile writes the JSON report and --cprofile-dir one .prof file per stage."""
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    from exceltopdf import cli
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["id"])
+    wb.active.append([1])
+    wb.save(tmp_path / "book.xlsx")
+
+    monkeypatch.setattr(sys, "argv", [
+        "exceltopdf", str(tmp_path / "book.xlsx"), str(tmp_path / "out.pdf"), "--method", "pandas",
+        "--no-cache", "--profile", str(tmp_path / "profile.json"), "--cprofile-dir", str(tmp_path / "prof"),
+    ])
+    cli.main()
+
+    report = json.loads((tmp_path / "profile.json").read_text())
+    assert report["total_seconds"] > 0
+    assert "build" in report["stages"]
+    assert (tmp_path / "prof" / "build.prof").exists()
+    assert (tmp_path / "prof" / "read.prof").exists()
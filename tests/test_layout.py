@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Tests for table layout helpers used by the pandas/reportlab path."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("reportlab")
+
+from exceltopdf import cli
+from exceltopdf.layout import header_row_height
+
+
+def _make_data(row_count):
+    return [["id", "text"]] + [[str(i), f"row {i}"] for i in range(row_count)]
+
+
+def _block(header, rows):
+    from exceltopdf.layout import body_row_heights
+
+    return header, rows, [100] * len(header), body_row_heights(list(zip(*rows)) or [[]] * len(header), len(rows)), None
+
+
+def _pages(table, height):
+    """Split `table` page by page like the document does; returns the tables of each page."""
+    pages = []
+    while table is not None:
+        parts = table.split(500, height)
+        table = parts.pop() if parts and parts[-1] is table else None
+        pages.append(parts)
+    return pages
+
+
+def test_sheet_tables_carry_the_header_only_at_page_tops():
+    """Each page is one table starting with the header; rows run on across blocks and pages."""
+    data = _make_data(450)
+    blocks = [_block(data[0], data[1:101]), _block(data[0], data[101:])]
+    page_height = header_row_height(data[0]) + 10 * 28  # the header and ten one-line rows
+
+    pages = _pages(cli._sheet_table(blocks), page_height)
+
+    assert [len(tables) for tables in pages] == [1] * 45
+    assert all(tables[0]._cellvalues[0] == ["id", "text"] for tables in pages)
+    assert [row for tables in pages for row in tables[0]._cellvalues[1:]] == data[1:]
+    assert all(sum(tables[0]._argH) <= page_height for tables in pages)
+
+
+def test_sheet_tables_keep_the_stripes_and_chunk_full_pages():
+    """Pages starting on an odd row swap the stripe colours; big pages become several headerless tables."""
+    data = _make_data(12)
+    pages = _pages(cli._sheet_table([_block(data[0], data[1:])], chunk_rows=2), header_row_height(data[0]) + 5 * 28)
+
+    assert [[len(table._cellvalues) for table in tables] for tables in pages] == [[3, 2, 1], [3, 2, 1], [3]]
+    assert [tables[0]._cellvalues[0] for tables in pages] == [["id", "text"]] * 3
+    assert pages[0][1]._cellvalues[0] == ["2", "row 2"]
+
+    def stripes(table):
+        return [cmd for cmd in table._bkgrndcmds if cmd[0] == 'ROWBACKGROUNDS'][-1][3]
+
+    white_first = stripes(pages[0][0])
+    assert [stripes(table) for table in pages[0]] == [white_first] * 3
+    # Rows 5, 7 and 9 open the tables of the second page, so each starts on the grey stripe
+    assert [stripes(table) for table in pages[1]] == [white_first[::-1]] * 3
+
+
+def test_sheet_table_header_only():
+    """A sheet without data rows still renders its header."""
+    pages = _pages(cli._sheet_table([_block(["id"], [])]), 500)
+    assert len(pages) == 1 and pages[0][0]._cellvalues == [["id"]]
+    assert cli._sheet_table([_block(["id"], [])]).split(500, 10) == []  # no room: next page
+
+
+def test_chunked_conversion_spans_many_pages(tmp_path):
+    """A sheet larger than one page builds without 'flowable too large' errors."""
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("pandas")
+
+    wb = openpyxl.Workbook()
+    for row in _make_data(600):
+        wb.active.append(row)
+    wb.save(tmp_path / "book.xlsx")
+
+    cli.convert_with_pandas_reportlab(tmp_path / "book.xlsx", tmp_path / "out.pdf", chunk_rows=100)
+
+    assert (tmp_path / "out.pdf").read_bytes().startswith(b"%PDF")
+
+
+def test_longest_line_width_matches_reportlab_metrics():
+    """Summed glyph widths agree with pdfmetrics.stringWidth on the widest line."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from exceltopdf.layout import longest_line_width
+
+    values = ["short", "Wide WWW line\nx", "iiiiiiiiiiiiiiiiii", "Héllo €", ""]
+    expected = max(stringWidth(line, "Helvetica", 9) for value in values for line in value.split("\n"))
+
+    assert longest_line_width(values, "Helvetica", 9) == pytest.approx(expected)
+    assert longest_line_width([], "Helvetica", 9) == 0.0
+
+
+def test_cell_widths_of_mixed_lengths_match_reportlab_metrics():
+    """Cells of very different lengths, in any order, are each measured exactly."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from exceltopdf.layout import cell_widths
+
+    values = ["a", "W" * 5000, "", 12.5, "two\nlines here", "mid length text"] * 3
+    expected = [max(stringWidth(line, "Helvetica", 9) for line in str(value).split("\n")) for value in values]
+
+    assert cell_widths(values, "Helvetica", 9, block_size=4).tolist() == pytest.approx(expected)
+
+
+def test_measure_column_widths_uses_header_and_body_fonts():
+    """The header is measured in bold 10pt and body cells in regular 9pt."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from exceltopdf.layout import CELL_PADDING, measure_column_widths
+
+    widths = measure_column_widths(["Total amount", "x"], [["1", "2"], ["a much longer body cell"]])
+
+    assert widths[0] == pytest.approx(stringWidth("Total amount", "Helvetica-Bold", 10) + CELL_PADDING)
+    assert widths[1] == pytest.approx(stringWidth("a much longer body cell", "Helvetica", 9) + CELL_PADDING)
+
+
+def test_fit_column_widths_clamps_and_fills_available_width():
+    """Widths are clamped to the limits and then spread to fill the page."""
+    from exceltopdf.layout import fit_column_widths
+
+    assert fit_column_widths([10, 500], 400, 50, 150) == [50 + 100, 150 + 100]
+    assert sum(fit_column_widths([150] * 10, 600, 50, 150)) == pytest.approx(600)
+    assert fit_column_widths([], 400, 50, 150) == []
+
+
+def test_sample_row_indices_cover_head_tail_and_middle():
+    """Samples are deterministic, unique and include both ends of the sheet."""
+    from exceltopdf.layout import sample_row_indices
+
+    rows = sample_row_indices(100000, 400)
+
+    assert len(rows) == len(set(rows.tolist())) == 400
+    assert list(rows[:100]) == list(range(100)) and list(rows[-100:]) == list(range(99900, 100000))
+    assert ((rows > 100) & (rows < 99900)).sum() == 200
+    assert list(rows) == list(sample_row_indices(100000, 400))
+    assert list(sample_row_indices(50, 400)) == list(range(50))
+
+
+def test_large_sheets_ignore_a_single_outlier_cell():
+    """Above the threshold one very wide cell no longer sets its column's width."""
+    from exceltopdf.layout import calculate_column_widths
+
+    header = ["Name", "Note"]
+    notes = ["ok"] * 30000
+    notes[15000] = "an extremely long free-text remark " * 3
+    columns = [["x"] * 30000, notes]
+
+    exact = calculate_column_widths(header, columns, sample_threshold=None)
+    estimated = calculate_column_widths(header, columns, sample_threshold=20000, sample_size=30000)
+
+    assert exact[1] > exact[0]
+    assert estimated[1] == pytest.approx(estimated[0])
+
+
+def test_planned_row_heights_match_reportlab_measurement():
+    """Explicit row heights equal what Table.wrap() measures, so the layout is unchanged."""
+    from reportlab.platypus import Table, TableStyle
+    from exceltopdf.layout import body_row_heights, header_row_height
+
+    header = ["id", "two\nline header"]
+    rows = [["1", "plain"], ["2", "one\ntwo\nthree"], ["3\n4", ""], ["", "x"]]
+    measured = Table([header] + rows, colWidths=[100, 100])
+    measured.setStyle(TableStyle(cli._table_style_commands()))
+    measured.wrap(500, 1000)
+
+    planned = [header_row_height(header)] + body_row_heights(list(zip(*rows)), len(rows)).tolist()
+    assert planned == pytest.approx(measured._rowHeights)
+
+    block = (header, rows, [100, 100], body_row_heights(list(zip(*rows)), len(rows)), None)
+    tables = cli._sheet_table([block], chunk_rows=3).split(500, 1000)
+    assert [t._argH for t in tables] == [planned[:4], planned[4:]]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Tests for the streaming PDF merger."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+pytest.importorskip("reportlab")
+
+from exceltopdf import cli
+from exceltopdf.merge import format_merge_stats, merge_pdfs
+
+
+def _make_pdf(path, label, pages=2):
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(str(path))
+    for page in range(pages):
+        c.setFont("Helvetica", 12)
+        c.drawString(72, 720, f"{label} page {page + 1}")
+        c.showPage()
+    c.save()
+    return path
+
+
+def test_merge_keeps_page_order_and_shares_fonts(tmp_path):
+    """Pages are appended in part order and identical fonts are written once."""
+    parts = [_make_pdf(tmp_path / f"part{i}.pdf", f"part {i}", pages=i) for i in (1, 2, 3)]
+    out = tmp_path / "merged.pdf"
+
+    stats = merge_pdfs(parts, out)
+
+    reader = PyPDF2.PdfReader(str(out), strict=True)
+    texts = [page.extract_text().strip() for page in reader.pages]
+    assert texts == ["part 1 page 1", "part 2 page 1", "part 2 page 2",
+                     "part 3 page 1", "part 3 page 2", "part 3 page 3"]
+    assert stats['parts'] == 3 and stats['pages'] == 6
+    assert stats['objects_deduplicated'] >= 2
+    assert stats['bytes_saved'] > 0
+    assert stats['bytes_written'] == out.stat().st_size
+    assert "6 pages from 3 parts" in format_merge_stats(stats)
+
+
+def test_merge_without_dedupe_writes_every_object(tmp_path):
+    """Deduplication can be disabled and the output stays valid."""
+    parts = [_make_pdf(tmp_path / f"part{i}.pdf", f"part {i}") for i in (1, 2)]
+
+    stats = merge_pdfs(parts, tmp_path / "merged.pdf", dedupe=False)
+
+    assert stats['objects_deduplicated'] == 0
+    assert len(PyPDF2.PdfReader(str(tmp_path / "merged.pdf")).pages) == 4
+
+
+def test_merge_pdfs_with_pypdf2_removes_parts(tmp_path):
+    """The converter-facing helper deletes the temporary parts after merging."""
+    parts = [_make_pdf(tmp_path / f"part{i}.pdf", f"part {i}") for i in (1, 2)]
+
+    stats = cli.merge_pdfs_with_pypdf2([str(p) for p in parts], tmp_path / "merged.pdf")
+
+    assert stats['pages'] == 4
+    assert not any(p.exists() for p in parts)
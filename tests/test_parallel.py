@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Tests for parallel per-sheet rendering."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+openpyxl = pytest.importorskip("openpyxl")
+pytest.importorskip("pandas")
+pytest.importorskip("reportlab")
+PyPDF2 = pytest.importorskip("PyPDF2")
+
+from exceltopdf import cli
+
+
+def _make_workbook(path, sheet_count=3, rows=120):
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for s in range(sheet_count):
+        ws = wb.create_sheet(f"Tab {s + 1}")
+        ws.append(["id", "label"])
+        for r in range(rows * (s + 1)):
+            ws.append([r, f"sheet {s + 1} row {r}"])
+    wb.save(path)
+    return path
+
+
+def _page_texts(pdf_path):
+    return [page.extract_text() for page in PyPDF2.PdfReader(str(pdf_path)).pages]
+
+
+@pytest.mark.parametrize("reader", ["pandas", "streaming"])
+def test_parallel_sheets_match_single_document(tmp_path, reader):
+    """Parallel rendering yields the same pages, titles and order as a serial build."""
+    book = _make_workbook(tmp_path / "book.xlsx")
+
+    cli.convert_with_pandas_reportlab(book, tmp_path / "serial.pdf", all_sheets=True, reader=reader)
+    cli.convert_with_pandas_reportlab(book, tmp_path / "parallel.pdf", all_sheets=True, reader=reader,
+                                      parallel_sheets=True, jobs=2)
+
+    serial = _page_texts(tmp_path / "serial.pdf")
+    parallel = _page_texts(tmp_path / "parallel.pdf")
+    assert parallel == serial
+    assert parallel[0].startswith("Tab 1")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests for the read-ahead pipeline between the sheet reader and the renderer."""
+import io
+import multiprocessing
+import queue
+import sys
+import time
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf import pipeline
+from exceltopdf.instrument import ProfileRecorder, count, subscribed
+from exceltopdf.pipeline import PipelineStats, iter_pipelined
+
+
+def _numbers(limit, fail_at=None):
+    for number in range(limit):
+        if number == fail_at:
+            raise KeyError(f"no sheet {number}")
+        count("rows", 10)
+        yield number
+
+
+def test_items_arrive_in_order_with_stats_and_counters():
+    stats = PipelineStats(depth=2)
+    with subscribed(ProfileRecorder()) as recorder:
+        assert list(iter_pipelined(_numbers, (25,), depth=2, stats=stats)) == list(range(25))
+
+    assert stats.items == 25
+    assert 1 <= stats.max_depth <= 3
+    assert stats.reader_seconds >= 0 and stats.render_stall_seconds >= 0
+    # Counters recorded by the reader process are replayed in this one
+    assert recorder.counters["rows"] == 250
+    assert any("queue of 2" in line for line in stats.summary_lines())
+
+
+def test_reader_errors_are_raised_in_the_renderer():
+    items = iter_pipelined(_numbers, (10, 3), depth=1)
+    with pytest.raises(KeyError, match="no sheet 3"):
+        assert list(items) == [0, 1, 2]
+
+
+class _LateQueue:
+    """A queue whose waits always time out, as when the reader finishes just after the renderer starts waiting."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get(self, timeout=None):
+        time.sleep(timeout)
+        raise queue.Empty
+
+    def __getattr__(self, name):
+        return getattr(self.channel, name)
+
+
+class _LateContext:
+    def __init__(self, context):
+        self.context = context
+
+    def Queue(self, maxsize=0):
+        return _LateQueue(self.context.Queue(maxsize))
+
+    def Process(self, *args, **kwargs):
+        return self.context.Process(*args, **kwargs)
+
+
+def test_items_left_by_an_exited_reader_are_not_a_crash(monkeypatch):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("the wrapped queue reaches the reader only with the fork start method")
+    monkeypatch.setattr(pipeline, "POLL_SECONDS", 0.05)
+    context = _LateContext(multiprocessing.get_context("fork"))
+    # Deep enough for the reader to put everything and exit before any item is taken
+    assert list(iter_pipelined(_numbers, (3,), depth=8, mp_context=context)) == [0, 1, 2]
+
+
+def test_pipelined_conversion_matches_inline(tmp_path, monkeypatch):
+    """Reading ahead changes when sheets are read, not the PDF."""
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+    pytest.importorskip("reportlab")
+    from reportlab import rl_config
+    from exceltopdf import cli
+
+    book = tmp_path / "book.xlsx"
+    with pd.ExcelWriter(book, engine="openpyxl") as writer:
+        for s in range(3):
+            pd.DataFrame({"Name": [f"row {i}" for i in range(30)], "Sheet": s}).to_excel(
+                writer, sheet_name=f"S{s}", index=False)
+
+    # The pipeline is skipped on single-CPU machines
+    monkeypatch.setattr(cli.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(rl_config, "invariant", 1)
+    outputs = []
+    for depth in (0, 2):
+        output = io.BytesIO()
+        cli.convert_with_pandas_reportlab(book, output, all_sheets=True, pipeline_depth=depth)
+        outputs.append(output.getvalue())
+    assert outputs[0] == outputs[1]
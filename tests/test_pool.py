@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for the Excel instance pool, run against a fake Excel object."""
+import sys
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from exceltopdf import cli, pool as pool_module
+from exceltopdf.pool import ExcelPool, close_default_excel_pool
+from fake_excel import FakeExcel
+
+
+def test_instances_are_reused_and_recycled_after_max_uses():
+    """An instance serves max_uses checkouts and is then quit and replaced."""
+    pool = ExcelPool(FakeExcel, max_size=1, max_uses=2)
+
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+    assert first.quit_called
+
+    second = pool.acquire()
+    assert second is not first
+    pool.release(second)
+    assert pool.stats['started'] == 2 and pool.stats['reused'] == 1
+
+
+def test_failed_or_unhealthy_instances_are_replaced():
+    """A failure recycles the instance; a crashed idle instance is not handed out."""
+    pool = ExcelPool(FakeExcel, max_size=1)
+
+    with pytest.raises(ValueError):
+        with pool.instance() as xl:
+            raise ValueError("conversion failed")
+    assert xl.quit_called
+
+    healthy = pool.acquire()
+    pool.release(healthy)
+    healthy.crash()
+    replacement = pool.acquire()
+    assert replacement is not healthy
+    assert pool.stats['unhealthy'] == 1
+    pool.release(replacement)
+
+
+def test_pool_is_bounded_and_times_out():
+    """Checkouts beyond max_size wait, and give up after the timeout."""
+    pool = ExcelPool(FakeExcel, max_size=1)
+    held = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    pool.release(held)
+    waiter.join()
+    # The instance belongs to this thread, so the waiter gets a fresh one
+    # and leaves the old one for this thread to quit
+    assert got and got[0] is not held
+    assert not held.quit_called
+    pool.close()
+    assert held.quit_thread == held.thread
+
+
+def test_instances_are_only_quit_by_their_own_thread():
+    """An idle instance of another thread is set aside and quit on its owner's next checkout."""
+    pool = ExcelPool(FakeExcel, max_size=1)
+    held = pool.acquire()
+    pool.release(held)
+
+    got = []
+    worker = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    worker.start()
+    worker.join()
+    assert got and got[0] is not held
+    assert not held.quit_called
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    assert held.quit_thread == held.thread
+    assert pool.stats['recycled'] == 1
+
+
+def test_converter_checks_instances_out_of_the_pool(tmp_path):
+    """Consecutive win32com conversions share one Excel instance."""
+    pool = ExcelPool(FakeExcel, max_size=1)
+    for name in ("a.pdf", "b.pdf"):
+        cli.convert_with_win32com(tmp_path / "book.xlsx", tmp_path / name, pool=pool)
+        assert (tmp_path / name).read_bytes().startswith(b"%PDF")
+
+    assert pool.stats['started'] == 1
+    assert pool.stats['reused'] == 1
+    pool.close()
+    assert pool.stats['recycled'] == 0
+
+
+def test_closing_on_the_owner_thread_quits_its_instances(monkeypatch):
+    """A worker thread's instances survive a close() elsewhere and are quit when that thread closes the pool."""
+    pool = ExcelPool(FakeExcel, max_size=1)
+    monkeypatch.setattr(pool_module, "_default_pool", pool)
+    worker = ThreadPoolExecutor(max_workers=1)
+
+    def convert():
+        app = pool.acquire()
+        pool.release(app)
+        return app
+
+    app = worker.submit(convert).result()
+
+    close_default_excel_pool()  # the atexit hook, on the main thread
+    assert not app.quit_called
+    worker.submit(close_default_excel_pool).result()
+    worker.shutdown()
+    assert app.quit_called and app.quit_thread == app.thread
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Tests for the streamed workbook readers and their parsing backends."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+openpyxl = pytest.importorskip("openpyxl")
+pytest.importorskip("reportlab")
+
+from exceltopdf import cli
+from exceltopdf.readers import READER_BACKENDS, iter_row_windows, iter_sheet_rows, streaming_sheet_names
+
+
+def _make_workbook(path, sheets):
+    """Write a workbook with one sheet per (name, rows) pair."""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets:
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _make_ods(path, name, rows):
+    """Write a minimal OpenDocument spreadsheet with one sheet of string and float cells."""
+    import zipfile
+
+    def cell(value):
+        if isinstance(value, str):
+            return f'<table:table-cell office:value-type="string"><text:p>{value}</text:p></table:table-cell>'
+        return f'<table:table-cell office:value-type="float" office:value="{value}"><text:p>{value}</text:p></table:table-cell>'
+
+    table = "".join("<table:table-row>" + "".join(map(cell, row)) + "</table:table-row>" for row in rows)
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+        f'<office:body><office:spreadsheet><table:table table:name="{name}">{table}</table:table>'
+        '</office:spreadsheet></office:body></office:document-content>'
+    )
+    manifest = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+        '<manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+        '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+        '</manifest:manifest>'
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet", compress_type=zipfile.ZIP_STORED)
+        archive.writestr("META-INF/manifest.xml", manifest)
+        archive.writestr("content.xml", content)
+    return path
+
+
+def test_iter_sheet_rows_matches_pandas_conventions(tmp_path):
+    """Header blanks are named, values are strings and trailing blank rows are dropped."""
+    path = _make_workbook(tmp_path / "book.xlsx", [
+        ("Data", [["id", None, "name"], [1, 2.5, "a"], [None, None, None], [3, None, "c"], [None, None, None]]),
+    ])
+
+    rows = list(iter_sheet_rows(path, "Data"))
+
+    assert rows == [
+        ["id", "Unnamed: 1", "name"],
+        ["1", "2.5", "a"],
+        ["", "", ""],
+        ["3", "", "c"],
+    ]
+
+
+def test_streaming_sheet_names(tmp_path):
+    """Sheet names are listed in workbook order."""
+    path = _make_workbook(tmp_path / "book.xlsx", [("First", [["a"]]), ("Second", [["b"]])])
+    assert streaming_sheet_names(path) == ["First", "Second"]
+
+
+@pytest.mark.parametrize("backend", READER_BACKENDS)
+def test_backends_read_the_same_rows(tmp_path, backend):
+    """Every backend reads offset cells, numbers, dates and blanks like openpyxl read-only."""
+    if backend == "calamine":
+        pytest.importorskip("python_calamine")
+    import datetime
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws["B1"], ws["C1"], ws["D1"] = "id", "when", "note"
+    ws["B2"], ws["C2"], ws["D2"] = 1, datetime.datetime(2024, 1, 5), "x"
+    ws["B4"], ws["C4"], ws["D4"] = 2.5, datetime.datetime(2024, 1, 6, 13, 30), None
+    ws["B5"] = 10 ** 15
+    path = tmp_path / "book.xlsx"
+    wb.save(path)
+
+    expected = list(iter_sheet_rows(path, "Data", raw=True))
+    assert expected[0] == ["Unnamed: 0", "id", "when", "note"]
+    assert list(iter_sheet_rows(path, "Data", raw=True, backend=backend)) == expected
+    assert list(iter_sheet_rows(path.read_bytes(), "Data", backend=backend)) == list(iter_sheet_rows(path, "Data"))
+    assert streaming_sheet_names(path, backend) == ["Data"]
+
+
+def test_unknown_backend_and_auto_reader(tmp_path, monkeypatch):
+    """Unknown backends are rejected and "auto" picks calamine only when it is installed."""
+    path = _make_workbook(tmp_path / "book.xlsx", [("Data", [["a"], [1]])])
+    with pytest.raises(ValueError):
+        list(iter_sheet_rows(path, "Data", backend="xlrd"))
+
+    monkeypatch.setattr(cli, "calamine_available", lambda: False)
+    assert cli.resolve_reader("auto") == "pandas"
+    monkeypatch.setattr(cli, "calamine_available", lambda: True)
+    assert cli.resolve_reader("auto") == "calamine"
+    assert cli.resolve_reader("streaming") == "streaming"
+
+
+def test_calamine_conversion_matches_pandas_blocks(tmp_path):
+    """The calamine reader hands the renderers the same header and rows as pandas."""
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("python_calamine")
+
+    rows = [["col1", "col2", "col3"]] + [[i, i / 4, f"value {i}"] for i in range(120)]
+    path = _make_workbook(tmp_path / "book.xlsx", [("One", rows)])
+
+    def cells(blocks):
+        return [(list(block[0]), block[1]) for block in blocks]
+
+    pandas_blocks = cells(cli._iter_sheet_blocks(pd.ExcelFile(path), "One", reader="pandas"))
+    calamine_blocks = cells(cli._iter_sheet_blocks(path, "One", reader="calamine"))
+    assert [row for _, block in calamine_blocks for row in block] == [row for _, block in pandas_blocks for row in block]
+    assert calamine_blocks[0][0] == pandas_blocks[0][0]
+
+    pdf_path = tmp_path / "out.pdf"
+    cli.convert_with_pandas_reportlab(path, pdf_path, reader="calamine")
+    assert pdf_path.read_bytes().startswith(b"%PDF")
+
+
+def test_calamine_reads_opendocument_spreadsheets(tmp_path):
+    """.ods workbooks convert with the calamine reader and are refused by the openpyxl readers."""
+    pytest.importorskip("python_calamine")
+    path = _make_ods(tmp_path / "budget.ods", "Budget", [["item", "amount"], ["rent", 1200], ["food", 350.5]])
+
+    assert streaming_sheet_names(path, "calamine") == ["Budget"]
+    assert list(iter_sheet_rows(path, "Budget", backend="calamine")) == [
+        ["item", "amount"], ["rent", "1200"], ["food", "350.5"],
+    ]
+    pdf_path = tmp_path / "budget.pdf"
+    cli.convert_with_pandas_reportlab(path, pdf_path, reader="calamine")
+    assert pdf_path.read_bytes().startswith(b"%PDF")
+    with pytest.raises(ValueError, match="calamine"):
+        cli.convert_with_pandas_reportlab(path, pdf_path, reader="streaming")
+
+
+def test_iter_row_windows():
+    """Rows are grouped into windows of at most the requested size."""
+    assert list(iter_row_windows(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        list(iter_row_windows([], 0))
+
+
+def test_streaming_conversion_writes_pdf(tmp_path):
+    """The streaming reader renders every sheet into a single PDF."""
+    rows = [["col1", "col2"]] + [[i, f"value {i}\nsecond line"] for i in range(250)]
+    path = _make_workbook(tmp_path / "book.xlsx", [("One", rows), ("Two", rows[:3])])
+    pdf_path = tmp_path / "out.pdf"
+
+    cli.convert_with_pandas_reportlab(path, pdf_path, all_sheets=True, reader="streaming", row_window=50)
+
+    assert pdf_path.read_bytes().startswith(b"%PDF")
+
+
+def test_lazy_story_keeps_bounded_lookahead():
+    """The lazy story only pulls a few flowables ahead of the consumer."""
+    pulled = []
+
+    def source():
+        for i in range(10):
+            pulled.append(i)
+            yield i
+
+    story = cli._LazyStory(source(), lookahead=3)
+    assert len(pulled) == 3
+    del story[0]
+    assert len(pulled) == 4
+    consumed = []
+    while len(story):
+        consumed.append(story[0])
+        del story[0]
+    assert consumed == list(range(1, 10))
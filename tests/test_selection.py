@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Tests for sheet and cell-range selection in both conversion engines."""
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from exceltopdf.selection import CellRange, excel_address, parse_cell_range, select_sheets
+
+
+@pytest.mark.parametrize("spec, expected, address", [
+    ("A1:H5000", CellRange(1, 1, 5000, 8), "A1:H5000"),
+    ("$c$3:$AB$40", CellRange(3, 3, 40, 28), "C3:AB40"),
+    ("B:D", CellRange(1, 2, None, 4), "B:D"),
+    ("10:500", CellRange(10, 1, 500, None), "10:500"),
+])
+def test_parse_cell_range(spec, expected, address):
+    assert parse_cell_range(spec) == expected
+    assert excel_address(parse_cell_range(spec)) == address
+
+
+@pytest.mark.parametrize("spec", ["A1", "H5:A1", "A0:B2", "A1:XFE2", "sheet!A1:B2", ""])
+def test_invalid_cell_ranges_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_cell_range(spec)
+
+
+def test_select_sheets_by_name_index_and_range():
+    names = ["Summary", "Q1", "Q2", "Q3", "Q4", "2"]
+    assert select_sheets(names, "Q3,1") == ["Summary", "Q3"]
+    assert select_sheets(names, "3-5, Q1") == ["Q1", "Q2", "Q3", "Q4"]
+    assert select_sheets(names, "5-") == ["Q4", "2"]
+    assert select_sheets(names, "2") == ["2"]  # a sheet name wins over an index
+    assert select_sheets(names, [1, "Q2"]) == ["Summary", "Q2"]
+    for spec in ("Missing", "7", "4-2", " , "):
+        with pytest.raises(ValueError):
+            select_sheets(names, spec)
+
+
+def _workbook(path):
+    openpyxl = pytest.importorskip("openpyxl")
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name in ("One", "Two", "Three"):
+        ws = wb.create_sheet(name)
+        ws.append(["title row"])
+        ws.append([None, "id", None, "amount"])
+        for i in range(60):
+            ws.append([f"left {i}", i, f"{name} {i}", i * 1.5, "right"])
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("reader", ["pandas", "streaming", "openpyxl", "calamine"])
+def test_readers_read_only_the_range(tmp_path, reader):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    if reader == "calamine":
+        pytest.importorskip("python_calamine")
+    from exceltopdf import cli
+
+    book = _workbook(tmp_path / "book.xlsx")
+    source = pd.ExcelFile(book) if reader == "pandas" else book
+    blocks = list(cli._iter_sheet_blocks(source, "Two", reader=reader, row_window=7,
+                                         cell_range=parse_cell_range("B2:D12")))
+    rows = [row for block in blocks for row in block[1]]
+
+    assert [str(name) for name in blocks[0][0]] == ["id", "Unnamed: 2", "amount"]
+    assert len(rows) == 10
+    assert rows[0] == ["0", "Two 0", "0"]
+    assert rows[-1] == ["9", "Two 9", "13.5"]
+
+
+def test_range_rows_stop_at_the_last_row():
+    from exceltopdf.readers import _range_rows
+
+    pulled = []
+
+    def rows():
+        for i in range(1, 1000):
+            pulled.append(i)
+            yield (i, i, i, i)
+
+    width, ranged = _range_rows(rows(), 4, parse_cell_range("B5:C9"))
+    assert width == 2
+    assert list(ranged) == [(i, i) for i in range(5, 10)]
+    assert pulled[-1] == 9
+
+
+def test_only_selected_sheets_are_read(tmp_path, monkeypatch):
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    from exceltopdf import cli
+
+    read = []
+    iter_sheet_blocks = cli._iter_sheet_blocks
+
+    def recording(excel_source, sheet_name, **options):
+        read.append(sheet_name)
+        return iter_sheet_blocks(excel_source, sheet_name, **options)
+
+    monkeypatch.setattr(cli, "_iter_sheet_blocks", recording)
+    book = _workbook(tmp_path / "book.xlsx")
+    cli.convert_with_pandas_reportlab(book, tmp_path / "out.pdf", sheets="3,One", cell_range="A2:E20",
+                                      pipeline_depth=0)
+    assert read == ["One", "Three"]
+    assert (tmp_path / "out.pdf").read_bytes().startswith(b"%PDF")
+
+    with pytest.raises(ValueError):
+        cli.convert_with_pandas_reportlab(book, tmp_path / "out.pdf", sheets="Four")
+
+
+def test_fingerprints_ignore_cells_outside_the_range(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    from exceltopdf.cache import sheet_fingerprints
+
+    book = _workbook(tmp_path / "book.xlsx")
+    settings = {"cell_range": parse_cell_range("A2:E20")}
+    before = sheet_fingerprints(book, ["One"], settings)["One"]
+    wb = openpyxl.load_workbook(book)
+    wb["One"]["A40"] = "edited below the range"
+    wb.save(book)
+    assert sheet_fingerprints(book, ["One"], settings)["One"] == before
+    wb["One"]["B10"] = "edited inside the range"
+    wb.save(book)
+    assert sheet_fingerprints(book, ["One"], settings)["One"] != before
+
+
+def test_win32com_lays_out_and_exports_only_the_selection(tmp_path):
+    from exceltopdf import cli
+    from exceltopdf.pool import ExcelPool
+    from fake_excel import FakeExcel, make_values
+
+    sheets = {f"Tab {i}": make_values(5000, 6) for i in range(1, 5)}
+    xl = FakeExcel(sheets)
+    cli.convert_with_win32com(tmp_path / "book.xlsx", tmp_path / "out.pdf", pool=ExcelPool(lambda: xl, max_size=1),
+                              sheets="Tab 3,1", cell_range="A1:D50", aggressive_adjust=True)
+
+    assert xl.exports == ["workbook: Tab 1, Tab 3"]
+    # The bulk layout reads just the range, not the 5000-row used range
+    assert xl.com_calls < 150
+
+    single = FakeExcel(sheets)
+    cli.convert_with_win32com(tmp_path / "book.xlsx", tmp_path / "out.pdf",
+                              pool=ExcelPool(lambda: single, max_size=1), sheets="Tab 2", all_sheets=True)
+    assert single.exports == ["Tab 2"]
+
+
+def test_win32com_range_becomes_the_print_area():
+    from exceltopdf.comlayout import optimize_worksheet_layout
+    from fake_excel import FakeExcel, FakeWorksheet, make_values
+
+    xl = FakeExcel()
+    worksheet = FakeWorksheet(xl, "Data", make_values(3000, 10))
+    optimize_worksheet_layout(xl, worksheet, aggressive_adjust=True, cell_range=parse_cell_range("B:D"))
+
+    assert worksheet.PageSetup.PrintArea == "B:D"
+    laid_out = worksheet._ranges[0]
+    assert laid_out.Address == "B1:D3000"  # clipped to the used rows
+    assert laid_out.WrapText is True
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Tests for the HTTP conversion service: sync and async jobs, backpressure, limits and metrics."""
+import http.client
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import pytest
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf.service import ConversionService, ServiceHTTPServer, _Worker, _percentile, parse_options
+
+
+@contextmanager
+def _running(**settings):
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    pytest.importorskip("openpyxl")
+    server = ServiceHTTPServer(("127.0.0.1", 0), ConversionService(**settings))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _request(url, data=None):
+    """Return (status, headers, body) of a request, HTTP errors included."""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=60) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def _workbook(path, rows=2):
+    openpyxl = pytest.importorskip("openpyxl")
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["id", "name", "amount", "note"])
+    for i in range(rows):
+        wb.active.append([i, f"name {i}", i * 1.5, "a longer note that wraps in its column " * 2])
+    wb.save(path)
+    return path.read_bytes()
+
+
+def test_parse_options():
+    options = parse_options("mode=async&sheets=1,Q2&range=A1:C10&preserve_styles=true&raw_values=1&chunk_rows=50")
+    assert options["sheets"] == "1,Q2"
+    assert options["cell_range"] == "A1:C10"
+    assert options["preserve_styles"] is True
+    assert options["number_formats"] is False
+    assert options["chunk_rows"] == 50
+    assert options["pipeline_depth"] == 0 and options["parallel_sheets"] is False
+    for query in ("bogus=1", "engine=ink", "reader=magic", "range=Z9:A1", "row_window=0"):
+        with pytest.raises(ValueError):
+            parse_options(query)
+
+
+def test_percentile():
+    assert _percentile([], 50) is None
+    values = list(range(1, 101))
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 99) == 99
+    assert _percentile([3.0], 99) == 3.0
+
+
+def test_sync_and_async_conversions(tmp_path):
+    workbook = _workbook(tmp_path / "book.xlsx")
+    with _running(workers=1) as (server, url):
+        status, headers, body = _request(f"{url}/convert", workbook)
+        assert status == 200 and headers["Content-Type"] == "application/pdf"
+        assert body.startswith(b"%PDF")
+
+        status, _, body = _request(f"{url}/convert?mode=async&range=A1:B2", workbook)
+        assert status == 202
+        job = json.loads(body)
+        deadline = time.monotonic() + 30
+        while json.loads(_request(f"{url}{job['status_url']}")[2])["state"] in ("queued", "running"):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        status, _, body = _request(f"{url}{job['result_url']}")
+        assert status == 200 and body.startswith(b"%PDF")
+
+        assert _request(f"{url}/convert", b"not a workbook")[0] == 400
+        assert _request(f"{url}/convert?sheets=Missing", workbook)[0] == 422
+        assert _request(f"{url}/jobs/unknown")[0] == 404
+        server.max_upload = 100
+        assert _request(f"{url}/convert", workbook)[0] == 413
+
+        metrics = json.loads(_request(f"{url}/metrics")[2])
+        assert metrics["completed"] == 2 and metrics["failed"] == 1
+        assert metrics["latency_seconds"]["samples"] == 3
+        assert metrics["latency_seconds"]["p50"] <= metrics["latency_seconds"]["p99"]
+        assert metrics["throughput_per_second"] > 0
+        assert metrics["queue_depth"] == 0 and metrics["running"] == 0
+
+
+def test_missing_or_invalid_content_length_is_rejected():
+    with _running(workers=1) as (server, url):
+        for length, status in ((None, 411), ("-1", 400), ("ten", 400)):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            connection.putrequest("POST", "/convert")
+            if length is not None:
+                connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == status
+            assert "Content-Length" in json.loads(response.read())["error"]
+            connection.close()
+
+
+def test_worker_start_failures_fail_the_job_only(tmp_path, monkeypatch):
+    workbook = _workbook(tmp_path / "book.xlsx")
+    spawn = _Worker._spawn
+    failures = [OSError(11, "Resource temporarily unavailable")]
+
+    def flaky_spawn(worker):
+        if failures:
+            raise failures.pop()
+        spawn(worker)
+
+    monkeypatch.setattr(_Worker, "_spawn", flaky_spawn)
+    with _running(workers=1) as (server, url):
+        status, _, body = _request(f"{url}/convert", workbook)
+        assert status == 500 and b"Resource temporarily unavailable" in body
+        # The supervisor survives and starts a worker for the next job
+        assert _request(f"{url}/convert", workbook)[0] == 200
+        metrics = json.loads(_request(f"{url}/metrics")[2])
+        assert metrics["failed"] == 1 and metrics["completed"] == 1 and metrics["running"] == 0
+
+
+def test_full_queue_rejects_with_429(tmp_path):
+    workbook = _workbook(tmp_path / "book.xlsx", rows=3000)
+    with _running(workers=1, queue_size=1) as (server, url):
+        responses = [_request(f"{url}/convert?mode=async", workbook) for _ in range(4)]
+        statuses = [status for status, _, _ in responses]
+        # One job converts and one waits; the rest find the queue full
+        assert statuses.count(429) >= 2
+        assert all(headers["Retry-After"] for status, headers, _ in responses if status == 429)
+        metrics = json.loads(_request(f"{url}/metrics")[2])
+        assert metrics["rejected"] == statuses.count(429)
+        assert metrics["queue_capacity"] == 1
+
+
+def test_jobs_over_the_time_limit_are_killed(tmp_path):
+    slow = _workbook(tmp_path / "slow.xlsx", rows=8000)
+    quick = _workbook(tmp_path / "quick.xlsx")
+    with _running(workers=1, time_limit=0.3) as (server, url):
+        status, _, body = _request(f"{url}/convert", slow)
+        assert status == 504 and b"time limit" in body
+        # The killed worker is replaced for the next job
+        assert _request(f"{url}/convert", quick)[0] == 200
+        assert json.loads(_request(f"{url}/metrics")[2])["timed_out"] == 1
+
+
+def test_jobs_over_the_memory_limit_fail(tmp_path):
+    pytest.importorskip("resource")
+    if not Path("/proc/self/statm").exists():
+        pytest.skip("the memory limit is enforced on Linux only")
+    workbook = _workbook(tmp_path / "book.xlsx", rows=3000)
+    with _running(workers=1, memory_limit_mb=1) as (server, url):
+        status, _, body = _request(f"{url}/convert", workbook)
+        assert status == 500 and b"memory limit" in body
+        assert json.loads(_request(f"{url}/metrics")[2])["memory_exceeded"] == 1
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Tests for in-memory workbooks, stream outputs and stdin/stdout in the CLI."""
+import io
+import os
+import subprocess
+import sys
+import zipfile
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf.streams import XLS_MAGIC, detect_format, workbook_input
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+def _workbook_bytes(sheets=1):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for s in range(sheets):
+            pd.DataFrame({"Name": ["a", "b"], "Value": [s, s + 1]}).to_excel(writer, sheet_name=f"S{s}", index=False)
+    return buffer.getvalue()
+
+
+def test_detect_format_reads_the_bytes(tmp_path):
+    """Workbooks are recognised by content, whatever their name."""
+    data = _workbook_bytes()
+    assert detect_format(data) == "xlsx"
+    assert detect_format(XLS_MAGIC + b"\0" * 100) == "xls"
+
+    named_wrongly = tmp_path / "report.dat"
+    named_wrongly.write_bytes(data)
+    assert detect_format(named_wrongly) == "xlsx"
+
+    other_zip = io.BytesIO()
+    with zipfile.ZipFile(other_zip, "w") as archive:
+        archive.writestr("word/document.xml", "<w/>")
+    assert detect_format(other_zip.getvalue()) is None
+    assert detect_format(b"Name,Value\na,1\n") is None
+
+    spreadsheet = io.BytesIO()
+    with zipfile.ZipFile(spreadsheet, "w") as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+        archive.writestr("content.xml", "<office:document-content/>")
+    assert detect_format(spreadsheet.getvalue()) == "ods"
+
+
+def test_workbook_input_accepts_bytes_and_binary_streams():
+    assert workbook_input(b"abc") == b"abc"
+    assert workbook_input(io.BytesIO(b"abc")) == b"abc"
+    assert workbook_input("book.xlsx") == "book.xlsx"
+    with pytest.raises(TypeError):
+        workbook_input(io.StringIO("abc"))
+
+
+@pytest.mark.parametrize("reader", ["pandas", "streaming"])
+def test_convert_bytes_to_stream(reader):
+    """Both readers convert an in-memory workbook into a writable stream."""
+    pytest.importorskip("reportlab")
+    from exceltopdf.cli import convert_with_pandas_reportlab
+
+    output = io.BytesIO()
+    convert_with_pandas_reportlab(io.BytesIO(_workbook_bytes()), output, reader=reader)
+    assert output.getvalue().startswith(b"%PDF")
+
+
+def test_multi_sheet_parts_merge_into_stream():
+    """Per-sheet rendering merges straight into the output stream."""
+    pytest.importorskip("reportlab")
+    pytest.importorskip("PyPDF2")
+    from exceltopdf.cli import convert_with_pandas_reportlab
+
+    output = io.BytesIO()
+    convert_with_pandas_reportlab(_workbook_bytes(sheets=3), output, all_sheets=True, parallel_sheets=True, jobs=1)
+    assert output.getvalue().startswith(b"%PDF") and b"%%EOF" in output.getvalue()
+
+
+def test_cached_stream_conversion(tmp_path):
+    """A stream output is stored in the cache and served from it the second time."""
+    pytest.importorskip("reportlab")
+    from exceltopdf.cache import OutputCache
+    from exceltopdf.cli import convert_cached
+
+    data = _workbook_bytes()
+    cache = OutputCache(tmp_path / "cache")
+    first, second = io.BytesIO(), io.BytesIO()
+
+    assert convert_cached(data, first, "pandas", {}, cache=cache) == "miss"
+    assert convert_cached(data, second, "pandas", {}, cache=cache) == "hit"
+    assert first.getvalue() == second.getvalue()
+
+
+def test_cli_reads_stdin_and_writes_stdout():
+    """`exceltopdf - -` pipes a workbook through, with status messages on stderr."""
+    pytest.importorskip("reportlab")
+    environment = dict(os.environ, PYTHONPATH=str(SRC))
+    completed = subprocess.run(
+        [sys.executable, "-m", "exceltopdf.cli", "-", "-", "--no-cache", "--verbose"],
+        input=_workbook_bytes(), capture_output=True, env=environment, timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stderr.decode()
+    assert completed.stdout.startswith(b"%PDF")
+    assert b"Successfully converted to 'standard output'" in completed.stderr
+
+    rejected = subprocess.run(
+        [sys.executable, "-m", "exceltopdf.cli", "-", "-", "--no-cache"],
+        input=b"not a workbook", capture_output=True, env=environment, timeout=120,
+    )
+    assert rejected.returncode == 1 and not rejected.stdout
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for preserved Excel cell styles and their run-length encoded table commands."""
+import io
+import re
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+np = pytest.importorskip("numpy")
+
+from exceltopdf.styles import CellStyle, StyleTable, style_regions, table_style_commands
+
+
+def test_style_regions_merge_rows_and_columns():
+    grid = np.array([
+        [1, 1, 0, 2],
+        [1, 1, 0, 2],
+        [1, 1, 3, 2],
+        [0, 0, 0, 2],
+    ])
+    assert sorted(style_regions(grid)) == [
+        (0, 0, 2, 1, 1),  # rows 0-2, columns 0-1
+        (0, 3, 3, 3, 2),  # the whole last column
+        (2, 2, 2, 2, 3),
+    ]
+    assert style_regions(np.zeros((3, 2), dtype=int)) == []
+
+
+def test_commands_follow_regions_per_attribute_not_cells():
+    """Banded fills and a bold column each stay a few commands, however the other attribute varies."""
+    pytest.importorskip("reportlab")
+    table = StyleTable()
+    band = [table.intern(CellStyle(None, None, "DDEBF7", None)), table.intern(CellStyle(None, None, None, None))]
+    band_bold = [table.intern(CellStyle("Helvetica-Bold", None, "DDEBF7", None)),
+                 table.intern(CellStyle("Helvetica-Bold", None, None, None))]
+    grid = np.array([[band_bold[r // 50 % 2]] + [band[r // 50 % 2]] * 9 for r in range(200)])
+
+    commands = table_style_commands(grid, table)
+    assert len(commands) == 3  # two filled bands and one bold column
+    fonts = [command for command in commands if command[0] == "FONTNAME"]
+    assert fonts == [("FONTNAME", (0, 1), (0, 200), "Helvetica-Bold")]
+    backgrounds = sorted(command[1:3] for command in commands if command[0] == "BACKGROUND")
+    assert backgrounds == [((0, 1), (9, 50)), ((0, 101), (9, 150))]
+
+
+def _styled_workbook(path, fill="FFFF00"):
+    openpyxl = pytest.importorskip("openpyxl")
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Name", "Amount"])
+    for i in range(40):
+        ws.append([f"item {i}", i * 10])
+    for row in range(2, 42):
+        ws.cell(row, 1).font = Font(bold=True)
+        ws.cell(row, 2).alignment = Alignment(horizontal="right")
+    ws["B5"].fill = PatternFill("solid", fgColor=fill)
+    ws["B5"].font = Font(color="FF0000", italic=True)
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("reader", ["pandas", "streaming"])
+def test_readers_intern_cell_styles(tmp_path, reader):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    from exceltopdf import cli
+
+    book = _styled_workbook(tmp_path / "book.xlsx")
+    source = book if reader == "streaming" else pd.ExcelFile(book)
+    blocks = list(cli._iter_sheet_blocks(source, "Sheet", reader=reader, preserve_styles=True))
+    styles = blocks[0][4]
+    grid = np.concatenate([block[4].grid for block in blocks])
+
+    assert grid.shape == (40, 2)
+    assert styles.table.styles[grid[0, 0]] == CellStyle("Helvetica-Bold", None, None, None)
+    assert styles.table.styles[grid[0, 1]] == CellStyle(None, None, None, "RIGHT")
+    assert styles.table.styles[grid[3, 1]] == CellStyle("Helvetica-Oblique", "FF0000", "FFFF00", "RIGHT")
+    assert all(block[4] is None for block in cli._iter_sheet_blocks(source, "Sheet", reader=reader))
+
+
+@pytest.mark.parametrize("engine", ["platypus", "canvas"])
+def test_conversion_draws_preserved_styles(tmp_path, engine):
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+    PyPDF2 = pytest.importorskip("PyPDF2")
+    from exceltopdf.cli import convert_with_pandas_reportlab
+
+    book = _styled_workbook(tmp_path / "book.xlsx")
+    plain, styled = io.BytesIO(), io.BytesIO()
+    convert_with_pandas_reportlab(book, plain, engine=engine)
+    convert_with_pandas_reportlab(book, styled, engine=engine, preserve_styles=True)
+
+    def page_parts(data):
+        page = PyPDF2.PdfReader(io.BytesIO(data)).pages[0]
+        fonts = {font.get_object()["/BaseFont"] for font in page["/Resources"]["/Font"].values()}
+        return fonts, page.get_contents().get_data().decode("latin-1")
+
+    yellow_fill = re.compile(r"\b1(\.0+)? 1(\.0+)? 0(\.0+)? rg")
+    fonts, content = page_parts(styled.getvalue())
+    assert "/Helvetica-Oblique" in fonts
+    assert yellow_fill.search(content)
+    fonts, content = page_parts(plain.getvalue())
+    assert "/Helvetica-Oblique" not in fonts
+    assert not yellow_fill.search(content)
+
+
+def test_fingerprints_follow_styles_only_when_preserved(tmp_path):
+    pytest.importorskip("openpyxl")
+    from exceltopdf.cache import sheet_fingerprints
+
+    yellow = _styled_workbook(tmp_path / "yellow.xlsx")
+    green = _styled_workbook(tmp_path / "green.xlsx", fill="00FF00")
+
+    plain = [sheet_fingerprints(book, ["Sheet"], {})["Sheet"] for book in (yellow, green)]
+    styled = [sheet_fingerprints(book, ["Sheet"], {"preserve_styles": True})["Sheet"] for book in (yellow, green)]
+    assert plain[0] == plain[1]
+    assert styled[0] != styled[1]
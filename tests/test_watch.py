@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Tests for watch mode: change events, debouncing and content-aware reconversion."""
+import os
+import sys
+import time
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exceltopdf import watch
+from exceltopdf.watch import Debouncer, InotifyEvents, PollingEvents, WorkbookWatcher
+
+
+class ScriptedEvents:
+    """Event source that reports the paths queued with `change()` on the next wait."""
+
+    name = "scripted"
+
+    def __init__(self):
+        self.queued = set()
+
+    def change(self, *paths):
+        self.queued.update(paths)
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, 0.01))
+        changed, self.queued = self.queued, set()
+        return changed
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    converted = []
+
+    def fake_convert_one(input_path, output_path, method, options, cache=None):
+        converted.append(Path(input_path).read_bytes())
+        Path(output_path).write_bytes(b"%PDF-1.4\n")
+        return {'input': str(input_path), 'output': str(output_path), 'ok': True, 'error': None,
+                'seconds': 0.0, 'cache': None}
+
+    monkeypatch.setattr(watch, "convert_one", fake_convert_one)
+    return converted
+
+
+def _settle(watcher, seconds=0.2):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        watcher.step(max_wait=0.02)
+
+
+def test_debouncer_waits_for_quiet_paths():
+    debouncer = Debouncer(1.0)
+    debouncer.touch("a", 0.0)
+    debouncer.touch("b", 0.5)
+    debouncer.touch("a", 0.8)  # saved again: the wait starts over
+    assert debouncer.due(1.2) == []
+    assert debouncer.timeout(1.2) == pytest.approx(0.3)
+    assert debouncer.due(1.8) == ["a", "b"]
+    assert debouncer.timeout(2.0) is None
+
+
+def test_rapid_saves_convert_once_and_unchanged_content_is_skipped(tmp_path, conversions):
+    events = ScriptedEvents()
+    results = []
+    watcher = WorkbookWatcher(tmp_path, "pandas", {}, debounce=0.05, on_result=results.append, events=events)
+    book = tmp_path / "book.xlsx"
+
+    for version in (b"one", b"two", b"three"):
+        book.write_bytes(version)
+        events.change(book)
+        watcher.step(max_wait=0.01)
+    (tmp_path / "~$book.xlsx").write_bytes(b"lock")
+    events.change(tmp_path / "~$book.xlsx", tmp_path / "book.pdf")
+    _settle(watcher)
+
+    assert conversions == [b"three"]
+    assert (tmp_path / "book.pdf").exists()
+    assert results[0]['ok'] and results[0]['latency'] >= 0
+
+    # Saved again with the same content: hashed, not converted
+    os.utime(book)
+    events.change(book)
+    _settle(watcher)
+    assert conversions == [b"three"]
+    assert results[-1]['skipped']
+
+    book.write_bytes(b"four")
+    events.change(book)
+    _settle(watcher)
+    assert conversions == [b"three", b"four"]
+
+
+def test_start_converts_only_workbooks_with_stale_pdfs(tmp_path, conversions):
+    current = tmp_path / "current.xlsx"
+    current.write_bytes(b"current")
+    (tmp_path / "current.pdf").write_bytes(b"%PDF")
+    old = time.time() - 60
+    os.utime(current, (old, old))
+    (tmp_path / "missing.xlsx").write_bytes(b"missing")
+
+    watcher = WorkbookWatcher(tmp_path, "pandas", {}, debounce=0.05, events=ScriptedEvents())
+    watcher.start()
+    _settle(watcher)
+    assert conversions == [b"missing"]
+    assert watcher.pending() == 0
+
+
+def test_polling_events_report_changed_files(tmp_path):
+    events = PollingEvents(tmp_path, interval=0.01)
+    assert events.wait(0.01) == set()
+    (tmp_path / "book.xlsx").write_bytes(b"data")
+    assert events.wait(0.01) == {tmp_path / "book.xlsx"}
+    assert events.wait(0.01) == set()
+
+
+def test_inotify_events_report_written_files(tmp_path):
+    try:
+        events = InotifyEvents(tmp_path)
+    except OSError:
+        pytest.skip("inotify is not available")
+    try:
+        (tmp_path / "book.xlsx").write_bytes(b"data")
+        os.replace(tmp_path / "book.xlsx", tmp_path / "renamed.xlsx")
+        changed = set()
+        deadline = time.monotonic() + 2
+        while {tmp_path / "book.xlsx", tmp_path / "renamed.xlsx"} - changed and time.monotonic() < deadline:
+            changed |= events.wait(0.1)
+        assert {tmp_path / "book.xlsx", tmp_path / "renamed.xlsx"} <= changed
+    finally:
+        events.close()
+
+
+def test_watcher_converts_saved_workbooks_to_pdfs(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("pandas")
+    pytest.importorskip("reportlab")
+
+    out = tmp_path / "pdfs"
+    out.mkdir()
+    events = ScriptedEvents()
+    results = []
+    watcher = WorkbookWatcher(tmp_path, "pandas", {'verbose': False}, output_dir=out, debounce=0.01,
+                              on_result=results.append, events=events)
+    wb = openpyxl.Workbook()
+    wb.active.append(["id", "name"])
+    wb.active.append([1, "first"])
+    wb.save(tmp_path / "book.xlsx")
+    events.change(tmp_path / "book.xlsx")
+    _settle(watcher, 1.0)
+
+    assert [result['ok'] for result in results] == [True]
+    assert (out / "book.pdf").read_bytes().startswith(b"%PDF")